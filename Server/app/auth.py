@@ -8,6 +8,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from .config import settings
 from .database import get_db
+from .metrics import time_password_hash
 from .models import User
 
 
@@ -18,13 +19,15 @@ security = HTTPBearer(auto_error=False)
 
 def hash_password(password: str) -> str:
     """Hash password using Argon2 algorithm"""
-    return ph.hash(password)
+    with time_password_hash("hash"):
+        return ph.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password using Argon2 algorithm"""
     try:
-        ph.verify(hashed_password, plain_password)
+        with time_password_hash("verify"):
+            ph.verify(hashed_password, plain_password)
         return True
     except (VerifyMismatchError, InvalidHashError):
         return False
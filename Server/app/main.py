@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 from .config import settings
 from .database import Base, engine
+from .metrics import MetricsMiddleware, render_metrics
 from .routes import auth, projects, chat
 from starlette.middleware.base import BaseHTTPMiddleware
 
@@ -78,6 +79,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency and in-flight metrics (outermost, so it sees every request)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(projects.router, prefix=settings.API_V1_PREFIX)
@@ -94,6 +98,12 @@ async def root():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "database": "sqlite"}
@@ -1,7 +1,7 @@
 # placeholder
 
-from services.llm_service import llm
+from services.llm_service import get_llm
 from graph.state import State
 
 def orchestration_agent(state: State):
-    return {"messages" : [llm.invoke(state["message"])]}
\ No newline at end of file
+    return {"messages" : [get_llm().invoke(state["message"])]}
\ No newline at end of file
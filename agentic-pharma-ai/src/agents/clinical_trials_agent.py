@@ -1,32 +1,36 @@
 from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
-from services.llm_service import llm
+from services.cascade import invoke_specialist
+from services.timings import timed
 from graph.state import State
 from prompts.system_prompts import CLINICAL_TRIALS_PROMPT
 from tools.clinical_trials_data import get_clinical_trial_data, format_trial_for_llm
+from tools.summarization import compress_record
 
 
-def clinical_trials_agent(state: State) -> dict:
+def build_clinical_trials_context(query: str) -> dict:
     """
-    Clinical Trials Specialist Agent
-    Analyzes clinical trial data, study designs, and patient outcomes
-    Uses clinical trials data tool to fetch real data
+    Fetch clinical trial data for a query and build the agent's data context
+
+    Args:
+        query: The user's question
+
+    Returns:
+        Dictionary with the tool lookup result, the formatted records,
+        the data context message sent to the LLM and the retrieved
+        record ids
     """
-    system_prompt = state.get("clinical_trials_prompt", CLINICAL_TRIALS_PROMPT)
-    messages = state.get("message", [])
-    
-    # Get the last user message to extract query
-    last_message = messages[-1]
-    query = last_message.content
-    
     # Fetch clinical trial data using the data tool
-    trial_data = get_clinical_trial_data(query)
+    with timed("tool_lookup") as stage:
+        trial_data = get_clinical_trial_data(query)
+        stage["found"] = bool(trial_data.get("found"))
     
     # Format trial data for LLM
-    formatted_data = ""
-    if trial_data.get("found"):
-        trials = trial_data.get("trials", [])
-        for trial in trials:
-            formatted_data += format_trial_for_llm(trial) + "\n"
+    with timed("format_context"):
+        formatted_data = ""
+        if trial_data.get("found"):
+            trials = trial_data.get("trials", [])
+            for trial in trials:
+                formatted_data += format_trial_for_llm(compress_record(trial)) + "\n"
     
     # Create context message with fetched data
     data_context = f"""
@@ -36,16 +40,43 @@ Based on the following clinical trial data from our database:
 
 Please provide your expert analysis and insights.
 """
+
+    return {
+        "data": trial_data,
+        "formatted_data": formatted_data,
+        "data_context": data_context,
+        "record_ids": [trial.get("nct_number") for trial in trial_data.get("trials", [])]
+    }
+
+
+def clinical_trials_agent(state: State) -> dict:
+    """
+    Clinical Trials Specialist Agent
+    Analyzes clinical trial data, study designs, and patient outcomes
+    Uses clinical trials data tool to fetch real data
+    """
+    system_prompt = state.get("clinical_trials_prompt", CLINICAL_TRIALS_PROMPT)
+    messages = state.get("message", [])
+    
+    # Get the last user message to extract query
+    last_message = messages[-1]
+    query = last_message.content
+    
+    # Fetch and format clinical trial data with the data tool
+    context = build_clinical_trials_context(query)
     
     # Build message chain with system prompt and data context
     full_messages = [
         SystemMessage(content=system_prompt),
-        HumanMessage(content=data_context),
+        HumanMessage(content=context["data_context"]),
         *messages
     ]
     
-    # Invoke LLM
-    response = llm.invoke(full_messages)
+    # Invoke LLM (small model first when the cascade is enabled; a JSON
+    # finding instead of prose when the run asks for structured findings)
+    response = invoke_specialist(
+        full_messages, context["record_ids"], structured=state.get("structured_findings", False)
+    )
     
     # Update state with agent response
     updated_messages = messages + [response]
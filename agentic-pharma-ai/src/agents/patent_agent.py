@@ -1,32 +1,36 @@
 from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
-from services.llm_service import llm
+from services.cascade import invoke_specialist
+from services.timings import timed
 from graph.state import State
 from prompts.system_prompts import PATENT_PROMPT
 from tools.patent_data import get_patent_data, format_patent_for_llm
+from tools.summarization import compress_record
 
 
-def patent_agent(state: State) -> dict:
+def build_patent_context(query: str) -> dict:
     """
-    Patent Expert Agent
-    Analyzes patent information, intellectual property, and drug formulations
-    Uses patent data tool to fetch real data
+    Fetch patent data for a query and build the agent's data context
+
+    Args:
+        query: The user's question
+
+    Returns:
+        Dictionary with the tool lookup result, the formatted records,
+        the data context message sent to the LLM and the retrieved
+        record ids
     """
-    system_prompt = state.get("patent_prompt", PATENT_PROMPT)
-    messages = state.get("message", [])
-    
-    # Get the last user message to extract query
-    last_message = messages[-1]
-    query = last_message.content
-    
     # Fetch patent data using the data tool
-    patent_data = get_patent_data(query)
+    with timed("tool_lookup") as stage:
+        patent_data = get_patent_data(query)
+        stage["found"] = bool(patent_data.get("found"))
     
     # Format patent data for LLM
-    formatted_data = ""
-    if patent_data.get("found"):
-        patents = patent_data.get("patents", [])
-        for patent in patents:
-            formatted_data += format_patent_for_llm(patent) + "\n"
+    with timed("format_context"):
+        formatted_data = ""
+        if patent_data.get("found"):
+            patents = patent_data.get("patents", [])
+            for patent in patents:
+                formatted_data += format_patent_for_llm(compress_record(patent)) + "\n"
     
     # Create context message with fetched data
     data_context = f"""
@@ -36,16 +40,43 @@ Based on the following patent data from our database:
 
 Please provide your expert analysis and insights on IP protection, freedom to operate, and patent landscape.
 """
+
+    return {
+        "data": patent_data,
+        "formatted_data": formatted_data,
+        "data_context": data_context,
+        "record_ids": [patent.get("patent_number") for patent in patent_data.get("patents", [])]
+    }
+
+
+def patent_agent(state: State) -> dict:
+    """
+    Patent Expert Agent
+    Analyzes patent information, intellectual property, and drug formulations
+    Uses patent data tool to fetch real data
+    """
+    system_prompt = state.get("patent_prompt", PATENT_PROMPT)
+    messages = state.get("message", [])
+    
+    # Get the last user message to extract query
+    last_message = messages[-1]
+    query = last_message.content
+    
+    # Fetch and format patent data with the data tool
+    context = build_patent_context(query)
     
     # Build message chain with system prompt and data context
     full_messages = [
         SystemMessage(content=system_prompt),
-        HumanMessage(content=data_context),
+        HumanMessage(content=context["data_context"]),
         *messages
     ]
     
-    # Invoke LLM
-    response = llm.invoke(full_messages)
+    # Invoke LLM (small model first when the cascade is enabled; a JSON
+    # finding instead of prose when the run asks for structured findings)
+    response = invoke_specialist(
+        full_messages, context["record_ids"], structured=state.get("structured_findings", False)
+    )
     
     # Update state with agent response
     updated_messages = messages + [response]
@@ -1,32 +1,36 @@
 from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
-from services.llm_service import llm
+from services.cascade import invoke_specialist
+from services.timings import timed
 from graph.state import State
 from prompts.system_prompts import REGULATORY_PROMPT
 from tools.regulatory_data import get_regulatory_data, format_regulatory_for_llm
+from tools.summarization import compress_record
 
 
-def regulatory_agent(state: State) -> dict:
+def build_regulatory_context(query: str) -> dict:
     """
-    Regulatory Compliance Expert Agent
-    Analyzes FDA approval pathways, drug safety, and compliance requirements
-    Uses regulatory data tool to fetch real data
+    Fetch regulatory data for a query and build the agent's data context
+
+    Args:
+        query: The user's question
+
+    Returns:
+        Dictionary with the tool lookup result, the formatted records,
+        the data context message sent to the LLM and the retrieved
+        record ids
     """
-    system_prompt = state.get("regulator_prompt", REGULATORY_PROMPT)
-    messages = state.get("message", [])
-    
-    # Get the last user message to extract query
-    last_message = messages[-1]
-    query = last_message.content
-    
     # Fetch regulatory data using the data tool
-    reg_data = get_regulatory_data(query)
+    with timed("tool_lookup") as stage:
+        reg_data = get_regulatory_data(query)
+        stage["found"] = bool(reg_data.get("found"))
     
     # Format regulatory data for LLM
-    formatted_data = ""
-    if reg_data.get("found"):
-        applications = reg_data.get("applications", [])
-        for app in applications:
-            formatted_data += format_regulatory_for_llm(app) + "\n"
+    with timed("format_context"):
+        formatted_data = ""
+        if reg_data.get("found"):
+            applications = reg_data.get("applications", [])
+            for app in applications:
+                formatted_data += format_regulatory_for_llm(compress_record(app)) + "\n"
     
     # Create context message with fetched data
     data_context = f"""
@@ -36,16 +40,43 @@ Based on the following regulatory data from our database:
 
 Please provide your expert analysis and insights on FDA approval status, compliance requirements, and safety considerations.
 """
+
+    return {
+        "data": reg_data,
+        "formatted_data": formatted_data,
+        "data_context": data_context,
+        "record_ids": [application.get("application_number") for application in reg_data.get("applications", [])]
+    }
+
+
+def regulatory_agent(state: State) -> dict:
+    """
+    Regulatory Compliance Expert Agent
+    Analyzes FDA approval pathways, drug safety, and compliance requirements
+    Uses regulatory data tool to fetch real data
+    """
+    system_prompt = state.get("regulator_prompt", REGULATORY_PROMPT)
+    messages = state.get("message", [])
+    
+    # Get the last user message to extract query
+    last_message = messages[-1]
+    query = last_message.content
+    
+    # Fetch and format regulatory data with the data tool
+    context = build_regulatory_context(query)
     
     # Build message chain with system prompt and data context
     full_messages = [
         SystemMessage(content=system_prompt),
-        HumanMessage(content=data_context),
+        HumanMessage(content=context["data_context"]),
         *messages
     ]
     
-    # Invoke LLM
-    response = llm.invoke(full_messages)
+    # Invoke LLM (small model first when the cascade is enabled; a JSON
+    # finding instead of prose when the run asks for structured findings)
+    response = invoke_specialist(
+        full_messages, context["record_ids"], structured=state.get("structured_findings", False)
+    )
     
     # Update state with agent response
     updated_messages = messages + [response]
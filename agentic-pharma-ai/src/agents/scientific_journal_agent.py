@@ -1,32 +1,36 @@
 from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
-from services.llm_service import llm
+from services.cascade import invoke_specialist
+from services.timings import timed
 from graph.state import State
 from prompts.system_prompts import SCIENTIFIC_JOURNAL_PROMPT
 from tools.scientific_journal_data import get_journal_data, format_article_for_llm
+from tools.summarization import compress_record
 
 
-def scientific_journal_agent(state: State) -> dict:
+def build_journal_context(query: str) -> dict:
     """
-    Scientific Literature Research Specialist Agent
-    Analyzes published peer-reviewed research and scientific literature
-    Uses scientific journal data tool to fetch real data
+    Fetch journal data for a query and build the agent's data context
+
+    Args:
+        query: The user's question
+
+    Returns:
+        Dictionary with the tool lookup result, the formatted records,
+        the data context message sent to the LLM and the retrieved
+        record ids
     """
-    system_prompt = state.get("scientific_journal_prompt", SCIENTIFIC_JOURNAL_PROMPT)
-    messages = state.get("message", [])
-    
-    # Get the last user message to extract query
-    last_message = messages[-1]
-    query = last_message.content
-    
     # Fetch journal data using the data tool
-    journal_data = get_journal_data(query)
+    with timed("tool_lookup") as stage:
+        journal_data = get_journal_data(query)
+        stage["found"] = bool(journal_data.get("found"))
     
     # Format journal data for LLM
-    formatted_data = ""
-    if journal_data.get("found"):
-        articles = journal_data.get("articles", [])
-        for article in articles:
-            formatted_data += format_article_for_llm(article) + "\n"
+    with timed("format_context"):
+        formatted_data = ""
+        if journal_data.get("found"):
+            articles = journal_data.get("articles", [])
+            for article in articles:
+                formatted_data += format_article_for_llm(compress_record(article)) + "\n"
     
     # Create context message with fetched data
     data_context = f"""
@@ -36,16 +40,43 @@ Based on the following scientific literature data from our database:
 
 Please provide your expert analysis and insights on published research, study quality, and scientific evidence.
 """
+
+    return {
+        "data": journal_data,
+        "formatted_data": formatted_data,
+        "data_context": data_context,
+        "record_ids": [article.get("doi") for article in journal_data.get("articles", [])]
+    }
+
+
+def scientific_journal_agent(state: State) -> dict:
+    """
+    Scientific Literature Research Specialist Agent
+    Analyzes published peer-reviewed research and scientific literature
+    Uses scientific journal data tool to fetch real data
+    """
+    system_prompt = state.get("scientific_journal_prompt", SCIENTIFIC_JOURNAL_PROMPT)
+    messages = state.get("message", [])
+    
+    # Get the last user message to extract query
+    last_message = messages[-1]
+    query = last_message.content
+    
+    # Fetch and format journal data with the data tool
+    context = build_journal_context(query)
     
     # Build message chain with system prompt and data context
     full_messages = [
         SystemMessage(content=system_prompt),
-        HumanMessage(content=data_context),
+        HumanMessage(content=context["data_context"]),
         *messages
     ]
     
-    # Invoke LLM
-    response = llm.invoke(full_messages)
+    # Invoke LLM (small model first when the cascade is enabled; a JSON
+    # finding instead of prose when the run asks for structured findings)
+    response = invoke_specialist(
+        full_messages, context["record_ids"], structured=state.get("structured_findings", False)
+    )
     
     # Update state with agent response
     updated_messages = messages + [response]
@@ -1,7 +1,11 @@
-from langchain_core.messages import SystemMessage, AIMessage
-from services.llm_service import llm
+from typing import Dict, List, Optional
+
+from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
+from services.llm_service import get_llm
+from services.timings import timed, token_usage
 from graph.state import State
-from prompts.system_prompts import SUMMARIZER_PROMPT
+from prompts.system_prompts import SUMMARIZER_PROMPT, SUMMARIZER_INCREMENT_PROMPT
+from tools.summarization import AGENT_OUTPUT_MAX_TOKENS, compress_agent_output
 
 
 def summarizer_agent(state: State) -> dict:
@@ -12,11 +16,26 @@ def summarizer_agent(state: State) -> dict:
     system_prompt = state.get("system_prompt", SUMMARIZER_PROMPT)
     messages = state.get("message", [])
     
+    # Set when the request deadline leaves time only for a short synthesis
+    max_tokens = state.get("summary_max_tokens")
+    output_budget = min(AGENT_OUTPUT_MAX_TOKENS, max_tokens) if max_tokens else AGENT_OUTPUT_MAX_TOKENS
+    
+    # Pre-summarize long specialist outputs to shrink the synthesis prompt
+    with timed("format_context"):
+        condensed = [
+            AIMessage(content=compress_agent_output(m.content, output_budget)) if isinstance(m, AIMessage) else m
+            for m in messages
+        ]
+    
     # Build message chain with system prompt
-    full_messages = [SystemMessage(content=system_prompt)] + messages
+    full_messages = [SystemMessage(content=system_prompt)] + condensed
     
     # Invoke LLM for final synthesis
-    response = llm.invoke(full_messages)
+    llm = get_llm("summarizer")
+    model = llm.bind(max_tokens=max_tokens) if max_tokens else llm
+    with timed("llm") as stage:
+        response = model.invoke(full_messages)
+        stage.update(token_usage(response))
     
     # Update state with summary response
     updated_messages = messages + [response]
@@ -24,3 +43,41 @@ def summarizer_agent(state: State) -> dict:
     return {
         "message": updated_messages
     }
+
+
+
+def summarize_increment(query: str, draft: str, outputs: List[Dict], max_tokens: Optional[int] = None) -> AIMessage:
+    """
+    Revise a running synthesis with newly arrived specialist outputs
+
+    Used by incremental synthesis: the summarizer gets the current draft
+    and only the new outputs, so each step folds in one specialist's
+    findings instead of re-reading every output.
+
+    Args:
+        query: The user's question
+        draft: The report so far ("" before the first increment)
+        outputs: Agent output entries ("agent", "response") not yet in the draft
+        max_tokens: Optional output token cap
+
+    Returns:
+        The complete revised report, which replaces the draft
+    """
+    output_budget = min(AGENT_OUTPUT_MAX_TOKENS, max_tokens) if max_tokens else AGENT_OUTPUT_MAX_TOKENS
+    with timed("format_context"):
+        findings = "\n\n".join(
+            f"## {o['agent'].replace('_', ' ').title()}\n\n{compress_agent_output(o['response'], output_budget)}"
+            for o in outputs
+        )
+    full_messages = [
+        SystemMessage(content=f"{SUMMARIZER_PROMPT}\n\n{SUMMARIZER_INCREMENT_PROMPT}"),
+        HumanMessage(content=query),
+        HumanMessage(content=f"Report so far:\n\n{draft or '(empty)'}\n\nNew findings:\n\n{findings}"),
+    ]
+
+    llm = get_llm("summarizer")
+    model = llm.bind(max_tokens=max_tokens) if max_tokens else llm
+    with timed("llm") as stage:
+        response = model.invoke(full_messages)
+        stage.update(token_usage(response))
+    return response
@@ -3,26 +3,63 @@ Pharmaceutical Research Orchestrator - FastAPI Application
 Exposes the multi-agent orchestrator as REST API endpoints
 """
 
-from fastapi import FastAPI, HTTPException, Query 
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import asyncio
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, List, Dict, Any, Optional
+
+import orjson
 
 # Import orchestrator
-from orchestrator import run_orchestrator, format_response, initialize_state
+from orchestrator import build_context_bundle, run_orchestrator, format_response, initialize_state, normalize_query
 from graph.state import State
 
 # Import data tools
 from tools.clinical_trials_data import get_clinical_trial_data, get_all_clinical_trials
+from tools.clinical_trials_data import get_dataset_version as get_clinical_trials_version
 from tools.patent_data import get_patent_data, get_active_patents
+from tools.patent_data import get_dataset_version as get_patents_version
 from tools.regulatory_data import get_regulatory_data, get_approved_drugs
+from tools.regulatory_data import get_dataset_version as get_regulatory_version
 from tools.scientific_journal_data import get_journal_data, get_all_articles
+from tools.scientific_journal_data import get_dataset_version as get_journal_version
+
+# Import shared data tool lookups and pre-summarization stats
+from tools.lookup_cache import shared_lookups
+from tools.summarization import get_summarization_stats
+
+# Import background job queue and request coalescing
+from services.agent_stats import flush_agent_stats
+from services.circuit_breaker import llm_circuit_open
+from services.fact_answers import fast_path_stats
+from services.job_queue import JobQueue
+from services.llm_limiter import set_llm_user
+from services.single_flight import SingleFlight
+
+# Import metrics
+from services.metrics import MetricsMiddleware, register_cache, register_summarization, render_metrics
+
+# Import report pipeline
+from report.exporter import MEDIA_TYPES, get_report_storage, report_export_key, stream_export
 
 # Import API models
 from models.api_models import (
     QueryRequest,
+    BatchQueryRequest,
+    ContextRequest,
+    ContextResponse,
+    ReportRequest,
+    JobResponse,
+    JobStatusResponse,
+    AgentResponse,
     OrchestratorResponse,
     HealthResponse,
     ErrorResponse,
@@ -54,6 +91,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency and in-flight metrics
+app.add_middleware(MetricsMiddleware)
+
 
 # ============================================================================
 # HEALTH & INFO ENDPOINTS
@@ -64,16 +104,32 @@ async def health_check():
     """
     Health check endpoint
     
+    The status is "degraded" while the LLM circuit breaker is open and
+    queries are answered from data alone.
+    
     Returns:
         HealthResponse: Status and version information
     """
     logger.info("Health check requested")
     return HealthResponse(
-        status="healthy",
+        status="degraded" if llm_circuit_open() else "healthy",
         version="1.0.0"
     )
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """
+    Prometheus metrics in text exposition format
+    
+    Covers request latency per route, in-flight requests, orchestrator
+    stage and LLM call latency, LLM tokens per agent, cache hit ratios and
+    pre-summarization token reduction.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/info", tags=["Info"])
 async def get_info():
     """
@@ -106,6 +162,12 @@ async def get_info():
         ],
         "endpoints": {
             "query": "/query",
+            "batch": "/query/batch",
+            "context": "/query/context",
+            "stream": "/query/stream",
+            "query_metrics": "/query/metrics",
+            "jobs": "/jobs",
+            "report": "/report",
             "query_clinical": "/data/clinical-trials",
             "query_patents": "/data/patents",
             "query_regulatory": "/data/regulatory",
@@ -118,8 +180,121 @@ async def get_info():
 # MAIN ORCHESTRATOR ENDPOINT
 # ============================================================================
 
+def build_orchestrator_response(query: str, final_state: State, include_timings: bool = False) -> OrchestratorResponse:
+    """
+    Build the API response for a finished orchestrator run
+    
+    Args:
+        query: The original query
+        final_state: State returned by run_orchestrator
+        include_timings: Whether to attach per-stage timings
+        
+    Returns:
+        OrchestratorResponse: Final analysis with per-agent responses
+    """
+    # Get final response
+    final_response = format_response(final_state)
+    messages = final_state.get("message", [])
+    
+    # Specialists that answered, in the order they ran
+    agent_outputs = final_state.get("agent_outputs", [])
+    agent_responses = [
+        AgentResponse(
+            agent_name=output["agent"],
+            response=output["response"],
+            data_found=output["data_found"],
+            finding=output.get("finding"),
+            latency_ms=output.get("latency_ms"),
+            prompt_tokens=output.get("prompt_tokens"),
+            completion_tokens=output.get("completion_tokens"),
+            cached_tokens=output.get("cached_tokens")
+        )
+        for output in agent_outputs
+    ]
+    agent_count = len(agent_responses)
+    
+    # Determine if synthesis was performed (a skipped synthesis only concatenates outputs)
+    synthesis_performed = final_state.get("synthesis", "none") in ("full", "shortened", "merged", "incremental")
+    
+    logger.info(f"Query processed successfully. Agents consulted: {agent_count}")
+    
+    return OrchestratorResponse(
+        query=query,
+        final_response=final_response,
+        agents_consulted=[response.agent_name for response in agent_responses],
+        agent_count=agent_count,
+        total_messages=len(messages),
+        synthesis_performed=synthesis_performed,
+        partial=final_state.get("partial", False),
+        skipped_agents=final_state.get("skipped_agents", []),
+        degraded=final_state.get("degraded", False),
+        fast_path=final_state.get("fast_path"),
+        plan=final_state.get("plan"),
+        agent_responses=agent_responses,
+        timings=final_state.get("timings") if include_timings else None,
+        timestamp=datetime.now()
+    )
+
+
+# Identical queries arriving while one is running share its result
+query_flights = SingleFlight()
+register_cache("query_coalescing", lambda: (query_flights.metrics()["coalesced"], query_flights.metrics()["executions"]))
+register_summarization(get_summarization_stats)
+
+# How often a waiting /query request checks whether its client went away
+DISCONNECT_POLL_S = 0.25
+
+
+async def run_orchestrator_coalesced(query: str, deadline_ms: Optional[int] = None,
+                                     max_agents: Optional[int] = None,
+                                     token_budget: Optional[int] = None) -> State:
+    """
+    Run the orchestrator off the event loop, coalescing identical in-flight queries
+    
+    Queries only coalesce with others sharing the same deadline and plan
+    limits. If every caller waiting on a run is cancelled, the run's cancel
+    event is set so the orchestrator stops starting new agent calls.
+    """
+    key = normalize_query(query)
+    if (deadline_ms, max_agents, token_budget) != (None, None, None):
+        key = f"{key}|{deadline_ms}|{max_agents}|{token_budget}"
+    
+    async def run() -> State:
+        cancel_event = threading.Event()
+        deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms is not None else None
+        try:
+            return await asyncio.to_thread(
+                run_orchestrator, query, None, deadline, cancel_event, max_agents, token_budget
+            )
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
+    
+    return await query_flights.do(key, run)
+
+
+def _request_user(http_request: Request) -> str:
+    """User LLM calls are attributed to for fair queueing: X-User-Id, else the client address"""
+    user = http_request.headers.get("x-user-id")
+    if user:
+        return user
+    return http_request.client.host if http_request.client else "anonymous"
+
+
+async def _cancel_on_disconnect(http_request: Request, work) -> Any:
+    """Await work, cancelling it if the client disconnects first"""
+    task = asyncio.ensure_future(work)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_S)
+        if done:
+            return task.result()
+        if await http_request.is_disconnected():
+            task.cancel()
+            raise HTTPException(status_code=499, detail="Client closed request")
+
+
 @app.post("/query", response_model=OrchestratorResponse, tags=["Orchestrator"])
-async def query_orchestrator(request: QueryRequest):
+async def query_orchestrator(request: QueryRequest, http_request: Request):
     """
     Submit a pharmaceutical research query to the orchestrator
     
@@ -129,8 +304,19 @@ async def query_orchestrator(request: QueryRequest):
     3. Agents provide expert analysis
     4. If multiple agents respond, automatically synthesize findings
     
+    The planner weighs each agent's relevance against its historical
+    latency and token cost, choosing at most `max_agents` specialists
+    within the optional `token_budget`; the plan and its estimated cost
+    are returned in `plan`.
+    
+    With `deadline_ms`, agents still running at the deadline are abandoned
+    and the summarizer is shortened or skipped as time runs short; the
+    response then holds whatever completed and is flagged `partial`. If
+    the client disconnects, outstanding agent work is cancelled.
+    
     Args:
         request (QueryRequest): Query request with pharmaceutical question
+        http_request (Request): Incoming request, watched for disconnects
         
     Returns:
         OrchestratorResponse: Final analysis with agent responses
@@ -142,7 +328,8 @@ async def query_orchestrator(request: QueryRequest):
         POST /query
         {
             "query": "What are the clinical trials for cancer drug XYZ?",
-            "max_agents": 5
+            "max_agents": 5,
+            "deadline_ms": 20000
         }
     """
     try:
@@ -154,49 +341,559 @@ async def query_orchestrator(request: QueryRequest):
             )
         
         logger.info(f"Processing query: {request.query}")
+        set_llm_user(_request_user(http_request))
         
-        # Run orchestrator
-        final_state = run_orchestrator(request.query)
+        # Run orchestrator (or join an identical query already running)
+        final_state = await _cancel_on_disconnect(
+            http_request,
+            run_orchestrator_coalesced(
+                request.query, request.deadline_ms, request.max_agents, request.token_budget
+            )
+        )
         
-        # Get final response
-        final_response = format_response(final_state)
+        return build_orchestrator_response(request.query, final_state, request.include_timings)
         
-        # Determine which agents were consulted
-        messages = final_state.get("message", [])
-        ai_messages = [m for m in messages if hasattr(m, '__class__') and 'AIMessage' in m.__class__.__name__]
-        agent_count = len(ai_messages)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing query: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing query: {str(e)}"
+        )
+
+
+@app.post("/query/context", response_model=ContextResponse, tags=["Orchestrator"])
+async def query_context(request: ContextRequest):
+    """
+    Plan a query and retrieve its data without calling any LLM
+    
+    For consumers running their own models: returns the plan, entities
+    found in the query, each planned specialist's records and the
+    messages it would send to its LLM (system prompt, data context and
+    the question).
+    
+    Lookups all use the question. A live run looks up data for every
+    specialist after the first with the previous specialist's answer, so
+    those agents are marked `live_lookup_input: "previous_answer"` and
+    their live records may differ.
+    
+    Args:
+        request (ContextRequest): Query and plan limits
         
-        # Determine if synthesis was performed
-        synthesis_performed = agent_count > 1
+    Returns:
+        ContextResponse: Plan, entities and per-agent context
         
-        logger.info(f"Query processed successfully. Agents consulted: {agent_count}")
+    Example:
+        POST /query/context
+        {
+            "query": "FDA approval status and patents for DTZ-100",
+            "max_agents": 2
+        }
+    """
+    try:
+        if not request.query or len(request.query.strip()) < 3:
+            raise HTTPException(
+                status_code=400,
+                detail="Query must be at least 3 characters long"
+            )
         
-        return OrchestratorResponse(
-            query=request.query,
-            final_response=final_response,
-            agents_consulted=[f"agent_{i}" for i in range(agent_count)],
-            agent_count=agent_count,
-            total_messages=len(messages),
-            synthesis_performed=synthesis_performed,
-            timestamp=datetime.now()
+        bundle = build_context_bundle(request.query, request.max_agents, request.token_budget)
+        return ContextResponse(query=request.query, **bundle)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building query context: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error building query context: {str(e)}"
+        )
+
+
+@app.get("/query/metrics", tags=["Orchestrator"])
+async def get_query_metrics():
+    """
+    Get request coalescing, fact fast path and pre-summarization metrics
+    
+    Returns:
+        Dictionary with orchestrator executions, coalesced requests,
+        coalesced ratio, queries currently in flight, the fast path's
+        hits, misses and hit rate, and pre-summarization's token reduction
+        and CPU cost
+    """
+    return {
+        **query_flights.metrics(),
+        "fast_path": fast_path_stats(),
+        "summarization": get_summarization_stats()
+    }
+
+
+# ============================================================================
+# BATCH QUERY ENDPOINT
+# ============================================================================
+
+def _ndjson(payload: Dict) -> bytes:
+    return orjson.dumps(payload) + b"\n"
+
+
+@app.post("/query/batch", tags=["Orchestrator"])
+async def query_batch(request: BatchQueryRequest, http_request: Request):
+    """
+    Run a batch of queries and stream results as NDJSON
+    
+    Identical queries (ignoring case and whitespace) run once and their
+    result is returned for every occurrence. Data tool lookups are shared
+    across the whole batch, and at most `concurrency` queries run at once.
+    Each line is written as soon as its query completes, followed by a
+    final summary line with throughput in queries per minute.
+    
+    All of a batch's LLM calls are queued as the requesting user's, so a
+    large batch shares LLM capacity fairly with other users.
+    
+    Args:
+        request (BatchQueryRequest): Queries and concurrency cap
+        http_request (Request): Incoming request (identifies the user)
+        
+    Returns:
+        StreamingResponse: application/x-ndjson result lines
+        
+    Example:
+        POST /query/batch
+        {
+            "queries": ["FDA status of DTZ-100", "Patents for Cancer Drug XYZ"],
+            "concurrency": 8
+        }
+    """
+    for query in request.queries:
+        if not query or len(query.strip()) < 3:
+            raise HTTPException(
+                status_code=400,
+                detail="Each query must be at least 3 characters long"
+            )
+    
+    # Map each unique normalized query to the batch positions asking it
+    positions: Dict[str, List[int]] = {}
+    for index, query in enumerate(request.queries):
+        positions.setdefault(normalize_query(query), []).append(index)
+    
+    logger.info(f"Processing batch: {len(request.queries)} queries, {len(positions)} unique")
+    set_llm_user(_request_user(http_request))
+    
+    async def results():
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(request.concurrency)
+        failed = 0
+        
+        with shared_lookups() as lookup_stats:
+            async def run_one(key: str):
+                query = request.queries[positions[key][0]]
+                async with semaphore:
+                    item_started = time.perf_counter()
+                    try:
+                        final_state = await run_orchestrator_coalesced(query)
+                        response = build_orchestrator_response(query, final_state)
+                        return key, response.model_dump(mode="json"), None, time.perf_counter() - item_started
+                    except Exception as e:
+                        logger.error(f"Batch query failed: {query}: {e}")
+                        return key, None, str(e), time.perf_counter() - item_started
+            
+            tasks = [asyncio.create_task(run_one(key)) for key in positions]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    key, result, error, elapsed = await next_done
+                    for index in positions[key]:
+                        failed += error is not None
+                        yield _ndjson({
+                            "index": index,
+                            "query": request.queries[index],
+                            "status": "failed" if error else "completed",
+                            "result": result,
+                            "error": error,
+                            "elapsed_ms": round(elapsed * 1000, 2)
+                        })
+            finally:
+                for task in tasks:
+                    task.cancel()
+        
+        elapsed = time.perf_counter() - started
+        yield _ndjson({
+            "summary": {
+                "total": len(request.queries),
+                "unique": len(positions),
+                "deduplicated": len(request.queries) - len(positions),
+                "failed": failed,
+                "shared_lookup_hits": lookup_stats["hits"],
+                "shared_lookup_misses": lookup_stats["misses"],
+                "elapsed_s": round(elapsed, 3),
+                "queries_per_min": round(len(request.queries) / elapsed * 60, 2) if elapsed else None
+            }
+        })
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@app.post("/query/stream", tags=["Orchestrator"])
+async def query_stream(request: QueryRequest, http_request: Request):
+    """
+    Run a query and stream its progress as NDJSON
+    
+    The summarizer extends a draft from the first completed specialist on
+    (incremental synthesis), so the answer takes shape while the remaining
+    specialists run. Lines are written as events happen:
+    
+    - {"event": "agent", "agent", "response"}: a specialist finished
+    - {"event": "draft", "response", "agents"}: the synthesis draft now
+      covers these agents
+    - {"event": "result", "result"}: the final OrchestratorResponse
+    - {"event": "error", "error"}: the run failed
+    
+    If the client disconnects, outstanding agent work is cancelled.
+    
+    Args:
+        request (QueryRequest): Query request with pharmaceutical question
+        http_request (Request): Incoming request (identifies the user)
+        
+    Returns:
+        StreamingResponse: application/x-ndjson event lines
+    """
+    if not request.query or len(request.query.strip()) < 3:
+        raise HTTPException(
+            status_code=400,
+            detail="Query must be at least 3 characters long"
+        )
+    
+    logger.info(f"Streaming query: {request.query}")
+    set_llm_user(_request_user(http_request))
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    cancel_event = threading.Event()
+    deadline = time.monotonic() + request.deadline_ms / 1000 if request.deadline_ms is not None else None
+    
+    def on_partial(item: Dict) -> None:
+        if item.get("draft"):
+            event = {"event": "draft", "response": item["response"], "agents": item["agents"]}
+        elif item["agent"] == "summarizer":
+            return  # the final synthesis is sent with the result
+        else:
+            event = {"event": "agent", "agent": item["agent"], "response": item["response"]}
+        loop.call_soon_threadsafe(events.put_nowait, event)
+    
+    async def run() -> None:
+        try:
+            final_state = await asyncio.to_thread(
+                run_orchestrator, request.query, on_partial, deadline, cancel_event,
+                request.max_agents, request.token_budget, True
+            )
+            response = build_orchestrator_response(request.query, final_state, request.include_timings)
+            event = {"event": "result", "result": response.model_dump(mode="json")}
+        except Exception as e:
+            logger.error(f"Error streaming query: {str(e)}")
+            event = {"event": "error", "error": str(e)}
+        # Queued after every callback the run scheduled
+        loop.call_soon_threadsafe(events.put_nowait, event)
+    
+    async def stream():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await events.get()
+                yield _ndjson(event)
+                if event["event"] in ("result", "error"):
+                    break
+        finally:
+            # Client gone: stop starting new agent work
+            if not task.done():
+                cancel_event.set()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+# ============================================================================
+# BACKGROUND JOB ENDPOINTS
+# ============================================================================
+
+def _run_job(job_request: Dict, on_partial) -> Dict:
+    """
+    Job runner: execute the orchestrator and return the serialized response
+    
+    The job's deadline_ms counts from when a worker starts the job, not
+    from when it was submitted.
+    """
+    request = QueryRequest(**job_request)
+    deadline = time.monotonic() + request.deadline_ms / 1000 if request.deadline_ms is not None else None
+    final_state = run_orchestrator(
+        request.query, on_partial=on_partial, deadline=deadline,
+        max_agents=request.max_agents, token_budget=request.token_budget
+    )
+    return build_orchestrator_response(request.query, final_state, request.include_timings).model_dump(mode="json")
+
+
+job_queue = JobQueue(runner=_run_job)
+
+
+@app.post("/jobs", response_model=JobResponse, status_code=202, tags=["Jobs"])
+async def submit_job(request: QueryRequest):
+    """
+    Enqueue a query to run in the background
+    
+    Returns immediately with a job id; poll GET /jobs/{job_id} for status,
+    partial agent results and the final response. The request's plan
+    limits, deadline and timing options are stored with the job and apply
+    when it runs.
+    
+    Args:
+        request (QueryRequest): Query request with pharmaceutical question
+        
+    Returns:
+        JobResponse: Job id and status URL
+    """
+    if not request.query or len(request.query.strip()) < 3:
+        raise HTTPException(
+            status_code=400,
+            detail="Query must be at least 3 characters long"
+        )
+    
+    job_id = job_queue.submit(request.model_dump())
+    logger.info(f"Enqueued job {job_id}: {request.query}")
+    return JobResponse(job_id=job_id, status="queued", status_url=f"/jobs/{job_id}")
+
+
+@app.get("/jobs/metrics", tags=["Jobs"])
+async def get_job_metrics():
+    """
+    Get job queue metrics
+    
+    Returns:
+        Dictionary with queue depth, running jobs, counters and wait times
+    """
+    return job_queue.metrics()
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse, tags=["Jobs"])
+async def get_job(job_id: str):
+    """
+    Poll a background job
+    
+    Args:
+        job_id: Identifier returned by POST /jobs
+        
+    Returns:
+        JobStatusResponse: Status, partial results and final result
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    for field in ("created_at", "started_at", "finished_at"):
+        if job[field] is not None:
+            job[field] = datetime.fromtimestamp(job[field])
+    return JobStatusResponse(**job)
+
+
+# ============================================================================
+# REPORT ENDPOINTS
+# ============================================================================
+
+register_cache("report_exports", lambda: (get_report_storage().stats["hits"], get_report_storage().stats["misses"]))
+
+
+@app.post("/report", tags=["Reports"])
+async def create_report(request: ReportRequest):
+    """
+    Run a query and export the answer as a report
+    
+    Markdown and HTML reports are streamed section by section. Exports are
+    stored content-addressed, so re-exporting an unchanged report is served
+    from storage without re-rendering.
+    
+    The export key is returned in the X-Report-Digest header (and as the
+    ETag); GET /reports/{digest} serves the stored report once the stream
+    has completed.
+    
+    Args:
+        request (ReportRequest): Query, export format (md, html, pdf, docx)
+            and plan limits
+        
+    Returns:
+        StreamingResponse: The exported report
+        
+    Example:
+        POST /report
+        {
+            "query": "What are the clinical trials for cancer drug XYZ?",
+            "format": "html"
+        }
+    """
+    try:
+        if not request.query or len(request.query.strip()) < 3:
+            raise HTTPException(
+                status_code=400,
+                detail="Query must be at least 3 characters long"
+            )
+        
+        logger.info(f"Generating {request.format} report for query: {request.query}")
+        
+        # Run orchestrator (or join an identical query already running)
+        final_state = await run_orchestrator_coalesced(
+            request.query, request.deadline_ms, request.max_agents, request.token_budget
+        )
+        digest = await asyncio.to_thread(report_export_key, final_state, request.format)
+        chunks = stream_export(final_state, request.format)
+        # Render the first chunk eagerly so export errors surface as HTTP
+        # errors; a PDF or DOCX renders whole here, so do it off the event loop
+        first_chunk = await asyncio.to_thread(next, chunks, b"")
+        
+        # A sync body is iterated in Starlette's threadpool, which keeps
+        # rendering the remaining sections off the event loop too
+        def body():
+            yield first_chunk
+            yield from chunks
+        
+        return StreamingResponse(
+            body(),
+            media_type=MEDIA_TYPES[request.format],
+            headers={
+                "Content-Disposition": f'attachment; filename="report.{request.format}"',
+                "X-Report-Digest": digest,
+                "ETag": f'"{digest}"'
+            }
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing query: {str(e)}")
+        logger.error(f"Error generating report: {str(e)}")
         raise HTTPException(
             status_code=500,
-            detail=f"Error processing query: {str(e)}"
+            detail=f"Error generating report: {str(e)}"
         )
 
 
+@app.get("/reports/{digest}", tags=["Reports"])
+async def get_stored_report(digest: str, format: str = Query("md", description="Format the report was exported in")):
+    """
+    Fetch a previously exported report
+    
+    Args:
+        digest: X-Report-Digest returned by POST /report, or the SHA-256
+            digest of the exported content
+        format: Export format, used for the content type
+        
+    Returns:
+        Response: The stored report
+    """
+    storage = get_report_storage()
+    content = storage.get(digest)
+    if content is None:
+        export = storage.lookup_export(digest) if re.fullmatch(r"[0-9a-f]{64}", digest) else None
+        content = export["content"] if export else None
+    if content is None or format not in MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail=f"Report {digest} not found")
+    return Response(
+        content=content,
+        media_type=MEDIA_TYPES[format],
+        headers={"ETag": f'"{digest}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
+
+# ============================================================================
+# DATA TOOL CONDITIONAL GET SUPPORT
+# ============================================================================
+
+# Data tool responses may be cached by clients but must be revalidated
+DATA_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+# Serialized response bodies keyed on (path, query string, dataset version)
+DATA_RESPONSE_CACHE_SIZE = 256
+_data_response_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_data_response_stats = {"hits": 0, "misses": 0}
+register_cache("data_response", lambda: (_data_response_stats["hits"], _data_response_stats["misses"]))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """Check an If-Modified-Since header against the dataset's last modified time"""
+    try:
+        return last_modified <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def _data_tool_response(
+    request: Request,
+    tool_name: str,
+    dataset_version: Dict,
+    fetch: Callable[[], Dict],
+    result_key: str
+) -> Response:
+    """
+    Build a data tool response with ETag / conditional GET support
+    
+    The ETag is the dataset content version, so it only changes when the
+    dataset reloads. Matching If-None-Match (or If-Modified-Since) requests
+    get a 304 without touching the data tool, and repeat reads of the same
+    URL reuse the already serialized body.
+    
+    Args:
+        request: Incoming request (for conditional headers and cache key)
+        tool_name: Name of the data tool
+        dataset_version: Version info from the tool's get_dataset_version()
+        fetch: Callable running the data tool lookup
+        result_key: Key holding the result list in the tool response
+        
+    Returns:
+        Response: 304 Not Modified or the JSON DataToolResponse
+    """
+    etag = f'"{tool_name}-{dataset_version["version"]}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(dataset_version["last_modified"], usegmt=True),
+        "Cache-Control": DATA_CACHE_CONTROL
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        if _not_modified_since(request.headers["if-modified-since"], dataset_version["last_modified"]):
+            return Response(status_code=304, headers=headers)
+    
+    cache_key = (request.url.path, str(request.query_params), dataset_version["version"])
+    body = _data_response_cache.get(cache_key)
+    if body is None:
+        _data_response_stats["misses"] += 1
+        result = fetch()
+        body = DataToolResponse(
+            tool_name=tool_name,
+            found=result.get("found", False),
+            count=len(result.get(result_key, [])),
+            data=result.get(result_key, [])
+        ).model_dump_json().encode("utf-8")
+        _data_response_cache[cache_key] = body
+        if len(_data_response_cache) > DATA_RESPONSE_CACHE_SIZE:
+            _data_response_cache.popitem(last=False)
+    else:
+        _data_response_stats["hits"] += 1
+        _data_response_cache.move_to_end(cache_key)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # ============================================================================
 # DATA TOOL ENDPOINTS - Clinical Trials
 # ============================================================================
 
 @app.get("/data/clinical-trials", response_model=DataToolResponse, tags=["Data Tools"])
-async def get_clinical_trials(query: str = Query(..., description="Search query for clinical trials")):
+async def get_clinical_trials(request: Request, query: str = Query(..., description="Search query for clinical trials")):
     """
     Search clinical trials database
     
@@ -212,13 +909,12 @@ async def get_clinical_trials(query: str = Query(..., description="Search query
     try:
         logger.info(f"Clinical trials search: {query}")
         
-        result = get_clinical_trial_data(query)
-        
-        return DataToolResponse(
+        return _data_tool_response(
+            request,
             tool_name="clinical_trials",
-            found=result.get("found", False),
-            count=len(result.get("trials", [])),
-            data=result.get("trials", [])
+            dataset_version=get_clinical_trials_version(),
+            fetch=lambda: get_clinical_trial_data(query),
+            result_key="trials"
         )
         
     except Exception as e:
@@ -230,7 +926,7 @@ async def get_clinical_trials(query: str = Query(..., description="Search query
 
 
 @app.get("/data/clinical-trials/all", response_model=DataToolResponse, tags=["Data Tools"])
-async def get_all_trials():
+async def get_all_trials(request: Request):
     """
     Get all clinical trials from database
     
@@ -240,13 +936,12 @@ async def get_all_trials():
     try:
         logger.info("Fetching all clinical trials")
         
-        result = get_all_clinical_trials()
-        
-        return DataToolResponse(
+        return _data_tool_response(
+            request,
             tool_name="clinical_trials",
-            found=result.get("found", False),
-            count=len(result.get("trials", [])),
-            data=result.get("trials", [])
+            dataset_version=get_clinical_trials_version(),
+            fetch=get_all_clinical_trials,
+            result_key="trials"
         )
         
     except Exception as e:
@@ -262,7 +957,7 @@ async def get_all_trials():
 # ============================================================================
 
 @app.get("/data/patents", response_model=DataToolResponse, tags=["Data Tools"])
-async def get_patents(query: str = Query(..., description="Search query for patents")):
+async def get_patents(request: Request, query: str = Query(..., description="Search query for patents")):
     """
     Search patents database
     
@@ -278,13 +973,12 @@ async def get_patents(query: str = Query(..., description="Search query for pate
     try:
         logger.info(f"Patent search: {query}")
         
-        result = get_patent_data(query)
-        
-        return DataToolResponse(
+        return _data_tool_response(
+            request,
             tool_name="patent",
-            found=result.get("found", False),
-            count=len(result.get("patents", [])),
-            data=result.get("patents", [])
+            dataset_version=get_patents_version(),
+            fetch=lambda: get_patent_data(query),
+            result_key="patents"
         )
         
     except Exception as e:
@@ -296,7 +990,7 @@ async def get_patents(query: str = Query(..., description="Search query for pate
 
 
 @app.get("/data/patents/active", response_model=DataToolResponse, tags=["Data Tools"])
-async def get_active_patents_endpoint():
+async def get_active_patents_endpoint(request: Request):
     """
     Get all active patents from database
     
@@ -306,13 +1000,12 @@ async def get_active_patents_endpoint():
     try:
         logger.info("Fetching active patents")
         
-        result = get_active_patents()
-        
-        return DataToolResponse(
+        return _data_tool_response(
+            request,
             tool_name="patent",
-            found=result.get("found", False),
-            count=len(result.get("patents", [])),
-            data=result.get("patents", [])
+            dataset_version=get_patents_version(),
+            fetch=get_active_patents,
+            result_key="patents"
         )
         
     except Exception as e:
@@ -328,7 +1021,7 @@ async def get_active_patents_endpoint():
 # ============================================================================
 
 @app.get("/data/regulatory", response_model=DataToolResponse, tags=["Data Tools"])
-async def get_regulatory(query: str = Query(..., description="Search query for regulatory data")):
+async def get_regulatory(request: Request, query: str = Query(..., description="Search query for regulatory data")):
     """
     Search regulatory database
     
@@ -344,13 +1037,12 @@ async def get_regulatory(query: str = Query(..., description="Search query for r
     try:
         logger.info(f"Regulatory search: {query}")
         
-        result = get_regulatory_data(query)
-        
-        return DataToolResponse(
+        return _data_tool_response(
+            request,
             tool_name="regulatory",
-            found=result.get("found", False),
-            count=len(result.get("applications", [])),
-            data=result.get("applications", [])
+            dataset_version=get_regulatory_version(),
+            fetch=lambda: get_regulatory_data(query),
+            result_key="applications"
         )
         
     except Exception as e:
@@ -362,7 +1054,7 @@ async def get_regulatory(query: str = Query(..., description="Search query for r
 
 
 @app.get("/data/regulatory/approved", response_model=DataToolResponse, tags=["Data Tools"])
-async def get_approved_drugs_endpoint():
+async def get_approved_drugs_endpoint(request: Request):
     """
     Get all FDA approved drugs from database
     
@@ -372,13 +1064,12 @@ async def get_approved_drugs_endpoint():
     try:
         logger.info("Fetching approved drugs")
         
-        result = get_approved_drugs()
-        
-        return DataToolResponse(
+        return _data_tool_response(
+            request,
             tool_name="regulatory",
-            found=result.get("found", False),
-            count=len(result.get("applications", [])),
-            data=result.get("applications", [])
+            dataset_version=get_regulatory_version(),
+            fetch=get_approved_drugs,
+            result_key="applications"
         )
         
     except Exception as e:
@@ -394,7 +1085,7 @@ async def get_approved_drugs_endpoint():
 # ============================================================================
 
 @app.get("/data/journal", response_model=DataToolResponse, tags=["Data Tools"])
-async def get_journal(query: str = Query(..., description="Search query for journal articles")):
+async def get_journal(request: Request, query: str = Query(..., description="Search query for journal articles")):
     """
     Search scientific journal database
     
@@ -410,13 +1101,12 @@ async def get_journal(query: str = Query(..., description="Search query for jour
     try:
         logger.info(f"Journal search: {query}")
         
-        result = get_journal_data(query)
-        
-        return DataToolResponse(
+        return _data_tool_response(
+            request,
             tool_name="scientific_journal",
-            found=result.get("found", False),
-            count=len(result.get("articles", [])),
-            data=result.get("articles", [])
+            dataset_version=get_journal_version(),
+            fetch=lambda: get_journal_data(query),
+            result_key="articles"
         )
         
     except Exception as e:
@@ -428,7 +1118,7 @@ async def get_journal(query: str = Query(..., description="Search query for jour
 
 
 @app.get("/data/journal/all", response_model=DataToolResponse, tags=["Data Tools"])
-async def get_all_journal_articles():
+async def get_all_journal_articles(request: Request):
     """
     Get all journal articles from database
     
@@ -438,13 +1128,12 @@ async def get_all_journal_articles():
     try:
         logger.info("Fetching all journal articles")
         
-        result = get_all_articles()
-        
-        return DataToolResponse(
+        return _data_tool_response(
+            request,
             tool_name="scientific_journal",
-            found=result.get("found", False),
-            count=len(result.get("articles", [])),
-            data=result.get("articles", [])
+            dataset_version=get_journal_version(),
+            fetch=get_all_articles,
+            result_key="articles"
         )
         
     except Exception as e:
@@ -470,8 +1159,15 @@ async def root():
         "description": "Multi-agent AI system for pharmaceutical research analysis",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "docs": "/docs",
             "query": "/query",
+            "batch": "/query/batch",
+            "context": "/query/context",
+            "stream": "/query/stream",
+            "query_metrics": "/query/metrics",
+            "jobs": "/jobs",
+            "report": "/report",
             "clinical_trials": "/data/clinical-trials",
             "patents": "/data/patents",
             "regulatory": "/data/regulatory",
@@ -517,14 +1213,17 @@ async def general_exception_handler(request, exc):
 
 @app.on_event("startup")
 async def startup_event():
-    """Log application startup"""
+    """Start background workers and log application startup"""
+    await job_queue.start()
     logger.info("Application started successfully")
     logger.info("Endpoints available at http://localhost:8000/docs")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log application shutdown"""
+    """Stop background workers, save agent stats and log application shutdown"""
+    await job_queue.stop()
+    flush_agent_stats()
     logger.info("Application shutting down")
 
 
@@ -0,0 +1,344 @@
+"""Bulk Synthetic Data Generator - Load Testing at Production Scale
+
+Builds millions of realistic trials, patents, regulatory applications,
+journal articles and EXIM rows from the MockDataSources vocabularies.
+Every column is sampled with NumPy in one vectorized call per chunk, so the
+only per-row Python work left is JSON serialization (Parquet output is
+fully columnar).
+
+Run from the ``src`` directory:
+    python -m database.bulk_generator --rows 1000000 --out ./bulk_data
+    python -m database.bulk_generator --datasets trials patents --format parquet
+
+Parquet output needs pyarrow, which is not in req.txt (pip install pyarrow).
+"""
+import argparse
+import os
+import time
+from typing import Callable, Dict, Iterator, List
+
+import numpy as np
+import orjson
+
+from database import MockDataSources
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+
+DEFAULT_CHUNK_SIZE = 250_000
+REFERENCE_YEAR = 2025
+
+MOLECULES = np.array(list(MockDataSources.MOLECULES))
+BRANDS = np.array([info["brand"] for info in MockDataSources.MOLECULES.values()])
+MANUFACTURERS = np.array(MockDataSources.MANUFACTURERS)
+SPONSORS = np.array(MockDataSources.SPONSORS)
+INDICATIONS = np.array(MockDataSources.INDICATIONS)
+
+PHASES = np.array(["Phase 1", "Phase 2", "Phase 3", "Phase 4"])
+PHASE_WEIGHTS = [0.30, 0.35, 0.25, 0.10]
+TRIAL_STATUSES = np.array(["Recruiting", "Active, not recruiting", "Completed", "Enrolling by invitation", "Terminated"])
+TRIAL_STATUS_WEIGHTS = [0.35, 0.25, 0.30, 0.05, 0.05]
+OUTCOMES = np.array(["Overall Survival", "Progression-Free Survival", "HbA1c Reduction", "Blood Pressure Reduction",
+                     "Safety and Tolerability", "Symptom Score Improvement", "Hospitalization Rate"])
+SAFETY_PROFILES = np.array(["Well tolerated, mild side effects", "Generally safe with acceptable tolerability",
+                            "Dose escalation ongoing", "Manageable toxicity with dose adjustments"])
+ADVERSE_EVENT_SETS = [
+    ["Nausea (15%)", "Fatigue (10%)"],
+    ["Headache (5%)", "Gastrointestinal upset (8%)"],
+    ["Neutropenia (Grade 3-4: 8%)", "Fatigue (12%)", "Rash (6%)"],
+    ["Dizziness (4%)"],
+    ["Cytokine release syndrome (Grade 1-2)", "Fever (10%)"],
+    ["Hair loss (20%)", "Nausea (15%)", "Anemia (7%)"],
+]
+
+PATENT_TITLES = np.array(["Crystalline Form of", "Extended Release Formulation of", "Method of Treatment Using",
+                          "Process for Synthesis of", "Combination Therapy Comprising"])
+FTO_STATUSES = np.array(["Clear", "Some patent landscape crowding", "Blocking patents identified"])
+INVENTOR_SETS = [
+    ["Dr. John Smith", "Dr. Sarah Johnson"],
+    ["Dr. Emily Davis"],
+    ["Dr. Michael Chen", "Dr. Lisa Wong"],
+    ["Dr. Robert Wilson", "Dr. Emily Davis", "Dr. Anita Rao"],
+    ["Dr. Carlos Mendez"],
+]
+KEY_CLAIM_SETS = [
+    ["Compound structure", "Oral dosage form"],
+    ["Crystalline form", "Dosage between 50-200mg", "Method of treatment"],
+    ["Polymer-based extended release matrix", "Once-daily dosing capability"],
+    ["Antibody structure", "Intravenous administration"],
+]
+
+APPLICATION_TYPES = np.array(["NDA", "BLA", "IND"])
+APPLICATION_TYPE_WEIGHTS = [0.55, 0.25, 0.20]
+APPROVAL_TYPES = np.array(["Standard Review", "Priority Review", "Accelerated Approval", "Breakthrough Therapy"])
+REGULATORY_STATUSES = np.array(["Approved", "Under Review", "Complete Response Letter", "Withdrawn"])
+REGULATORY_STATUS_WEIGHTS = [0.60, 0.25, 0.10, 0.05]
+DOSAGES = np.array(["100mg capsule, 200mg daily", "50mg tablet, once daily", "10mg/kg IV every 3 weeks",
+                    "500mg extended release, once daily", "25mg subcutaneous, weekly"])
+
+JOURNALS = np.array(["Nature Medicine", "New England Journal of Medicine", "The Lancet", "JAMA",
+                     "Journal of Clinical Oncology", "Diabetes Care", "Circulation"])
+IMPACT_FACTORS = np.array([36.1, 91.2, 79.3, 56.3, 32.9, 14.8, 29.7])
+STUDY_DESIGNS = np.array(["Randomized Controlled Trial", "Observational Cohort", "Meta-Analysis",
+                          "Case-Control Study", "Systematic Review"])
+AUTHOR_SETS = [
+    ["Smith, J.", "Johnson, S.", "Williams, R."],
+    ["Davis, E.", "Chen, M.", "Wong, L."],
+    ["Garcia, M.", "Brown, T."],
+    ["Kim, H.", "Patel, A.", "Müller, K.", "Rossi, F."],
+]
+
+EXPORTERS = np.array(["China", "India", "USA", "Germany", "Japan", "Switzerland", "Belgium", "Ireland"])
+IMPORTERS = np.array(["USA", "Germany", "France", "UK", "Japan", "Canada", "Australia", "Spain"])
+
+
+def _pick(rng: np.random.Generator, values: np.ndarray, n: int, p: List[float] = None) -> np.ndarray:
+    """Sample n values from a vocabulary"""
+    return values[rng.choice(len(values), size=n, p=p)]
+
+
+def _pick_lists(rng: np.random.Generator, pool: List[List[str]], n: int) -> np.ndarray:
+    """Sample n list-valued fields from a pool of pre-built lists"""
+    values = np.empty(len(pool), dtype=object)
+    values[:] = pool
+    return values[rng.integers(0, len(pool), size=n)]
+
+
+def _dates(rng: np.random.Generator, start: str, days: int, n: int) -> np.ndarray:
+    """Sample n ISO dates within `days` days after `start`"""
+    return np.datetime64(start, "D") + rng.integers(0, days, size=n).astype("timedelta64[D]")
+
+
+def _concat(*parts) -> np.ndarray:
+    """Vectorized string concatenation of arrays and scalars"""
+    result = np.asarray(parts[0]).astype(str)
+    for part in parts[1:]:
+        result = np.char.add(result, np.asarray(part).astype(str))
+    return result
+
+
+def generate_trials(rng: np.random.Generator, start: int, n: int) -> Dict[str, np.ndarray]:
+    """Generate n clinical trials shaped like CLINICAL_TRIALS_DB records"""
+    molecule = _pick(rng, MOLECULES, n)
+    phase = _pick(rng, PHASES, n, PHASE_WEIGHTS)
+    indication = _pick(rng, INDICATIONS, n)
+    efficacy = rng.integers(35, 95, size=n)
+    return {
+        "nct_number": _concat("NCT", 10_000_000 + start + np.arange(n)),
+        "title": _concat(phase, " Clinical Trial of ", molecule, " in ", indication),
+        "drug_name": molecule,
+        "phase": phase,
+        "status": _pick(rng, TRIAL_STATUSES, n, TRIAL_STATUS_WEIGHTS),
+        "enrollment": np.clip(rng.lognormal(5.5, 0.8, size=n), 20, 5000).astype(np.int64),
+        "primary_outcome": _pick(rng, OUTCOMES, n),
+        "efficacy_rate": _concat(efficacy, "%"),
+        "safety_profile": _pick(rng, SAFETY_PROFILES, n),
+        "adverse_events": _pick_lists(rng, ADVERSE_EVENT_SETS, n),
+        "indication": indication,
+        "start_date": _dates(rng, "2015-01-01", 365 * 10, n).astype(str),
+        "duration": _concat(rng.choice([6, 12, 18, 24, 36, 48], size=n), " months"),
+        "sponsor": _pick(rng, SPONSORS, n),
+    }
+
+
+def generate_patents(rng: np.random.Generator, start: int, n: int) -> Dict[str, np.ndarray]:
+    """Generate n patents shaped like PATENTS_DB records"""
+    molecule = _pick(rng, MOLECULES, n)
+    title_idx = rng.integers(0, len(PATENT_TITLES), size=n)
+    filing = _dates(rng, "2005-01-01", 365 * 18, n)
+    grant = filing + rng.integers(700, 1600, size=n).astype("timedelta64[D]")
+    expiration = filing + np.timedelta64(7305, "D")
+    years_remaining = expiration.astype("datetime64[Y]").astype(np.int64) + 1970 - REFERENCE_YEAR
+    return {
+        "patent_number": _concat("US", 9_000_000 + start + np.arange(n)),
+        "title": _concat(PATENT_TITLES[title_idx], " ", molecule),
+        "filing_date": filing.astype(str),
+        "grant_date": grant.astype(str),
+        "expiration_date": expiration.astype(str),
+        "years_remaining": np.maximum(years_remaining, 0),
+        "status": np.where(years_remaining > 0, "Active", "Expired"),
+        "assignee": _pick(rng, MANUFACTURERS, n),
+        "inventors": _pick_lists(rng, INVENTOR_SETS, n),
+        "claims_count": rng.integers(5, 60, size=n),
+        "abstract": _concat("A novel ", np.char.lower(PATENT_TITLES)[title_idx], " ", molecule,
+                            " for the treatment of ", _pick(rng, INDICATIONS, n)),
+        "key_claims": _pick_lists(rng, KEY_CLAIM_SETS, n),
+        "citations": rng.poisson(30, size=n),
+        "freedom_to_operate": _pick(rng, FTO_STATUSES, n, [0.6, 0.3, 0.1]),
+    }
+
+
+def generate_regulatory(rng: np.random.Generator, start: int, n: int) -> Dict[str, np.ndarray]:
+    """Generate n regulatory applications shaped like REGULATORY_DB records"""
+    app_type = _pick(rng, APPLICATION_TYPES, n, APPLICATION_TYPE_WEIGHTS)
+    status = _pick(rng, REGULATORY_STATUSES, n, REGULATORY_STATUS_WEIGHTS)
+    submission = _dates(rng, "2012-01-01", 365 * 12, n)
+    approval = submission + rng.integers(180, 420, size=n).astype("timedelta64[D]")
+    molecule_idx = rng.integers(0, len(MOLECULES), size=n)
+    return {
+        "application_number": _concat(app_type, "-", 200_000 + start + np.arange(n)),
+        "application_type": app_type,
+        "drug_name": MOLECULES[molecule_idx],
+        "brand_name": BRANDS[molecule_idx],
+        "submission_date": submission.astype(str),
+        "approval_date": np.where(status == "Approved", approval.astype(str), "N/A"),
+        "status": status,
+        "approval_type": _pick(rng, APPROVAL_TYPES, n),
+        "indication": _concat("Treatment of ", _pick(rng, INDICATIONS, n)),
+        "dosage": _pick(rng, DOSAGES, n),
+        "manufacturer": _pick(rng, MANUFACTURERS, n),
+        "adverse_events_reported": _pick_lists(rng, ADVERSE_EVENT_SETS, n),
+        "black_box_warning": rng.random(size=n) < 0.10,
+        "rems_required": rng.random(size=n) < 0.08,
+    }
+
+
+def generate_articles(rng: np.random.Generator, start: int, n: int) -> Dict[str, np.ndarray]:
+    """Generate n journal articles shaped like JOURNAL_DB records"""
+    journal_idx = rng.integers(0, len(JOURNALS), size=n)
+    molecule_idx = rng.integers(0, len(MOLECULES), size=n)
+    indication_idx = rng.integers(0, len(INDICATIONS), size=n)
+    design_idx = rng.integers(0, len(STUDY_DESIGNS), size=n)
+    molecule, indication, design = MOLECULES[molecule_idx], INDICATIONS[indication_idx], STUDY_DESIGNS[design_idx]
+    design_lower = np.char.lower(STUDY_DESIGNS)[design_idx]
+    first_page = rng.integers(1, 2000, size=n)
+    return {
+        "doi": _concat("10.", rng.integers(1000, 9999, size=n), "/pharma.", start + np.arange(n)),
+        "title": _concat(molecule, " in ", indication, ": a ", design_lower),
+        "authors": _pick_lists(rng, AUTHOR_SETS, n),
+        "journal": JOURNALS[journal_idx],
+        "publication_date": _dates(rng, "2010-01-01", 365 * 15, n).astype(str),
+        "volume": rng.integers(1, 400, size=n).astype(str),
+        "issue": rng.integers(1, 13, size=n).astype(str),
+        "pages": _concat(first_page, "-", first_page + rng.integers(5, 20, size=n)),
+        "impact_factor": IMPACT_FACTORS[journal_idx],
+        "citations": rng.negative_binomial(2, 0.02, size=n),
+        "abstract": _concat("This ", design_lower, " evaluates ", molecule, " in patients with ", indication),
+        "study_design": design,
+        "sample_size": np.clip(rng.lognormal(6, 1, size=n), 20, 50000).astype(np.int64),
+        "primary_endpoint": _pick(rng, OUTCOMES, n),
+        "keywords": np.stack([np.char.lower(MOLECULES)[molecule_idx], np.char.lower(INDICATIONS)[indication_idx],
+                              design_lower], axis=1),
+    }
+
+
+def generate_exim(rng: np.random.Generator, start: int, n: int) -> Dict[str, np.ndarray]:
+    """Generate n EXIM shipment rows shaped like MockDataSources.search_exim entries"""
+    volume = np.round(rng.lognormal(11, 1.2, size=n), 0)
+    unit_price = np.round(rng.uniform(5, 100, size=n), 2)
+    return {
+        "row_id": start + np.arange(n),
+        "molecule": _pick(rng, MOLECULES, n),
+        "hs_code": _concat(rng.integers(2900, 3005, size=n), ".", rng.integers(10, 91, size=n)),
+        "quarter": _concat("Q", rng.integers(1, 5, size=n), " ", rng.integers(2019, 2025, size=n)),
+        "exporter": _pick(rng, EXPORTERS, n),
+        "importer": _pick(rng, IMPORTERS, n),
+        "volume_kg": volume,
+        "unit_price_usd_per_kg": unit_price,
+        "value_usd_million": np.round(volume * unit_price / 1e6, 4),
+    }
+
+
+GENERATORS: Dict[str, Callable[[np.random.Generator, int, int], Dict[str, np.ndarray]]] = {
+    "trials": generate_trials,
+    "patents": generate_patents,
+    "regulatory": generate_regulatory,
+    "articles": generate_articles,
+    "exim": generate_exim,
+}
+
+
+def iter_chunks(dataset: str, rows: int, seed: int = 0,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield column chunks for a dataset
+
+    Each dataset gets its own seeded generator, so output is reproducible
+    for a given (dataset, rows, seed, chunk_size).
+    """
+    if dataset not in GENERATORS:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    rng = np.random.default_rng([seed, list(GENERATORS).index(dataset)])
+    generate = GENERATORS[dataset]
+    for start in range(0, rows, chunk_size):
+        yield generate(rng, start, min(chunk_size, rows - start))
+
+
+def _write_jsonl(path: str, chunks: Iterator[Dict[str, np.ndarray]]) -> None:
+    """Write column chunks as JSON lines"""
+    with open(path, "wb") as fh:
+        for columns in chunks:
+            keys = list(columns)
+            values = [columns[key].tolist() for key in keys]
+            fh.write(b"".join(
+                orjson.dumps(dict(zip(keys, row)), option=orjson.OPT_APPEND_NEWLINE)
+                for row in zip(*values)
+            ))
+
+
+def _write_parquet(path: str, chunks: Iterator[Dict[str, np.ndarray]]) -> None:
+    """Write column chunks as a Parquet file"""
+    if pa is None:
+        raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+    writer = None
+    try:
+        for columns in chunks:
+            table = pa.table({
+                key: pa.array(col.tolist()) if col.dtype == object or col.ndim > 1 else pa.array(col)
+                for key, col in columns.items()
+            })
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_dataset(dataset: str, rows: int, out_dir: str, fmt: str = "jsonl",
+                  seed: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Generate a dataset and write it to `out_dir`
+
+    Returns:
+        Path of the written file
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{dataset}.{fmt}")
+    chunks = iter_chunks(dataset, rows, seed=seed, chunk_size=chunk_size)
+    if fmt == "jsonl":
+        _write_jsonl(path, chunks)
+    elif fmt == "parquet":
+        _write_parquet(path, chunks)
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+    return path
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate bulk synthetic pharma data for load testing")
+    parser.add_argument("--datasets", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per dataset")
+    parser.add_argument("--out", default="bulk_data", help="Output directory")
+    parser.add_argument("--format", dest="fmt", default="jsonl", choices=["jsonl", "parquet"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    if args.fmt == "parquet" and pa is None:
+        parser.error("--format parquet requires pyarrow (pip install pyarrow)")
+
+    for dataset in args.datasets:
+        started = time.perf_counter()
+        path = write_dataset(dataset, args.rows, args.out, args.fmt, args.seed, args.chunk_size)
+        elapsed = time.perf_counter() - started
+        print(f"{dataset}: {args.rows:,} rows -> {path} in {elapsed:.2f}s "
+              f"({args.rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
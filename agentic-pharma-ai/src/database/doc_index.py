@@ -0,0 +1,447 @@
+"""Internal Document Index - Local Search Behind search_internal_docs
+
+Indexes a local folder of PDF, DOCX and text files into page-aware chunks
+and serves hybrid lexical (BM25) + vector (hashed character trigram) search
+over them. Re-indexing is incremental: only files whose mtime or size
+changed are re-parsed. The index is persisted next to the documents so a
+restart does not re-parse anything. Re-indexing runs beside searches, which
+keep serving the previous index until the new one is swapped in.
+
+Set INTERNAL_DOCS_DIR to enable it for MockDataSources.search_internal_docs.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PDF support is optional
+    PdfReader = None
+
+try:
+    import docx
+except ImportError:  # DOCX support is optional
+    docx = None
+
+logger = logging.getLogger(__name__)
+
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt", ".md"}
+INDEX_DIRNAME = ".doc_index"
+INDEX_FORMAT_VERSION = 1
+
+CHUNK_CHARS = 800
+CHUNK_OVERLAP = 100
+# Text and DOCX files have no pages; split them into pseudo-pages
+PSEUDO_PAGE_CHARS = 3000
+VECTOR_DIM = 512
+EXCERPT_CHARS = 300
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+LEXICAL_WEIGHT = 0.7
+
+REFRESH_INTERVAL_S = 60.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords"""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def embed(text: str, dim: int = VECTOR_DIM) -> np.ndarray:
+    """
+    Hashed character-trigram vector (L2-normalized)
+
+    Complements BM25 with fuzzy matching on spelling variants and word
+    forms. Computed fully in NumPy from the UTF-8 bytes of the text.
+    """
+    codes = np.frombuffer(" ".join(_TOKEN_RE.findall(text.lower())).encode("utf-8"), dtype=np.uint8)
+    vector = np.zeros(dim, dtype=np.float32)
+    if len(codes) >= 3:
+        codes = codes.astype(np.int64)
+        hashes = (codes[:-2] * 961 + codes[1:-1] * 31 + codes[2:]) % dim
+        vector = np.bincount(hashes, minlength=dim).astype(np.float32)
+        vector = np.sqrt(vector)  # sublinear trigram frequency
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+    return vector
+
+
+def _extract_pages(path: str) -> List[str]:
+    """Extract the text of a document as a list of pages"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        if PdfReader is None:
+            raise RuntimeError("PDF indexing requires pypdf (pip install pypdf)")
+        return [page.extract_text() or "" for page in PdfReader(path).pages]
+    if ext == ".docx":
+        if docx is None:
+            raise RuntimeError("DOCX indexing requires python-docx (pip install python-docx)")
+        text = "\n".join(p.text for p in docx.Document(path).paragraphs)
+    else:
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            text = fh.read()
+        if "\f" in text:
+            return text.split("\f")
+    return [text[i:i + PSEUDO_PAGE_CHARS] for i in range(0, max(len(text), 1), PSEUDO_PAGE_CHARS)]
+
+
+def chunk_pages(pages: List[str]) -> List[Tuple[int, str]]:
+    """Split pages into overlapping chunks, keeping 1-based page numbers"""
+    chunks = []
+    for page_number, page in enumerate(pages, start=1):
+        text = " ".join(page.split())
+        step = CHUNK_CHARS - CHUNK_OVERLAP
+        for start in range(0, len(text), step):
+            piece = text[start:start + CHUNK_CHARS]
+            if piece.strip():
+                chunks.append((page_number, piece))
+            if start + CHUNK_CHARS >= len(text):
+                break
+    return chunks
+
+
+class InternalDocIndex:
+    """Persisted hybrid search index over a folder of internal documents"""
+
+    def __init__(self, root: str, index_dir: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.index_dir = index_dir or os.path.join(self.root, INDEX_DIRNAME)
+        # _lock guards swapping the searchable state; _refresh_lock serializes
+        # re-indexing, which runs without blocking searches
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._last_refresh = 0.0
+
+        # files: relative path -> {"mtime", "size", "start", "count"}, plus
+        # "failed": True for a file that could not be parsed at that mtime
+        self.files: Dict[str, Dict] = {}
+        # chunks: [{"file", "page", "text", "tf"}] in vector row order
+        self.chunks: List[Dict] = []
+        self.vectors = np.zeros((0, VECTOR_DIM), dtype=np.float32)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._avg_len = 1.0
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        manifest_path = os.path.join(self.index_dir, "manifest.json")
+        vectors_path = os.path.join(self.index_dir, "vectors.npy")
+        if not (os.path.exists(manifest_path) and os.path.exists(vectors_path)):
+            return
+        try:
+            with open(manifest_path, "rb") as fh:
+                manifest = orjson.loads(fh.read())
+            if manifest.get("format") != INDEX_FORMAT_VERSION:
+                return
+            self.files = manifest["files"]
+            self.chunks = manifest["chunks"]
+            self.vectors = np.load(vectors_path)
+            self._postings, self._doc_len, self._avg_len = _lexical_index(self.chunks)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable document index at {self.index_dir}: {e}")
+            self.files, self.chunks = {}, []
+            self.vectors = np.zeros((0, VECTOR_DIM), dtype=np.float32)
+
+    def _save(self) -> None:
+        os.makedirs(self.index_dir, exist_ok=True)
+        manifest = {"format": INDEX_FORMAT_VERSION, "files": self.files, "chunks": self.chunks}
+        tmp_manifest = os.path.join(self.index_dir, "manifest.json.tmp")
+        with open(tmp_manifest, "wb") as fh:
+            fh.write(orjson.dumps(manifest))
+        tmp_vectors = os.path.join(self.index_dir, "vectors.tmp.npy")
+        np.save(tmp_vectors, self.vectors)
+        os.replace(tmp_vectors, os.path.join(self.index_dir, "vectors.npy"))
+        os.replace(tmp_manifest, os.path.join(self.index_dir, "manifest.json"))
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def _scan(self) -> Dict[str, os.stat_result]:
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                    path = os.path.join(dirpath, name)
+                    found[os.path.relpath(path, self.root)] = os.stat(path)
+        return found
+
+    def refresh(self) -> Dict:
+        """
+        Incrementally re-index the folder
+
+        Unchanged files (same mtime and size) keep their chunks and vectors;
+        new or modified files are re-parsed and removed files are dropped.
+        A file that fails to parse loses its previous chunks and is recorded
+        as failed, so it is not retried until its mtime or size changes.
+        When nothing changed the current index is kept as is; otherwise the
+        new index is built aside and swapped in, so searches running
+        meanwhile see the previous index.
+
+        Returns:
+            Dictionary with added/updated/removed/failed file counts
+        """
+        with self._refresh_lock:
+            started = time.perf_counter()
+            on_disk = self._scan()
+            with self._lock:
+                files, all_chunks, all_vectors = self.files, self.chunks, self.vectors
+            stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "failed": 0}
+
+            new_files: Dict[str, Dict] = {}
+            new_chunks: List[Dict] = []
+            vector_parts: List[np.ndarray] = []
+
+            for rel_path in sorted(on_disk):
+                stat = on_disk[rel_path]
+                previous = files.get(rel_path)
+                if previous and previous["mtime"] == stat.st_mtime and previous["size"] == stat.st_size:
+                    chunks = all_chunks[previous["start"]:previous["start"] + previous["count"]]
+                    vectors = all_vectors[previous["start"]:previous["start"] + previous["count"]]
+                    failed = previous.get("failed", False)
+                    stats["unchanged"] += 1
+                else:
+                    try:
+                        pieces = chunk_pages(_extract_pages(os.path.join(self.root, rel_path)))
+                        failed = False
+                    except Exception as e:
+                        logger.warning(f"Could not index {rel_path}: {e}")
+                        pieces, failed = [], True
+                    chunks = [
+                        {"file": rel_path, "page": page, "text": text, "tf": _term_freqs(text)}
+                        for page, text in pieces
+                    ]
+                    vectors = (np.stack([embed(c["text"]) for c in chunks]) if chunks
+                               else np.zeros((0, VECTOR_DIM), dtype=np.float32))
+                    stats["failed" if failed else "updated" if previous else "added"] += 1
+
+                new_files[rel_path] = {
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                    "start": len(new_chunks),
+                    "count": len(chunks)
+                }
+                if failed:
+                    new_files[rel_path]["failed"] = True
+                new_chunks.extend(chunks)
+                vector_parts.append(vectors)
+
+            stats["removed"] = len(set(files) - set(on_disk))
+            # A new failure is persisted too, so a restart does not retry the file
+            changed = stats["added"] or stats["updated"] or stats["removed"] or stats["failed"]
+
+            if changed:
+                vectors = (np.concatenate(vector_parts) if vector_parts
+                           else np.zeros((0, VECTOR_DIM), dtype=np.float32))
+                lexical = _lexical_index(new_chunks)
+                with self._lock:
+                    self.files, self.chunks, self.vectors = new_files, new_chunks, vectors
+                    self._postings, self._doc_len, self._avg_len = lexical
+                self._save()
+            self._last_refresh = time.monotonic()
+
+            stats["chunks"] = len(self.chunks)
+            stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            logger.info(f"Internal document index refreshed: {stats}")
+            return stats
+
+    def refresh_if_stale(self, max_age_s: float = REFRESH_INTERVAL_S, wait: bool = True) -> bool:
+        """
+        Re-index at most once every `max_age_s` seconds
+
+        Args:
+            max_age_s: Minimum age of the index before it is refreshed
+            wait: Refresh inline; when False the refresh runs on a background
+                thread (at most one at a time) and the caller returns at once
+
+        Returns:
+            True if a refresh ran or was started
+        """
+        if time.monotonic() - self._last_refresh < max_age_s:
+            return False
+        if wait:
+            self.refresh()
+            return True
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh, name="doc-index-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+        return True
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Internal document index refresh failed: {e}")
+            # Back off for a full interval instead of retrying on every search
+            self._last_refresh = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict]:
+        """
+        Hybrid BM25 + vector search
+
+        Returns:
+            Top chunks as {"file", "page", "text", "score"} sorted by score
+        """
+        with self._lock:
+            n = len(self.chunks)
+            if n == 0:
+                return []
+
+            lexical = np.zeros(n, dtype=np.float32)
+            for token in set(tokenize(query)):
+                posting = self._postings.get(token)
+                if posting is None:
+                    continue
+                rows, tf = posting
+                idf = np.log1p((n - len(rows) + 0.5) / (len(rows) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[rows] / self._avg_len)
+                lexical[rows] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            if lexical.max() > 0:
+                lexical /= lexical.max()
+
+            semantic = np.clip(self.vectors @ embed(query), 0, None)
+            scores = LEXICAL_WEIGHT * lexical + (1 - LEXICAL_WEIGHT) * semantic
+
+            k = min(top_k, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {
+                    "file": self.chunks[i]["file"],
+                    "page": self.chunks[i]["page"],
+                    "text": self.chunks[i]["text"],
+                    "score": float(scores[i])
+                }
+                for i in top if scores[i] > 0
+            ]
+
+    def search_response(self, query: str, top_k: int = 5) -> Dict:
+        """Search and shape the results like MockDataSources.search_internal_docs"""
+        started = time.perf_counter()
+        hits = self.search(query, top_k=top_k)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        documents = []
+        insights = []
+        for hit in hits:
+            excerpt = _excerpt(hit["text"], query)
+            mtime = self.files.get(hit["file"], {}).get("mtime")
+            documents.append({
+                "filename": hit["file"],
+                "page": hit["page"],
+                "relevance_score": round(hit["score"], 2),
+                "excerpt": excerpt
+            })
+            insights.append({
+                "insight": excerpt,
+                "source": f"{hit['file']}, Page {hit['page']}",
+                "date": datetime.fromtimestamp(mtime).strftime("%Y") if mtime else "N/A",
+                "confidence": "High" if hit["score"] >= 0.6 else "Medium" if hit["score"] >= 0.3 else "Low"
+            })
+
+        return {
+            "query": query,
+            "relevant_documents": documents,
+            "key_insights": insights[:3],
+            "field_feedback": [],
+            "_metadata": {
+                "ocr_processing": "Not available - text layer only",
+                "citation_format": "Source: [Filename, Page #]",
+                "conflicting_info": "Not assessed",
+                "search_completeness": f"{sum(not f.get('failed') for f in self.files.values())} documents, "
+                                       f"{len(self.chunks)} chunks indexed",
+                "hallucination_guard": "Strict - only indexed excerpts returned",
+                "query_ms": elapsed_ms
+            }
+        }
+
+
+def _lexical_index(chunks: List[Dict]) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], np.ndarray, float]:
+    """Build BM25 postings (token -> chunk rows, term frequencies), chunk lengths and mean length"""
+    rows: Dict[str, List[int]] = {}
+    freqs: Dict[str, List[int]] = {}
+    doc_len = np.zeros(len(chunks), dtype=np.float32)
+    for i, chunk in enumerate(chunks):
+        for token, count in chunk["tf"].items():
+            rows.setdefault(token, []).append(i)
+            freqs.setdefault(token, []).append(count)
+        doc_len[i] = sum(chunk["tf"].values())
+    postings = {
+        token: (np.array(rows[token], dtype=np.int32), np.array(freqs[token], dtype=np.float32))
+        for token in rows
+    }
+    return postings, doc_len, float(doc_len.mean()) if len(doc_len) else 1.0
+
+
+def _term_freqs(text: str) -> Dict[str, int]:
+    freqs: Dict[str, int] = {}
+    for token in tokenize(text):
+        freqs[token] = freqs.get(token, 0) + 1
+    return freqs
+
+
+def _excerpt(text: str, query: str) -> str:
+    """Cut an excerpt of the chunk centred on the first query term match"""
+    lowered = text.lower()
+    positions = [lowered.find(t) for t in tokenize(query)]
+    positions = [p for p in positions if p >= 0]
+    start = max(0, min(positions) - EXCERPT_CHARS // 3) if positions else 0
+    excerpt = text[start:start + EXCERPT_CHARS].strip()
+    return ("..." if start else "") + excerpt + ("..." if start + EXCERPT_CHARS < len(text) else "")
+
+
+_index: Optional[InternalDocIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_internal_doc_index() -> Optional[InternalDocIndex]:
+    """
+    Get the shared index for INTERNAL_DOCS_DIR (None when not configured)
+
+    Only a folder with no persisted index is indexed inline, on first use.
+    After that the folder is re-indexed incrementally on a background thread
+    at most every REFRESH_INTERVAL_S, and callers get the current index
+    without waiting for it.
+    """
+    global _index
+    root = os.getenv("INTERNAL_DOCS_DIR")
+    if not root or not os.path.isdir(root):
+        return None
+    with _index_lock:
+        if _index is None or _index.root != os.path.abspath(root):
+            _index = InternalDocIndex(root)
+            if not _index.files:
+                _index.refresh()
+        index = _index
+    index.refresh_if_stale(wait=False)
+    return index
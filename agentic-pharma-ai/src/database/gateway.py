@@ -0,0 +1,142 @@
+"""Async Data Source Gateway - Parallel Fan-out to Remote Sources
+
+Wraps each MockDataSources call with a per-source timeout, a concurrency
+semaphore and retry with jittered exponential backoff. Simulated latency
+and error rates can be configured per source, so the fan-out behaviour of
+real remote sources can be reproduced locally.
+
+    gateway = DataSourceGateway()
+    result = await gateway.search_molecule("Metformin")
+"""
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from database import MockDataSources
+
+logger = logging.getLogger(__name__)
+
+
+class SourceError(Exception):
+    """Raised when a data source call fails (including simulated failures)"""
+
+
+@dataclass
+class SourceConfig:
+    """Per-source gateway settings"""
+    timeout_s: float = 5.0
+    max_concurrency: int = 8
+    retries: int = 2
+    backoff_base_s: float = 0.1
+    backoff_max_s: float = 2.0
+    # Simulated remote behaviour for local testing
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+
+DEFAULT_SOURCES: Dict[str, Callable[[str], Dict]] = {
+    "iqvia": MockDataSources.search_iqvia,
+    "exim": MockDataSources.search_exim,
+    "patents": MockDataSources.search_patents,
+    "clinical_trials": MockDataSources.search_clinical_trials,
+    "internal_docs": MockDataSources.search_internal_docs,
+    "web_search": MockDataSources.web_search,
+}
+
+
+class DataSourceGateway:
+    """Async gateway in front of the (synchronous) data sources"""
+
+    def __init__(
+        self,
+        sources: Optional[Dict[str, Callable[[str], Dict]]] = None,
+        configs: Optional[Dict[str, SourceConfig]] = None,
+        default_config: Optional[SourceConfig] = None,
+        seed: Optional[int] = None
+    ):
+        self.sources = dict(sources or DEFAULT_SOURCES)
+        self.default_config = default_config or SourceConfig()
+        self.configs = {name: (configs or {}).get(name, self.default_config) for name in self.sources}
+        self._semaphores = {
+            name: asyncio.Semaphore(config.max_concurrency) for name, config in self.configs.items()
+        }
+        # Local RNG for simulated latency, errors and backoff jitter
+        self._rng = random.Random(seed)
+
+    async def _call_once(self, name: str, arg: str) -> Dict:
+        """Run one attempt against a source, applying simulated latency/errors"""
+        config = self.configs[name]
+        if config.latency_ms or config.latency_jitter_ms:
+            delay_ms = config.latency_ms + self._rng.uniform(0, config.latency_jitter_ms)
+            await asyncio.sleep(delay_ms / 1000)
+        if config.error_rate and self._rng.random() < config.error_rate:
+            raise SourceError(f"Simulated failure from {name}")
+        return await asyncio.to_thread(self.sources[name], arg)
+
+    async def fetch(self, name: str, arg: str) -> Dict:
+        """
+        Fetch from a single source with timeout, concurrency limit and retries
+
+        Args:
+            name: Source name (e.g. "iqvia", "patents")
+            arg: Molecule or query passed to the source
+
+        Returns:
+            Source payload
+
+        Raises:
+            SourceError: If every attempt failed or timed out
+        """
+        if name not in self.sources:
+            raise ValueError(f"Unknown data source: {name}")
+        config = self.configs[name]
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(config.retries + 1):
+            if attempt:
+                # Full jitter: sleep uniformly in [0, min(max, base * 2^attempt)]
+                cap = min(config.backoff_max_s, config.backoff_base_s * 2 ** attempt)
+                await asyncio.sleep(self._rng.uniform(0, cap))
+            try:
+                async with self._semaphores[name]:
+                    return await asyncio.wait_for(self._call_once(name, arg), timeout=config.timeout_s)
+            except asyncio.TimeoutError:
+                last_error = SourceError(f"{name} timed out after {config.timeout_s}s")
+            except Exception as e:
+                last_error = e
+            logger.warning(f"Data source {name} attempt {attempt + 1} failed: {last_error}")
+
+        raise SourceError(f"{name} failed after {config.retries + 1} attempts: {last_error}")
+
+    async def search_molecule(self, molecule: str) -> Dict:
+        """
+        Query every source for a molecule in parallel
+
+        Total latency is bounded by the slowest source (its timeout times its
+        attempts); a failing source is reported under "errors" instead of
+        failing the whole query.
+
+        Returns:
+            Dictionary with per-source payloads, errors and timings
+        """
+        async def timed(name: str):
+            started = time.perf_counter()
+            try:
+                return name, await self.fetch(name, molecule), None, time.perf_counter() - started
+            except SourceError as e:
+                return name, None, str(e), time.perf_counter() - started
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(timed(name) for name in self.sources))
+
+        return {
+            "molecule": molecule,
+            "sources": {name: payload for name, payload, error, _ in outcomes if error is None},
+            "errors": {name: error for name, _, error, _ in outcomes if error is not None},
+            "timings_ms": {name: round(elapsed * 1000, 2) for name, _, _, elapsed in outcomes},
+            "total_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
@@ -1,5 +1,5 @@
 from langchain_core.messages import SystemMessage
-from services.llm_service import llm
+from services.llm_service import get_llm
 from graph.state import State
 from prompts.system_prompts import ORCHESTRATOR_PROMPT
 
@@ -56,7 +56,7 @@ Choose one:
 
 Respond with only the agent name (e.g., 'clinical_trials')"""
         
-        response = llm.invoke([SystemMessage(content=routing_prompt)])
+        response = get_llm("router").invoke([SystemMessage(content=routing_prompt)])
         response_text = response.content.lower()
         
         if "patent" in response_text:
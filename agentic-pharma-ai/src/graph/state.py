@@ -1,6 +1,6 @@
 # placeholder
 from typing import Annotated
-from typing_extensions import TypedDict
+from typing_extensions import NotRequired, TypedDict
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
 
@@ -10,4 +10,14 @@ class State(TypedDict):
     patent_prompt: Annotated[str, "System prompt for patent agent."]
     regulator_prompt: Annotated[str, "System prompt for regulatory agent."]
     scientific_journal_prompt: Annotated[str, "System prompt for scientific journal agent."]
-    message : Annotated[list[HumanMessage | AIMessage], "The list of messages exchanged so far."]
\ No newline at end of file
+    message : Annotated[list[HumanMessage | AIMessage], "The list of messages exchanged so far."]
+    plan: NotRequired[Annotated[dict, "Planner output: chosen agents and estimated cost."]]
+    agent_outputs: NotRequired[Annotated[list[dict], "Per-specialist response, data found, latency and tokens."]]
+    timings: NotRequired[Annotated[dict, "Per-stage timings and token usage of the run."]]
+    partial: NotRequired[Annotated[bool, "Whether the run stopped early (deadline or cancellation)."]]
+    skipped_agents: NotRequired[Annotated[list[str], "Planned agents that did not run or finish."]]
+    synthesis: NotRequired[Annotated[str, "Synthesis outcome: none, full, shortened, merged, incremental or skipped."]]
+    structured_findings: NotRequired[Annotated[bool, "Whether specialists are asked for structured findings."]]
+    degraded: NotRequired[Annotated[bool, "Whether the answer was built from data alone (LLM circuit open)."]]
+    fast_path: NotRequired[Annotated[dict, "Entity and field of a question answered straight from the database."]]
+    summary_max_tokens: NotRequired[Annotated[int, "Output token cap for a shortened synthesis."]]
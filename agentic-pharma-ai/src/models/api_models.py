@@ -2,19 +2,90 @@
 Request and Response models for the Orchestrator API
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
+from models.findings import Finding
+
 
 class QueryRequest(BaseModel):
     """Request model for pharmaceutical research queries"""
     query: str = Field(..., description="The pharmaceutical research question")
-    max_agents: Optional[int] = Field(default=5, description="Maximum number of agents to use")
+    max_agents: Optional[int] = Field(default=5, ge=1, description="Maximum number of agents to use")
+    token_budget: Optional[int] = Field(default=None, ge=1, description="Optional cap on the plan's estimated LLM tokens")
+    deadline_ms: Optional[int] = Field(default=None, ge=100, description="Latency budget; a partial answer is returned when it runs out")
+    include_timings: bool = Field(default=False, description="Return per-stage timings and token usage")
     
     class Config:
         example = {
             "query": "What are the clinical trials and FDA approval status for cancer drug XYZ?",
-            "max_agents": 5
+            "max_agents": 5,
+            "deadline_ms": 20000,
+            "include_timings": True
+        }
+
+
+class BatchQueryRequest(BaseModel):
+    """Request model for a batch of pharmaceutical research queries"""
+    queries: List[str] = Field(..., min_length=1, max_length=500, description="Questions to answer")
+    concurrency: int = Field(default=8, ge=1, le=32, description="Maximum queries running concurrently")
+    
+    class Config:
+        example = {
+            "queries": [
+                "What is the FDA approval status of DTZ-100?",
+                "Which patents protect Cancer Drug XYZ?"
+            ],
+            "concurrency": 8
+        }
+
+
+class ContextRequest(BaseModel):
+    """Request model for retrieval-only query context"""
+    query: str = Field(..., description="The pharmaceutical research question")
+    max_agents: Optional[int] = Field(default=5, ge=1, description="Maximum number of agents to plan")
+    token_budget: Optional[int] = Field(default=None, ge=1, description="Optional cap on the plan's estimated LLM tokens")
+    
+    class Config:
+        example = {
+            "query": "FDA approval status and patents for DTZ-100",
+            "max_agents": 2
+        }
+
+
+class ReportRequest(BaseModel):
+    """Request model for exporting a research report"""
+    query: str = Field(..., description="The pharmaceutical research question")
+    format: Literal["md", "html", "pdf", "docx"] = Field(default="md", description="Export format")
+    max_agents: Optional[int] = Field(default=5, ge=1, description="Maximum number of agents to use")
+    token_budget: Optional[int] = Field(default=None, ge=1, description="Optional cap on the plan's estimated LLM tokens")
+    deadline_ms: Optional[int] = Field(default=None, ge=100, description="Latency budget; a partial report is exported when it runs out")
+    
+    class Config:
+        example = {
+            "query": "What are the clinical trials and FDA approval status for cancer drug XYZ?",
+            "format": "html",
+            "max_agents": 3
+        }
+
+
+class PlanInfo(BaseModel):
+    """Agents chosen by the planner and the plan's estimated cost"""
+    agents: List[str] = Field(..., description="Specialist agents in run order")
+    estimated_tokens: int = Field(..., description="Estimated LLM tokens, including synthesis")
+    estimated_latency_ms: int = Field(..., description="Estimated sequential latency, including synthesis")
+    max_agents: Optional[int] = Field(None, description="Agent limit applied")
+    token_budget: Optional[int] = Field(None, description="Token budget applied")
+    dropped: Dict[str, str] = Field(default_factory=dict, description="Relevant agents left out and why")
+    
+    class Config:
+        example = {
+            "agents": ["regulatory", "clinical_trials"],
+            "estimated_tokens": 6600,
+            "estimated_latency_ms": 18000,
+            "max_agents": 2,
+            "token_budget": None,
+            "dropped": {"patent": "max_agents"}
         }
 
 
@@ -23,6 +94,11 @@ class AgentResponse(BaseModel):
     agent_name: str = Field(..., description="Name of the agent (clinical_trials, patent, etc)")
     response: str = Field(..., description="The agent's analysis and response")
     data_found: bool = Field(..., description="Whether relevant data was found")
+    finding: Optional[Finding] = Field(None, description="Structured finding, when structured findings are enabled")
+    latency_ms: Optional[float] = Field(None, description="Wall time of the agent, including tool lookup and LLM call")
+    prompt_tokens: Optional[int] = Field(None, description="Prompt tokens of the agent's LLM call")
+    completion_tokens: Optional[int] = Field(None, description="Completion tokens of the agent's LLM call")
+    cached_tokens: Optional[int] = Field(None, description="Prompt tokens served from the provider's cache")
     timestamp: datetime = Field(default_factory=datetime.now)
     
     class Config:
@@ -30,10 +106,80 @@ class AgentResponse(BaseModel):
             "agent_name": "clinical_trials",
             "response": "Based on clinical trial NCT04567890...",
             "data_found": True,
+            "latency_ms": 5412.7,
+            "prompt_tokens": 1830,
+            "completion_tokens": 412,
+            "cached_tokens": 1024,
             "timestamp": "2025-12-10T12:00:00"
         }
 
 
+class StageTiming(BaseModel):
+    """Timing of one orchestrator stage"""
+    stage: str = Field(..., description="planning, fast_path, agent, tool_lookup, format_context, llm, increment, synthesis_wait or merge")
+    agent: Optional[str] = Field(None, description="Agent the stage ran for")
+    ms: float = Field(..., description="Wall time in milliseconds")
+    found: Optional[bool] = Field(None, description="Tool lookups: whether data was found")
+    prompt_tokens: Optional[int] = Field(None, description="LLM calls: prompt tokens")
+    completion_tokens: Optional[int] = Field(None, description="LLM calls: completion tokens")
+    cached_tokens: Optional[int] = Field(None, description="LLM calls: cached prompt tokens")
+    tier: Optional[str] = Field(None, description="Cascaded LLM calls: small or large model")
+    escalation: Optional[str] = Field(None, description="Cascaded LLM calls: check that triggered escalation")
+
+
+class TimingInfo(BaseModel):
+    """Where the time and tokens of a query went"""
+    total_ms: float = Field(..., description="Wall time of the whole orchestrator run")
+    stages: List[StageTiming] = Field(default_factory=list, description="Stages in completion order")
+    tokens: Dict[str, int] = Field(default_factory=dict, description="Token totals over all LLM calls")
+
+
+class EntityInfo(BaseModel):
+    """An identifier or drug name found in the query"""
+    type: str = Field(..., description="nct_number, patent_number, application_number, doi or drug_name")
+    value: str = Field(..., description="Normalized value (database key form)")
+    found: bool = Field(..., description="Whether the value exists in its database")
+
+
+class ChatMessage(BaseModel):
+    """One message of an LLM prompt"""
+    role: Literal["system", "user", "assistant"] = Field(..., description="Message role")
+    content: str = Field(..., description="Message text")
+
+
+class AgentContext(BaseModel):
+    """A planned specialist's retrieved records and the prompt it would send"""
+    agent: str = Field(..., description="Specialist agent")
+    lookup_query: str = Field(..., description="Text its data tool was queried with (the user's question)")
+    live_lookup_input: Literal["query", "previous_answer"] = Field(
+        ..., description="What a live run looks data up with; for previous_answer (every specialist after "
+                         "the first) the live records and messages can differ from this context"
+    )
+    found: bool = Field(..., description="Whether its data tool found records")
+    records: List[Dict[str, Any]] = Field(default_factory=list, description="Records returned by the data tool")
+    record_ids: List[str] = Field(default_factory=list, description="Ids of the records (NCT, patent, application number or DOI)")
+    data_context: str = Field(..., description="Formatted data context message")
+    messages: List[ChatMessage] = Field(..., description="Messages the specialist would send to its LLM")
+
+
+class ContextResponse(BaseModel):
+    """Plan, entities and per-agent context of a query, without any LLM call"""
+    query: str = Field(..., description="The original query")
+    plan: PlanInfo = Field(..., description="Planner output with estimated cost")
+    entities: List[EntityInfo] = Field(default_factory=list, description="Identifiers and drug names found in the query")
+    agents: List[AgentContext] = Field(default_factory=list, description="Context of each planned specialist, in run order")
+    timings: TimingInfo = Field(..., description="Planning, entity extraction, tool lookup and formatting timings")
+    
+    class Config:
+        example = {
+            "query": "FDA approval status and patents for DTZ-100",
+            "plan": {"agents": ["regulatory", "patent"], "estimated_tokens": 6600, "estimated_latency_ms": 18000},
+            "entities": [{"type": "drug_name", "value": "DTZ-100", "found": True}],
+            "agents": [],
+            "timings": {"total_ms": 2.4, "stages": [], "tokens": {}}
+        }
+
+
 class OrchestratorResponse(BaseModel):
     """Response from the orchestrator"""
     query: str = Field(..., description="The original query")
@@ -42,6 +188,13 @@ class OrchestratorResponse(BaseModel):
     agent_count: int = Field(..., description="Number of agents consulted")
     total_messages: int = Field(..., description="Total messages in conversation")
     synthesis_performed: bool = Field(..., description="Whether synthesis was performed")
+    partial: bool = Field(default=False, description="Whether the deadline cut the run short")
+    skipped_agents: List[str] = Field(default_factory=list, description="Planned agents that did not finish in time")
+    degraded: bool = Field(default=False, description="Whether the answer was built from data alone because the LLM is unavailable")
+    fast_path: Optional[Dict[str, str]] = Field(None, description="Agent, entity and field of a question answered straight from the database")
+    plan: Optional[PlanInfo] = Field(None, description="Planner output with estimated cost")
+    agent_responses: List[AgentResponse] = Field(default_factory=list, description="Each specialist's response")
+    timings: Optional[TimingInfo] = Field(None, description="Per-stage timings, when requested")
     timestamp: datetime = Field(default_factory=datetime.now)
     
     class Config:
@@ -52,10 +205,55 @@ class OrchestratorResponse(BaseModel):
             "agent_count": 2,
             "total_messages": 4,
             "synthesis_performed": True,
+            "partial": False,
+            "skipped_agents": [],
+            "degraded": False,
             "timestamp": "2025-12-10T12:00:00"
         }
 
 
+class JobResponse(BaseModel):
+    """Response returned when a query job is enqueued"""
+    job_id: str = Field(..., description="Identifier to poll with GET /jobs/{job_id}")
+    status: str = Field(..., description="Job status (queued, running, completed, failed)")
+    status_url: str = Field(..., description="URL to poll for the job status")
+    
+    class Config:
+        example = {
+            "job_id": "3f9c2a7e1b8d4c6fa0e5d2b1c4a7e9f0",
+            "status": "queued",
+            "status_url": "/jobs/3f9c2a7e1b8d4c6fa0e5d2b1c4a7e9f0"
+        }
+
+
+class JobStatusResponse(BaseModel):
+    """Status, partial results and final result of a query job"""
+    job_id: str = Field(..., description="Job identifier")
+    query: str = Field(..., description="The original query")
+    status: str = Field(..., description="Job status (queued, running, completed, failed)")
+    queue_position: Optional[int] = Field(default=None, description="Jobs ahead of this one while queued")
+    created_at: datetime = Field(..., description="When the job was submitted")
+    started_at: Optional[datetime] = Field(default=None, description="When a worker picked the job up")
+    finished_at: Optional[datetime] = Field(default=None, description="When the job finished")
+    partial_results: List[Dict[str, Any]] = Field(default=[], description="Agent outputs produced so far")
+    result: Optional[OrchestratorResponse] = Field(default=None, description="Final result once completed")
+    error: Optional[str] = Field(default=None, description="Error message if the job failed")
+    
+    class Config:
+        example = {
+            "job_id": "3f9c2a7e1b8d4c6fa0e5d2b1c4a7e9f0",
+            "query": "Compare clinical trials and patents for DTZ-100",
+            "status": "running",
+            "queue_position": None,
+            "created_at": "2025-12-10T12:00:00",
+            "started_at": "2025-12-10T12:00:01",
+            "finished_at": None,
+            "partial_results": [{"agent": "clinical_trials", "response": "DTZ-100 is in Phase 2..."}],
+            "result": None,
+            "error": None
+        }
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = Field(..., description="Health status")
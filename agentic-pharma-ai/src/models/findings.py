@@ -0,0 +1,23 @@
+"""
+Structured specialist findings
+"""
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class Finding(BaseModel):
+    """A specialist's answer as structured data"""
+    summary: str = Field(..., min_length=1, description="One or two sentence answer to the question")
+    key_facts: List[str] = Field(default_factory=list, description="Facts from the retrieved records, one per item")
+    risks: List[str] = Field(default_factory=list, description="Risks, warnings or open issues")
+    cited_ids: List[str] = Field(default_factory=list, description="Ids of the records the facts come from")
+    confidence: float = Field(..., ge=0, le=1, description="Confidence that the records answer the question")
+
+    class Config:
+        example = {
+            "summary": "DTZ-100 is FDA approved for Type 2 diabetes.",
+            "key_facts": ["NDA-207892 approved on 2020-09-14 (Standard Review)"],
+            "risks": ["Pancreatitis risk monitoring required"],
+            "cited_ids": ["NDA-207892"],
+            "confidence": 0.9
+        }
@@ -4,10 +4,24 @@ This orchestrator performs simple planning to determine which specialist
 agents should run for a given user query, invokes those agents sequentially,
 and then synthesizes their outputs into a single final response.
 """
-from typing import List
+import contextvars
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
 from graph.state import State
+from services.agent_stats import get_agent_stats
+from services.circuit_breaker import CircuitOpenError, llm_circuit_open
+from services.fact_answers import answer_fact
+from services.findings import merge_findings, needs_synthesis
+from services.metrics import observe_run
+from services.timings import agent_scope, collect_timings, current_stages, summarize_timings, timed, token_usage
+from tools.entities import extract_entities
 from prompts.system_prompts import (
     ORCHESTRATOR_PROMPT,
     CLINICAL_TRIALS_PROMPT,
@@ -18,6 +32,64 @@ from prompts.system_prompts import (
 )
 
 
+# With a deadline, the summarizer is skipped when less than the minimum
+# budget remains and runs shortened when less than the full budget remains
+SUMMARIZER_MIN_BUDGET_MS = int(os.getenv("SUMMARIZER_MIN_BUDGET_MS", "1500"))
+SUMMARIZER_FULL_BUDGET_MS = int(os.getenv("SUMMARIZER_FULL_BUDGET_MS", "8000"))
+SHORT_SUMMARY_TOKENS = int(os.getenv("SHORT_SUMMARY_TOKENS", "300"))
+# Answer single-field patent / application questions straight from the database
+FACT_FAST_PATH = os.getenv("FACT_FAST_PATH", "1") not in ("0", "false", "no")
+# Specialists return structured findings, merged without the summarizer when possible
+STRUCTURED_FINDINGS = os.getenv("STRUCTURED_FINDINGS", "0") not in ("0", "false", "no")
+# Revise a synthesis draft as each specialist finishes instead of summarizing at the end
+INCREMENTAL_SYNTHESIS = os.getenv("INCREMENTAL_SYNTHESIS", "0") not in ("0", "false", "no")
+# Output tokens an incremental synthesis draft may spend per specialist it covers
+INCREMENT_TOKENS_PER_OUTPUT = int(os.getenv("INCREMENT_TOKENS_PER_OUTPUT", "200"))
+
+# How often a waiting run checks its deadline and cancellation flag
+_POLL_INTERVAL_S = 0.05
+_agent_pool = ThreadPoolExecutor(max_workers=int(os.getenv("AGENT_WORKERS", "16")), thread_name_prefix="agent")
+
+
+# Planner: keywords signalling each specialist's relevance
+AGENT_KEYWORDS = {
+    "clinical_trials": ["clinical trial", "nct", "study", "patient", "efficacy", "phase"],
+    "patent": ["patent", "intellectual property", "ip", "formulation", "chemical"],
+    "regulatory": ["fda", "approval", "compliance", "safety", "regulatory", "nda", "bla", "ind"],
+    "scientific_journal": ["journal", "research", "published", "paper", "study", "literature", "immunotherapy", "nature"],
+}
+_KEYWORD_PATTERNS = {
+    agent: [re.compile(rf"\b{re.escape(k)}") for k in keywords]
+    for agent, keywords in AGENT_KEYWORDS.items()
+}
+_BROAD_PATTERN = re.compile(r"\b(compare|all|across)\b")
+# Relevance given to every specialist by broad "compare / all / across" queries
+BROAD_RELEVANCE = 0.4
+# Relevance of the fallback agent when no keyword matched
+DEFAULT_RELEVANCE = 0.1
+# Cost normalisers: an agent costing this many tokens (or ms) halves its value
+TOKEN_COST_SCALE = 2000.0
+LATENCY_COST_SCALE = 10000.0
+
+# State key holding each specialist's system prompt
+AGENT_PROMPT_KEYS = {
+    "clinical_trials": "clinical_trials_prompt",
+    "patent": "patent_prompt",
+    "regulatory": "regulator_prompt",
+    "scientific_journal": "scientific_journal_prompt",
+}
+
+# Heads answers built from data alone while the LLM circuit is open
+DEGRADED_NOTICE = (
+    "**Degraded answer:** the language model is currently unavailable, so this "
+    "response lists the matching database records without expert analysis."
+)
+
+
+class AgentInterrupted(Exception):
+    """Raised when a run stops waiting on an agent (deadline or cancellation)"""
+
+
 def initialize_state(user_query: str) -> State:
     """
     Initialize the state with system prompts and the initial user query
@@ -38,31 +110,105 @@ def initialize_state(user_query: str) -> State:
     }
 
 
-def plan_agents(query: str) -> List[str]:
+def normalize_query(query: str) -> str:
+    """Normalize a query for deduplication (case and whitespace insensitive)"""
+    return " ".join(query.lower().split())
+
+
+def score_relevance(query: str) -> Dict[str, float]:
     """
-    Simple planner: choose which agents should handle the query.
-    Returns a list of agent keys (matching module names):
-    `clinical_trials`, `patent`, `regulatory`, `scientific_journal`.
+    Score how relevant each specialist is to a query (0-1)
+
+    Each matched keyword adds 0.5; broad "compare", "all" or "across"
+    queries give every specialist at least BROAD_RELEVANCE.
     """
     q = query.lower()
-    agents = []
+    broad = bool(_BROAD_PATTERN.search(q))
+    scores = {}
+    for agent, patterns in _KEYWORD_PATTERNS.items():
+        hits = sum(1 for pattern in patterns if pattern.search(q))
+        relevance = min(1.0, 0.5 * hits)
+        if broad:
+            relevance = max(relevance, BROAD_RELEVANCE)
+        scores[agent] = relevance
+    return scores
+
+
+def build_plan(query: str, max_agents: Optional[int] = None, token_budget: Optional[int] = None) -> Dict:
+    """
+    Cost- and latency-aware planner
+
+    Each relevant specialist is valued by its relevance divided by its
+    expected cost (historical tokens and latency from AgentStats).
+    Specialists are taken in order of value while the plan stays within
+    `max_agents` and, including the summarizer needed to combine several
+    outputs, within `token_budget`. The most valuable specialist is always
+    planned so every query gets an answer.
+
+    Args:
+        query: The user's question
+        max_agents: Maximum number of specialists to run
+        token_budget: Optional cap on the plan's estimated tokens
+
+    Returns:
+        Dictionary with the planned agents (in run order), estimated
+        tokens and latency, per-agent scores and the dropped agents with
+        the reason they were dropped
+    """
+    stats = get_agent_stats()
+    relevance = score_relevance(query)
+    if not any(relevance.values()):
+        # Default to clinical_trials if nothing matched
+        relevance["clinical_trials"] = DEFAULT_RELEVANCE
+
+    scores = {}
+    for agent, rel in relevance.items():
+        if rel <= 0:
+            continue
+        estimate = stats.estimate(agent)
+        cost = 1 + estimate["tokens"] / TOKEN_COST_SCALE + estimate["latency_ms"] / LATENCY_COST_SCALE
+        scores[agent] = {"relevance": rel, "value": round(rel / cost, 4), **estimate}
+
+    ranked = sorted(scores, key=lambda a: (scores[a]["value"], scores[a]["relevance"]), reverse=True)
+    summarizer = stats.estimate("summarizer")
+
+    def plan_cost(agents: List[str]) -> Tuple[float, float]:
+        tokens = sum(scores[a]["tokens"] for a in agents)
+        latency = sum(scores[a]["latency_ms"] for a in agents)
+        if len(agents) > 1:
+            tokens += summarizer["tokens"]
+            latency += summarizer["latency_ms"]
+        return tokens, latency
+
+    selected: List[str] = []
+    dropped: Dict[str, str] = {}
+    for agent in ranked:
+        if max_agents is not None and len(selected) >= max_agents:
+            dropped[agent] = "max_agents"
+        elif selected and token_budget is not None and plan_cost(selected + [agent])[0] > token_budget:
+            dropped[agent] = "token_budget"
+        else:
+            selected.append(agent)
 
-    # keywords
-    if any(k in q for k in ["clinical trial", "nct", "study", "patient", "efficacy", "phase"]):
-        agents.append("clinical_trials")
-    if any(k in q for k in ["patent", "intellectual property", "ip", "formulation", "chemical"]):
-        agents.append("patent")
-    if any(k in q for k in ["fda", "approval", "compliance", "safety", "regulatory", "nda", "bla", "ind"]):
-        agents.append("regulatory")
-    if any(k in q for k in ["journal", "research", "published", "paper", "study", "literature", "immunotherapy", "nature"]):
-        agents.append("scientific_journal")
+    tokens, latency = plan_cost(selected)
+    return {
+        "agents": selected,
+        "estimated_tokens": int(round(tokens)),
+        "estimated_latency_ms": int(round(latency)),
+        "max_agents": max_agents,
+        "token_budget": token_budget,
+        "scores": {a: {k: round(v, 4) for k, v in s.items()} for a, s in scores.items()},
+        "dropped": dropped
+    }
 
-    # If user explicitly asks to compare or all domains, include all
-    if ("compare" in q or "all" in q or "across" in q) and len(agents) < 4:
-        return ["clinical_trials", "patent", "regulatory", "scientific_journal"]
 
-    # Default to clinical_trials if nothing matched
-    return agents or ["clinical_trials"]
+def plan_agents(query: str, max_agents: Optional[int] = None, token_budget: Optional[int] = None) -> List[str]:
+    """
+    Choose which agents should handle the query.
+    Returns a list of agent keys (matching module names):
+    `clinical_trials`, `patent`, `regulatory`, `scientific_journal`.
+    """
+    return build_plan(query, max_agents, token_budget)["agents"]
 
 
 def _import_agent(agent_key: str):
@@ -82,7 +228,249 @@ def _import_agent(agent_key: str):
     return fn
 
 
-def run_orchestrator(user_query: str) -> dict:
+def _import_context_builder(agent_key: str):
+    """Dynamically import a specialist's data context builder by key."""
+    if agent_key == "clinical_trials":
+        from agents.clinical_trials_agent import build_clinical_trials_context as fn
+    elif agent_key == "patent":
+        from agents.patent_agent import build_patent_context as fn
+    elif agent_key == "regulatory":
+        from agents.regulator_agent import build_regulatory_context as fn
+    elif agent_key == "scientific_journal":
+        from agents.scientific_journal_agent import build_journal_context as fn
+    else:
+        raise ValueError(f"Unknown agent: {agent_key}")
+    return fn
+
+
+def degraded_output(agent_key: str, query: str) -> str:
+    """Data-only stand-in for a specialist's answer: its formatted records"""
+    context = _import_context_builder(agent_key)(query)
+    return context["formatted_data"].strip() or "No matching records found for the query."
+
+
+def build_context_bundle(user_query: str, max_agents: Optional[int] = None,
+                         token_budget: Optional[int] = None) -> Dict:
+    """
+    Retrieval without generation: plan, entities, records and agent prompts
+
+    Runs planning, entity extraction and the planned specialists' data
+    tool lookups, and builds the messages each specialist would send to
+    its LLM. No LLM is called.
+
+    Every specialist's lookup here uses the user's question. In a live
+    run only the first specialist does: each later one looks up data with
+    the last message, which is the previous specialist's answer, and also
+    sends the earlier answers to its LLM. Neither exists without an LLM,
+    so for those agents (`live_lookup_input` "previous_answer") the
+    records and messages can differ from a live run.
+
+    Args:
+        user_query: The user's question
+        max_agents: Maximum number of specialists the planner may choose
+        token_budget: Optional cap on the plan's estimated tokens
+
+    Returns:
+        Dictionary with the plan, extracted entities, one entry per
+        planned agent (lookup query, records, record ids, data context
+        and messages) and stage timings
+    """
+    started = time.perf_counter()
+    state = initialize_state(user_query)
+    agents = []
+    with collect_timings() as stages:
+        with timed("planning"):
+            plan = build_plan(user_query, max_agents, token_budget)
+        with timed("entity_extraction"):
+            entities = extract_entities(user_query)
+        for index, key in enumerate(plan["agents"]):
+            with agent_scope(key):
+                context = _import_context_builder(key)(user_query)
+            data = context["data"]
+            records = next((v for v in data.values() if isinstance(v, list)), []) if data.get("found") else []
+            agents.append({
+                "agent": key,
+                "lookup_query": user_query,
+                "live_lookup_input": "query" if index == 0 else "previous_answer",
+                "found": bool(data.get("found")),
+                "records": records,
+                "record_ids": [i for i in context["record_ids"] if i],
+                "data_context": context["data_context"],
+                "messages": [
+                    {"role": "system", "content": state[AGENT_PROMPT_KEYS[key]]},
+                    {"role": "user", "content": context["data_context"]},
+                    {"role": "user", "content": user_query},
+                ],
+            })
+    return {
+        "plan": plan,
+        "entities": entities,
+        "agents": agents,
+        "timings": {
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+            **summarize_timings(list(stages))
+        },
+    }
+
+
+def _remaining_ms(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else (deadline - time.monotonic()) * 1000
+
+
+def _call_agent(agent_fn: Callable, state: State, deadline: Optional[float],
+                cancel_event: Optional[threading.Event]) -> dict:
+    """
+    Invoke an agent, giving up when the deadline passes or the run is cancelled
+
+    Without a deadline or cancel event the agent runs inline. Otherwise it
+    runs on the agent pool (in the caller's context) and is waited on in
+    short intervals. An abandoned agent's result is discarded; its in-flight
+    LLM request cannot be interrupted, but no further calls are started.
+    """
+    if deadline is None and cancel_event is None:
+        return agent_fn(state)
+
+    future = _agent_pool.submit(contextvars.copy_context().run, agent_fn, state)
+    return _wait_for(future, deadline, cancel_event)
+
+
+def _wait_for(future: Future, deadline: Optional[float], cancel_event: Optional[threading.Event]):
+    """Wait for a pool future in short intervals, raising AgentInterrupted on deadline or cancellation"""
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            future.cancel()
+            raise AgentInterrupted("cancelled")
+        timeout = _POLL_INTERVAL_S
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                future.cancel()
+                raise AgentInterrupted("deadline")
+            timeout = min(timeout, remaining)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            continue
+
+
+class IncrementalSynthesizer:
+    """
+    Synthesis draft revised on the agent pool while specialists still run
+
+    Each completed specialist output is folded into the draft as soon as
+    it arrives, overlapping the next specialist's call: the summarizer is
+    given the current draft and the new output and returns the whole
+    revised report (at most INCREMENT_TOKENS_PER_OUTPUT tokens per
+    specialist covered), which replaces the draft. Outputs arriving while
+    a step is in flight are folded together by the next one, so when the
+    last specialist finishes only one step is left, and the final draft is
+    a synthesis of all outputs rather than a list of per-step fragments.
+    Every updated draft is passed to `on_draft`.
+    """
+
+    def __init__(self, query: str, on_draft: Optional[Callable[[Dict], None]] = None,
+                 deadline: Optional[float] = None, cancel_event: Optional[threading.Event] = None):
+        self.query = query
+        self.on_draft = on_draft
+        self.deadline = deadline
+        self.cancel_event = cancel_event
+        self.draft = ""
+        self.folded: List[str] = []
+        self._pending: List[Dict] = []
+        self._future: Optional[Future] = None
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    def add(self, output: Dict) -> None:
+        """Queue a completed agent output for the next step (none start after a failed step)"""
+        with self._lock:
+            self._pending.append(output)
+            if self._future is None and self._error is None:
+                self._future = _agent_pool.submit(contextvars.copy_context().run, self._drain)
+
+    def _drain(self) -> None:
+        from agents.summarizer_agent import summarize_increment
+
+        try:
+            while True:
+                with self._lock:
+                    batch, self._pending = self._pending, []
+                    if not batch or (self.cancel_event is not None and self.cancel_event.is_set()):
+                        self._future = None
+                        return
+                max_tokens = INCREMENT_TOKENS_PER_OUTPUT * (len(self.folded) + len(batch))
+                remaining_ms = _remaining_ms(self.deadline)
+                if remaining_ms is not None and remaining_ms < SUMMARIZER_FULL_BUDGET_MS:
+                    max_tokens = min(max_tokens, SHORT_SUMMARY_TOKENS)
+                with agent_scope("summarizer"), timed("increment"):
+                    revised = summarize_increment(self.query, self.draft, batch, max_tokens)
+                self.draft = revised.content
+                self.folded += [o["agent"] for o in batch]
+                if self.on_draft is not None:
+                    self.on_draft({"agent": "summarizer", "response": self.draft,
+                                   "draft": True, "agents": list(self.folded)})
+        except Exception as e:
+            # Reset with the failure recorded, so finish() raises it even
+            # when called after this step ended
+            with self._lock:
+                self._error = e
+                self._future = None
+            raise
+
+    def finish(self) -> Optional[AIMessage]:
+        """
+        Wait for the outstanding steps and return the final draft
+
+        Raises:
+            AgentInterrupted: The deadline passed or the run was cancelled
+            Exception: Whatever a step raised (e.g. CircuitOpenError)
+        """
+        with self._lock:
+            future = self._future
+        if future is not None:
+            _wait_for(future, self.deadline, self.cancel_event)
+        if self._error is not None:
+            raise self._error
+        return AIMessage(content=self.draft) if self.folded else None
+
+
+def _record_agent_stats(agent_key: str, started: float, result) -> None:
+    """Feed an agent call's latency and reported token usage to the planner stats"""
+    tokens = None
+    if isinstance(result, dict) and result.get("message"):
+        usage = getattr(result["message"][-1], "usage_metadata", None) or {}
+        tokens = usage.get("total_tokens")
+    get_agent_stats().record(agent_key, (time.perf_counter() - started) * 1000, tokens)
+
+
+def _agent_output(agent_key: str, message, latency_ms: float) -> Dict:
+    """Per-agent result entry: response, structured finding, whether its tool found data, latency and tokens"""
+    lookups = [r for r in current_stages() if r.get("agent") == agent_key and r["stage"] == "tool_lookup"]
+    return {
+        "agent": agent_key,
+        "response": message.content,
+        "finding": getattr(message, "response_metadata", {}).get("finding"),
+        "data_found": any(r.get("found") for r in lookups),
+        "latency_ms": round(latency_ms, 3),
+        **token_usage(message)
+    }
+
+
+def merge_agent_outputs(outputs: List[Dict]) -> str:
+    """Join specialist outputs under headings (used when synthesis is skipped)"""
+    if not outputs:
+        return "No agent completed before the request deadline."
+    return "\n\n".join(
+        f"## {o['agent'].replace('_', ' ').title()}\n\n{o['response']}" for o in outputs
+    )
+
+
+def run_orchestrator(user_query: str, on_partial: Optional[Callable[[Dict], None]] = None,
+                     deadline: Optional[float] = None,
+                     cancel_event: Optional[threading.Event] = None,
+                     max_agents: Optional[int] = None,
+                     token_budget: Optional[int] = None,
+                     incremental: Optional[bool] = None) -> dict:
     """
     Execute the orchestrator using a simple plan-and-execute loop.
 
@@ -91,20 +479,133 @@ def run_orchestrator(user_query: str) -> dict:
     2. Plan which agents to run
     3. Invoke each agent sequentially, updating state
     4. If multiple agents produced responses, run `summarizer` to synthesize
+
+    With a deadline, agents that have not finished in time are abandoned
+    and the rest are skipped; the summarizer is shortened or skipped when
+    time runs short, in which case the completed outputs are merged
+    without an LLM call. Setting `cancel_event` (e.g. on client disconnect)
+    stops the run at the next check. The returned state carries the
+    `plan`, `agent_outputs`, `partial`, `skipped_agents`, `synthesis`
+    ("none", "full", "shortened", "merged", "incremental" or "skipped"), `degraded` and `timings`
+    (planning, tool lookups, context formatting and LLM calls, with token
+    usage).
+
+    Single-entity, single-field questions about a patent or application
+    ("when does US10234567 expire?") are answered from the database
+    without planning or LLM calls; `fast_path` then names the entity and
+    field.
+
+    With STRUCTURED_FINDINGS, specialists return validated findings (key
+    facts, risks, cited ids, confidence). When every finding is confident
+    and the question does not ask for comparison or judgement they are
+    merged deterministically ("merged") instead of calling the summarizer.
+
+    With incremental synthesis, the summarizer starts a draft from the
+    first completed specialist on and revises it with later outputs while
+    the remaining specialists run; each draft is passed to `on_partial`
+    with "draft": True, and the answer ("incremental") follows the last
+    specialist by one revision step. If a revision step fails, the full
+    summarizer synthesizes the outputs instead. A deterministic merge
+    still takes precedence when it applies.
+
+    While the LLM circuit breaker is open (or once it opens mid-run) the
+    remaining specialists answer with their formatted records instead of
+    an LLM call, no synthesis runs, and the answer is flagged `degraded`.
+
+    Args:
+        user_query: The user's question
+        on_partial: Optional callback receiving {"agent", "response"} after
+            each agent (including the summarizer) finishes
+        deadline: Optional time.monotonic() value by which to answer
+        cancel_event: Optional event that cancels outstanding work when set
+        max_agents: Maximum number of specialists the planner may choose
+        token_budget: Optional cap on the plan's estimated tokens
+        incremental: Revise the synthesis as specialists finish
+            (default: INCREMENTAL_SYNTHESIS)
     """
+    started = time.perf_counter()
+    if incremental is None:
+        incremental = INCREMENTAL_SYNTHESIS
+    with collect_timings() as stages:
+        state = _run(user_query, on_partial, deadline, cancel_event, max_agents, token_budget, incremental)
+    # Copy: an abandoned agent may still record stages after the run returns
+    state["timings"] = {
+        "total_ms": round((time.perf_counter() - started) * 1000, 3),
+        **summarize_timings(list(stages))
+    }
+    observe_run(state)
+    return state
+
+
+def _run(user_query: str, on_partial: Optional[Callable[[Dict], None]],
+         deadline: Optional[float], cancel_event: Optional[threading.Event],
+         max_agents: Optional[int], token_budget: Optional[int], incremental: bool) -> dict:
     state = initialize_state(user_query)
+    state["partial"] = False
+    state["skipped_agents"] = []
+    state["synthesis"] = "none"
+    state["agent_outputs"] = []
+    state["structured_findings"] = STRUCTURED_FINDINGS
+    state["degraded"] = False
+
+    if FACT_FAST_PATH:
+        started = time.perf_counter()
+        with timed("fast_path"):
+            fact = answer_fact(user_query)
+        if fact is not None:
+            message = AIMessage(content=fact["answer"])
+            state["message"] = state["message"] + [message]
+            state["fast_path"] = {k: fact[k] for k in ("agent", "entity", "field")}
+            state["agent_outputs"].append({
+                "agent": fact["agent"],
+                "response": fact["answer"],
+                "data_found": True,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3)
+            })
+            if on_partial is not None:
+                on_partial({"agent": fact["agent"], "response": fact["answer"]})
+            return state
+
+    state["degraded"] = llm_circuit_open()
 
     # Decide which agents to run
-    agent_keys = plan_agents(user_query)
+    with timed("planning"):
+        state["plan"] = build_plan(user_query, max_agents, token_budget)
+    agent_keys = state["plan"]["agents"]
+    completed = state["agent_outputs"]
+    synthesizer = None
+    if incremental and len(agent_keys) > 1 and not state["degraded"]:
+        synthesizer = IncrementalSynthesizer(user_query, on_partial, deadline, cancel_event)
+
+    def answer_from_data(key: str, started: float) -> None:
+        with agent_scope(key), timed("agent"):
+            message = AIMessage(content=degraded_output(key, user_query))
+        state["message"] = state["message"] + [message]
+        completed.append(_agent_output(key, message, (time.perf_counter() - started) * 1000))
+        if on_partial is not None:
+            on_partial({"agent": key, "response": message.content})
 
     # Run each agent sequentially
-    for key in agent_keys:
+    for i, key in enumerate(agent_keys):
         agent_fn = _import_agent(key)
+        started = time.perf_counter()
+        if state["degraded"]:
+            answer_from_data(key, started)
+            continue
         try:
-            result = agent_fn(state)
+            with agent_scope(key), timed("agent"):
+                result = _call_agent(agent_fn, state, deadline, cancel_event)
+            _record_agent_stats(key, started, result)
+        except CircuitOpenError:
+            state["degraded"] = True
+            answer_from_data(key, started)
+            continue
+        except AgentInterrupted:
+            state["partial"] = True
+            state["skipped_agents"] = agent_keys[i:]
+            break
         except Exception as e:
             # Attach an error AIMessage-like placeholder
-            from langchain_core.messages import AIMessage
             messages = state.get("message", [])
             messages.append(AIMessage(content=f"Agent {key} error: {e}"))
             state["message"] = messages
@@ -113,20 +614,90 @@ def run_orchestrator(user_query: str) -> dict:
         # Expect agent result to contain an updated 'message' list
         if isinstance(result, dict) and result.get("message"):
             state["message"] = result["message"]
+            completed.append(_agent_output(key, state["message"][-1], (time.perf_counter() - started) * 1000))
+            if on_partial is not None:
+                on_partial({"agent": key, "response": state["message"][-1].content})
+            if synthesizer is not None:
+                synthesizer.add(completed[-1])
+
+    if cancel_event is not None and cancel_event.is_set():
+        # Nobody is waiting for the answer any more
+        return state
+
+    if not completed and state["partial"]:
+        state["message"] = state["message"] + [AIMessage(content=merge_agent_outputs([]))]
+        return state
 
     # If more than one agent ran, synthesize
-    if len(agent_keys) > 1:
-        summarizer = _import_agent("summarizer")
-        try:
-            result = summarizer(state)
-            if isinstance(result, dict) and result.get("message"):
-                state["message"] = result["message"]
-        except Exception:
-            pass
+    if len(agent_keys) > 1 and completed and not state["degraded"]:
+        if state["structured_findings"] and needs_synthesis(user_query, [o["finding"] for o in completed]) is None:
+            with timed("merge"):
+                merged = merge_findings(completed)
+            state["message"] = state["message"] + [AIMessage(content=merged)]
+            state["synthesis"] = "merged"
+        else:
+            if synthesizer is not None:
+                try:
+                    # Only the revision folding in the last outputs is left
+                    with agent_scope("summarizer"), timed("synthesis_wait"):
+                        draft = synthesizer.finish()
+                    if draft is not None:
+                        state["message"] = state["message"] + [draft]
+                        state["synthesis"] = "incremental"
+                        if on_partial is not None:
+                            on_partial({"agent": "summarizer", "response": draft.content})
+                except AgentInterrupted:
+                    state["synthesis"] = "skipped"
+                except CircuitOpenError:
+                    state["degraded"] = True
+                except Exception:
+                    # A failed revision step leaves no usable draft: synthesize from scratch
+                    synthesizer = None
+            if synthesizer is None:
+                _synthesize(state, on_partial, deadline, cancel_event)
+
+        if state["synthesis"] == "skipped":
+            state["partial"] = True
+            with timed("merge"):
+                merged = merge_agent_outputs(completed)
+            state["message"] = state["message"] + [AIMessage(content=merged)]
+
+    if state["degraded"]:
+        with timed("merge"):
+            merged = f"{DEGRADED_NOTICE}\n\n{merge_agent_outputs(completed)}"
+        state["message"] = state["message"] + [AIMessage(content=merged)]
 
     return state
 
 
+def _synthesize(state: dict, on_partial: Optional[Callable[[Dict], None]],
+                deadline: Optional[float], cancel_event: Optional[threading.Event]) -> None:
+    """Run the summarizer over the agent outputs, shortened or skipped when little time is left"""
+    remaining_ms = _remaining_ms(deadline)
+    if remaining_ms is not None and remaining_ms < SUMMARIZER_MIN_BUDGET_MS:
+        state["synthesis"] = "skipped"
+        return
+    if remaining_ms is not None and remaining_ms < SUMMARIZER_FULL_BUDGET_MS:
+        state["summary_max_tokens"] = SHORT_SUMMARY_TOKENS
+    summarizer = _import_agent("summarizer")
+    started = time.perf_counter()
+    try:
+        with agent_scope("summarizer"), timed("agent"):
+            result = _call_agent(summarizer, state, deadline, cancel_event)
+        _record_agent_stats("summarizer", started, result)
+        if isinstance(result, dict) and result.get("message"):
+            state["message"] = result["message"]
+            state["synthesis"] = "shortened" if "summary_max_tokens" in state else "full"
+            if on_partial is not None:
+                on_partial({"agent": "summarizer", "response": state["message"][-1].content})
+    except AgentInterrupted:
+        state["synthesis"] = "skipped"
+    except CircuitOpenError:
+        state["degraded"] = True
+    except Exception:
+        pass
+
+
 def format_response(final_state: State) -> str:
     """
     Format the final state into a readable response
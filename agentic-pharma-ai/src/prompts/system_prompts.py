@@ -83,3 +83,10 @@ When synthesizing:
 - Provide executive summary and detailed sections
 - Include recommendations for next steps
 - Note areas requiring further investigation"""
+
+SUMMARIZER_INCREMENT_PROMPT = """You are writing a synthesis report while specialist agents are still reporting.
+You are given the user's question, the report so far (empty for the first findings) and the findings that just arrived.
+- Return the complete revised report, integrating the new findings into it
+- Keep what the report already establishes unless the new findings contradict it
+- Cross-reference the new findings with the report so far and flag conflicts
+- Be concise: a short paragraph or a few bullets per agent"""
@@ -1 +1,216 @@
-# placeholder
+"""
+Report Exporter
+Renders report sections to Markdown, HTML, PDF or DOCX, streaming text
+formats section by section and caching every export in ReportStorage
+"""
+import hashlib
+import html
+import io
+import re
+from typing import Dict, Iterator, List, Optional
+
+from graph.state import State
+from report.generator import iter_report_sections, report_digest
+from report.storage import ReportStorage
+
+try:
+    import docx
+except ImportError:  # DOCX export is optional
+    docx = None
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+except ImportError:  # PDF export is optional
+    SimpleDocTemplate = None
+
+
+# Bump when rendering changes so cached exports are not reused
+RENDERER_VERSION = "1"
+REPORT_TITLE = "Pharmaceutical Research Report"
+
+MEDIA_TYPES = {
+    "md": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+STREAMING_FORMATS = {"md", "html"}
+
+_storage: Optional[ReportStorage] = None
+
+
+def get_report_storage() -> ReportStorage:
+    """Shared report storage instance"""
+    global _storage
+    if _storage is None:
+        _storage = ReportStorage()
+    return _storage
+
+
+# ============================================================================
+# RENDERERS
+# ============================================================================
+
+def _inline_html(text: str) -> str:
+    escaped = html.escape(text)
+    return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", escaped)
+
+
+def markdown_to_html(markdown: str) -> str:
+    """Minimal Markdown to HTML (headings, bullet lists, bold, paragraphs)"""
+    out: List[str] = []
+    in_list = False
+    for block in re.split(r"\n\s*\n", markdown.strip()):
+        for line in block.split("\n"):
+            stripped = line.strip()
+            bullet = re.match(r"^[-*]\s+(.*)", stripped)
+            if bullet:
+                if not in_list:
+                    out.append("<ul>")
+                    in_list = True
+                out.append(f"<li>{_inline_html(bullet.group(1))}</li>")
+                continue
+            if in_list:
+                out.append("</ul>")
+                in_list = False
+            heading = re.match(r"^(#{1,6})\s+(.*)", stripped)
+            if heading:
+                level = min(len(heading.group(1)) + 2, 6)
+                out.append(f"<h{level}>{_inline_html(heading.group(2))}</h{level}>")
+            elif stripped:
+                out.append(f"<p>{_inline_html(stripped)}</p>")
+    if in_list:
+        out.append("</ul>")
+    return "\n".join(out)
+
+
+def _stream_markdown(sections: Iterator[Dict]) -> Iterator[bytes]:
+    yield f"# {REPORT_TITLE}\n\n".encode("utf-8")
+    for section in sections:
+        yield f"## {section['title']}\n\n{section['body'].strip()}\n\n".encode("utf-8")
+
+
+def _stream_html(sections: Iterator[Dict]) -> Iterator[bytes]:
+    yield (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{REPORT_TITLE}</title>"
+        "<style>body{font-family:sans-serif;max-width:860px;margin:2em auto;line-height:1.5}</style>"
+        f"</head><body>\n<h1>{REPORT_TITLE}</h1>\n"
+    ).encode("utf-8")
+    for section in sections:
+        yield (
+            f"<section id=\"{section['id']}\"><h2>{html.escape(section['title'])}</h2>\n"
+            f"{markdown_to_html(section['body'])}\n</section>\n"
+        ).encode("utf-8")
+    yield b"</body></html>\n"
+
+
+def _render_docx(sections: List[Dict]) -> bytes:
+    if docx is None:
+        raise RuntimeError("DOCX export requires python-docx (pip install python-docx)")
+    document = docx.Document()
+    document.add_heading(REPORT_TITLE, level=0)
+    for section in sections:
+        document.add_heading(section["title"], level=1)
+        for line in section["body"].split("\n"):
+            stripped = line.strip()
+            if re.match(r"^[-*]\s+", stripped):
+                document.add_paragraph(re.sub(r"^[-*]\s+", "", stripped), style="List Bullet")
+            elif stripped:
+                document.add_paragraph(stripped.replace("**", ""))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _render_pdf(sections: List[Dict]) -> bytes:
+    if SimpleDocTemplate is None:
+        raise RuntimeError("PDF export requires reportlab (pip install reportlab)")
+    styles = getSampleStyleSheet()
+    story = [Paragraph(REPORT_TITLE, styles["Title"])]
+    for section in sections:
+        story.append(Paragraph(html.escape(section["title"]), styles["Heading2"]))
+        for line in section["body"].split("\n"):
+            if line.strip():
+                story.append(Paragraph(_inline_html(line.strip()).replace("strong>", "b>"), styles["BodyText"]))
+        story.append(Spacer(1, 8))
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build(story)
+    return buffer.getvalue()
+
+
+# ============================================================================
+# EXPORT PIPELINE
+# ============================================================================
+
+def export_key(sections: List[Dict], fmt: str) -> str:
+    """Cache key of an export: report content digest + format + renderer version"""
+    return hashlib.sha256(f"{report_digest(sections)}:{fmt}:{RENDERER_VERSION}".encode("utf-8")).hexdigest()
+
+
+def report_export_key(state: State, fmt: str) -> str:
+    """Export key of a report; GET /reports/{key} serves it once exported"""
+    return export_key(list(iter_report_sections(state)), fmt)
+
+
+def stream_export(state: State, fmt: str = "md", storage: Optional[ReportStorage] = None) -> Iterator[bytes]:
+    """
+    Export a report, yielding bytes as each section is rendered
+
+    Markdown and HTML are streamed section by section; PDF and DOCX are
+    rendered whole. An unchanged report that was exported before is served
+    from storage without re-rendering; otherwise the rendered bytes are
+    stored (deduplicated) once the stream completes.
+
+    Args:
+        state: Final orchestrator state
+        fmt: "md", "html", "pdf" or "docx"
+        storage: Report storage (defaults to the shared instance)
+
+    Yields:
+        Chunks of the exported document
+    """
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Unsupported report format: {fmt}")
+    storage = storage or get_report_storage()
+
+    sections = list(iter_report_sections(state))
+    key = export_key(sections, fmt)
+    cached = storage.lookup_export(key)
+    if cached is not None:
+        yield cached["content"]
+        return
+
+    if fmt in STREAMING_FORMATS:
+        render = _stream_markdown if fmt == "md" else _stream_html
+        chunks: List[bytes] = []
+        for chunk in render(iter(sections)):
+            chunks.append(chunk)
+            yield chunk
+        content = b"".join(chunks)
+    else:
+        content = _render_pdf(sections) if fmt == "pdf" else _render_docx(sections)
+        yield content
+
+    storage.record_export(key, storage.put(content), MEDIA_TYPES[fmt])
+
+
+def export_report(state: State, fmt: str = "md", storage: Optional[ReportStorage] = None) -> Dict:
+    """
+    Export a report in one piece
+
+    Returns:
+        Dictionary with content bytes, media type, content digest and
+        whether it was served from the export cache
+    """
+    storage = storage or get_report_storage()
+    hits_before = storage.stats["hits"]
+    content = b"".join(stream_export(state, fmt, storage))
+    return {
+        "content": content,
+        "media_type": MEDIA_TYPES[fmt],
+        "digest": hashlib.sha256(content).hexdigest(),
+        "cached": storage.stats["hits"] > hits_before
+    }
@@ -1 +1,83 @@
-# placeholder
+"""
+Report Generator
+Turns an orchestrator State into an ordered list of report sections
+"""
+import hashlib
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import orjson
+
+from graph.state import State
+
+
+def _message_text(message) -> str:
+    content = getattr(message, "content", "")
+    return content if isinstance(content, str) else str(content)
+
+
+def iter_report_sections(state: State) -> Iterator[Dict]:
+    """
+    Yield report sections in order, as soon as each one is built
+
+    Sections are dictionaries with "id", "title" and "body" (Markdown).
+
+    Args:
+        state: Final orchestrator state
+
+    Yields:
+        Report section dictionaries
+    """
+    messages = state.get("message", [])
+    human = [m for m in messages if m.__class__.__name__ == "HumanMessage"]
+    ai = [m for m in messages if m.__class__.__name__ == "AIMessage"]
+    query = _message_text(human[0]) if human else ""
+
+    yield {"id": "query", "title": "Research Question", "body": query}
+
+    if not ai:
+        yield {"id": "summary", "title": "Executive Summary", "body": "No response generated"}
+        return
+
+    # With several specialists, the last AI message is the synthesis
+    synthesized = len(ai) > 1
+    yield {"id": "summary", "title": "Executive Summary", "body": _message_text(ai[-1])}
+
+    if synthesized:
+        for i, message in enumerate(ai[:-1], start=1):
+            name = getattr(message, "name", None) or f"Specialist {i}"
+            yield {
+                "id": f"finding_{i}",
+                "title": f"Findings: {name.replace('_', ' ').title()}",
+                "body": _message_text(message)
+            }
+
+    yield {
+        "id": "metadata",
+        "title": "Report Metadata",
+        "body": f"- Specialist responses: {len(ai) - 1 if synthesized else len(ai)}\n"
+                f"- Synthesis performed: {'Yes' if synthesized else 'No'}"
+    }
+
+
+def generate_report(state: State) -> Dict:
+    """
+    Build the full report for a state
+
+    Returns:
+        Dictionary with title, sections, content digest and generation time.
+        The digest only covers the sections, so an unchanged report always
+        has the same digest.
+    """
+    sections = list(iter_report_sections(state))
+    return {
+        "title": "Pharmaceutical Research Report",
+        "sections": sections,
+        "digest": report_digest(sections),
+        "generated_at": datetime.now().isoformat()
+    }
+
+
+def report_digest(sections: List[Dict]) -> str:
+    """Content digest of a list of report sections"""
+    return hashlib.sha256(orjson.dumps(sections, option=orjson.OPT_SORT_KEYS)).hexdigest()
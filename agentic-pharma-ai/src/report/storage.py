@@ -1 +1,91 @@
-# placeholder
+"""
+Report Storage
+Content-addressed, zstd-compressed, deduplicated storage for exported reports
+"""
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+import orjson
+import zstandard
+
+
+DEFAULT_STORAGE_DIR = os.getenv("REPORT_STORAGE_DIR", os.path.join(".cache", "reports"))
+
+
+class ReportStorage:
+    """
+    Content-addressed report store
+
+    Layout under `root`:
+        objects/<aa>/<sha256>.zst   exported bytes, stored once per content
+        exports/<aa>/<key>.json     (report digest, format) -> object digest
+
+    Identical exports share one object, and looking up an export key lets
+    callers skip re-rendering an unchanged report entirely.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORAGE_DIR, level: int = 10):
+        self.root = root
+        self.level = level
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "objects_written": 0, "dedup_hits": 0}
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.zst")
+
+    def _export_path(self, key: str) -> str:
+        return os.path.join(self.root, "exports", key[:2], f"{key}.json")
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+
+    def put(self, content: bytes) -> str:
+        """Store content (once) and return its SHA-256 digest"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        with self._lock:
+            if os.path.exists(path):
+                self.stats["dedup_hits"] += 1
+                return digest
+            self.stats["objects_written"] += 1
+        # zstd (de)compressors are not thread-safe, so use one per call
+        self._write_atomic(path, zstandard.ZstdCompressor(level=self.level).compress(content))
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """Load content by digest (None if missing)"""
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            return None
+        try:
+            with open(self._object_path(digest), "rb") as fh:
+                return zstandard.ZstdDecompressor().decompress(fh.read())
+        except (OSError, zstandard.ZstdError):
+            return None
+
+    def record_export(self, key: str, digest: str, media_type: str) -> None:
+        """Remember which object an export key rendered to"""
+        self._write_atomic(self._export_path(key), orjson.dumps({"digest": digest, "media_type": media_type}))
+
+    def lookup_export(self, key: str) -> Optional[Dict]:
+        """Find a previous export, returning {"digest", "media_type", "content"}"""
+        try:
+            with open(self._export_path(key), "rb") as fh:
+                entry = orjson.loads(fh.read())
+        except (OSError, orjson.JSONDecodeError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        content = self.get(entry["digest"])
+        with self._lock:
+            self.stats["hits" if content is not None else "misses"] += 1
+        if content is None:
+            return None
+        return {**entry, "content": content}
@@ -0,0 +1,143 @@
+"""
+Agent Statistics
+Historical per-agent latency and token usage, used by the planner to
+estimate the cost of a plan
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_STATS_PATH = os.getenv("AGENT_STATS_PATH", os.path.join(".cache", "agent_stats.json"))
+# Weight of the newest observation in the moving averages
+EWMA_ALPHA = 0.2
+# Write the stats file after this many records or seconds, whichever comes first
+SAVE_EVERY = int(os.getenv("AGENT_STATS_SAVE_EVERY", "20"))
+SAVE_INTERVAL_S = float(os.getenv("AGENT_STATS_SAVE_INTERVAL_S", "30"))
+
+# Starting estimates until an agent has been observed
+PRIOR_STATS = {
+    "clinical_trials": {"latency_ms": 6000.0, "tokens": 2200.0},
+    "patent": {"latency_ms": 5000.0, "tokens": 1800.0},
+    "regulatory": {"latency_ms": 5000.0, "tokens": 1800.0},
+    "scientific_journal": {"latency_ms": 6500.0, "tokens": 2400.0},
+    "summarizer": {"latency_ms": 7000.0, "tokens": 2600.0},
+}
+
+
+class AgentStats:
+    """
+    Exponentially weighted latency and token averages per agent
+
+    Stats are kept in memory and written to a small JSON file every
+    SAVE_EVERY records or SAVE_INTERVAL_S seconds, and on flush() (at
+    shutdown), so estimates survive restarts without a file write per
+    agent call.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_STATS_PATH, save_every: int = SAVE_EVERY,
+                 save_interval_s: float = SAVE_INTERVAL_S):
+        self.path = path
+        self.save_every = save_every
+        self.save_interval_s = save_interval_s
+        self._lock = threading.Lock()
+        # Serializes file writes, which happen outside _lock
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        self._stats: Dict[str, Dict[str, float]] = {
+            agent: {**prior, "samples": 0} for agent, prior in PRIOR_STATS.items()
+        }
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as fh:
+                saved = orjson.loads(fh.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable agent stats {self.path}: {e}")
+            return
+        for agent, values in saved.items():
+            self._stats.setdefault(agent, {"latency_ms": 0.0, "tokens": 0.0, "samples": 0}).update(values)
+
+    def _save(self, payload: bytes) -> None:
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._save_lock:
+            with open(tmp_path, "wb") as fh:
+                fh.write(payload)
+            os.replace(tmp_path, self.path)
+
+    def flush(self) -> None:
+        """Write unsaved stats to disk"""
+        with self._lock:
+            if not self.path or not self._unsaved:
+                return
+            payload = orjson.dumps(self._stats)
+            self._unsaved = 0
+            self._last_save = time.monotonic()
+        try:
+            self._save(payload)
+        except OSError as e:
+            logger.warning(f"Could not save agent stats: {e}")
+
+    def record(self, agent: str, latency_ms: float, tokens: Optional[int] = None) -> None:
+        """
+        Record one agent invocation
+
+        Args:
+            agent: Agent key
+            latency_ms: Wall time of the call
+            tokens: Total tokens used, if the LLM reported usage
+        """
+        with self._lock:
+            entry = self._stats.setdefault(agent, {"latency_ms": latency_ms, "tokens": float(tokens or 0), "samples": 0})
+            first = entry["samples"] == 0
+            entry["latency_ms"] = latency_ms if first else (1 - EWMA_ALPHA) * entry["latency_ms"] + EWMA_ALPHA * latency_ms
+            if tokens:
+                entry["tokens"] = float(tokens) if first else (1 - EWMA_ALPHA) * entry["tokens"] + EWMA_ALPHA * tokens
+            entry["samples"] += 1
+            self._unsaved += 1
+            due = (self._unsaved >= self.save_every
+                   or time.monotonic() - self._last_save >= self.save_interval_s)
+        if due:
+            self.flush()
+
+    def estimate(self, agent: str) -> Dict[str, float]:
+        """Expected latency (ms) and tokens for one call of an agent"""
+        with self._lock:
+            entry = self._stats.get(agent) or PRIOR_STATS.get(agent) or {"latency_ms": 0.0, "tokens": 0.0}
+            return {"latency_ms": entry["latency_ms"], "tokens": entry["tokens"]}
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Copy of all agent stats"""
+        with self._lock:
+            return {agent: dict(values) for agent, values in self._stats.items()}
+
+
+_agent_stats: Optional[AgentStats] = None
+
+
+def get_agent_stats() -> AgentStats:
+    """Shared agent stats instance"""
+    global _agent_stats
+    if _agent_stats is None:
+        _agent_stats = AgentStats()
+        atexit.register(_agent_stats.flush)
+    return _agent_stats
+
+
+def flush_agent_stats() -> None:
+    """Write the shared instance's unsaved stats (call at shutdown)"""
+    if _agent_stats is not None:
+        _agent_stats.flush()
@@ -0,0 +1,125 @@
+"""
+Model Cascade
+Specialists answer with the small model first and escalate to the full
+specialist model only when the answer fails a confidence check
+"""
+from typing import Dict, Iterable, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+
+from services.findings import FINDING_INSTRUCTIONS, JSON_RESPONSE_FORMAT, parse_finding, render_finding
+from services.llm_service import get_llm, get_llm_config
+from services.metrics import observe_cascade
+from services.timings import current_agent, timed, token_usage
+
+
+# Defaults for the `llm.cascade` config section
+DEFAULT_MIN_CHARS = 200
+DEFAULT_MIN_CITED_IDS = 1
+UNCERTAIN_PHRASES = (
+    "i don't know",
+    "i do not know",
+    "unable to determine",
+    "cannot determine",
+    "not enough information",
+    "insufficient information",
+)
+
+
+def check_confidence(content: str, retrieved_ids: Iterable[str], settings: Dict) -> Optional[str]:
+    """
+    Cheap quality check of a specialist answer
+
+    Args:
+        content: The answer text
+        retrieved_ids: Record ids (NCT, patent, application numbers, DOIs)
+            that were in the data context
+        settings: `llm.cascade` config (min_chars, min_cited_ids)
+
+    Returns:
+        None if the answer passes, otherwise the failed check:
+        "empty", "uncertain" or "no_citations"
+    """
+    text = (content or "").strip()
+    if len(text) < settings.get("min_chars", DEFAULT_MIN_CHARS):
+        return "empty"
+    lowered = text.lower()
+    if any(phrase in lowered for phrase in UNCERTAIN_PHRASES):
+        return "uncertain"
+    ids = [i for i in retrieved_ids if i]
+    if ids:
+        cited = sum(1 for i in ids if i.lower() in lowered)
+        if cited < min(len(ids), settings.get("min_cited_ids", DEFAULT_MIN_CITED_IDS)):
+            return "no_citations"
+    return None
+
+
+def _invoke(role: str, messages: List[BaseMessage], structured: bool, retrieved_ids: List[str],
+            **fields) -> AIMessage:
+    model = get_llm(role)
+    if structured:
+        model = model.bind(response_format=JSON_RESPONSE_FORMAT)
+    with timed("llm") as stage:
+        stage.update(fields)
+        response = model.invoke(messages)
+        stage.update(token_usage(response))
+    if not structured:
+        return response
+
+    # Keep the finding in the response metadata and readable text as the content
+    finding = parse_finding(response.content, retrieved_ids)
+    if finding is None:
+        return response
+    return response.model_copy(update={
+        "content": render_finding(finding),
+        "response_metadata": {**response.response_metadata, "finding": finding.model_dump()},
+    })
+
+
+def _with_finding_instructions(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """Append the JSON finding instructions to the leading system prompt"""
+    if messages and isinstance(messages[0], SystemMessage):
+        return [SystemMessage(content=f"{messages[0].content}\n\n{FINDING_INSTRUCTIONS}"), *messages[1:]]
+    return [SystemMessage(content=FINDING_INSTRUCTIONS), *messages]
+
+
+def invoke_specialist(messages: List[BaseMessage], retrieved_ids: Iterable[str] = (),
+                      structured: bool = False) -> AIMessage:
+    """
+    Get a specialist's answer, cascading from the small model when enabled
+
+    Without the cascade this is a single call to the "specialist" model.
+    With it, the "specialist_small" model answers first; its answer is
+    kept when it passes check_confidence, otherwise the question is
+    re-asked of the "specialist" model.
+
+    In structured mode the model is asked for a JSON finding. A valid
+    finding is returned in response_metadata["finding"] with the content
+    rendered as text; in the cascade, a small-model reply that is not a
+    valid finding escalates with reason "invalid_finding".
+
+    Args:
+        messages: Prompt messages
+        retrieved_ids: Ids of the records in the data context, which a
+            confident answer is expected to cite
+        structured: Ask for a structured Finding instead of prose
+
+    Returns:
+        The accepted LLM response
+    """
+    retrieved_ids = [i for i in retrieved_ids if i]
+    if structured:
+        messages = _with_finding_instructions(messages)
+    settings = get_llm_config().get("cascade") or {}
+    if not settings.get("enabled"):
+        return _invoke("specialist", messages, structured, retrieved_ids)
+
+    response = _invoke("specialist_small", messages, structured, retrieved_ids, tier="small")
+    if structured and "finding" not in response.response_metadata:
+        reason = "invalid_finding"
+    else:
+        reason = check_confidence(response.content, retrieved_ids, settings)
+    observe_cascade(current_agent(), "accepted" if reason is None else "escalated", reason)
+    if reason is None:
+        return response
+    return _invoke("specialist", messages, structured, retrieved_ids, tier="large", escalation=reason)
@@ -0,0 +1,177 @@
+"""
+Circuit Breaker
+Stops calling the LLM provider after repeated failures so requests can be
+answered from data immediately instead of waiting through timeouts
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+from services.llm_limiter import is_rate_limit_error
+from services.metrics import observe_circuit
+
+
+# Defaults for the `llm.circuit_breaker` config section
+DEFAULT_BREAKER_CONFIG = {
+    "enabled": True,
+    "failure_threshold": 5,
+    "reset_timeout_s": 30.0,
+}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Connection and timeout errors of the openai and httpx clients (matched by
+# name, like rate limit errors, so neither client is imported here)
+TRANSPORT_ERRORS = {"APIConnectionError", "TransportError"}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the circuit is open"""
+
+
+def is_provider_failure(error: Exception) -> bool:
+    """
+    Whether an LLM call error says the provider is unhealthy
+
+    Transport errors, provider timeouts, 5xx responses and rate limits
+    count. Caller errors (bad requests, invalid arguments, bugs in our own
+    code) do not.
+    """
+    if is_rate_limit_error(error) or isinstance(error, ConnectionError):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int) and status_code >= 500:
+        return True
+    return any(cls.__name__ in TRANSPORT_ERRORS for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After `failure_threshold` consecutive failed calls the circuit opens
+    and calls are rejected at once. After `reset_timeout_s` one probe call
+    is let through (half-open): success closes the circuit, failure opens
+    it for another timeout.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = {**DEFAULT_BREAKER_CONFIG, **(config or {})}
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.counters = {"failures": 0, "rejected": 0, "opened": 0}
+        observe_circuit(self.state)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        observe_circuit(state)
+
+    def _timeout_elapsed(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.config["reset_timeout_s"]
+
+    def is_open(self) -> bool:
+        """Whether calls would be rejected now (an elapsed timeout allows a probe)"""
+        with self._lock:
+            return (self.state == OPEN and not self._timeout_elapsed()) or (self.state == HALF_OPEN and self._probing)
+
+    def allow_request(self) -> bool:
+        """Admit a call, or count it as rejected"""
+        with self._lock:
+            if self.state == OPEN and self._timeout_elapsed():
+                self._set_state(HALF_OPEN)
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._probing):
+                self._probing = self.state == HALF_OPEN
+                return True
+            self.counters["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_skipped(self) -> None:
+        """A call ended without reaching the provider; free the probe slot"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self.counters["failures"] += 1
+            if self.state == HALF_OPEN or self._failures >= self.config["failure_threshold"]:
+                self._probing = False
+                self._opened_at = time.monotonic()
+                if self.state != OPEN:
+                    self.counters["opened"] += 1
+                    self._set_state(OPEN)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self._failures, **self.counters}
+
+
+class CircuitBreakerChatModel(BaseChatModel):
+    """
+    Chat model wrapper guarding calls with a CircuitBreaker
+
+    Applied outermost, so a hedged or rate-limited call counts once. Only
+    provider failures (see is_provider_failure) trip the circuit; waiting
+    for rate limiter capacity and caller errors do not.
+    """
+
+    inner: BaseChatModel
+    breaker: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return self.inner._llm_type
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("LLM circuit is open")
+        try:
+            result = self.inner._generate(messages, stop=stop, **kwargs)
+        except Exception as error:
+            if is_provider_failure(error):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_skipped()
+            raise
+        self.breaker.record_success()
+        return result
+
+
+_breaker: Optional[CircuitBreaker] = None
+_breaker_lock = threading.Lock()
+
+
+def get_breaker(config: Optional[Dict] = None) -> CircuitBreaker:
+    """Shared LLM circuit breaker (one per process, across all model roles)"""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(config)
+        return _breaker
+
+
+def llm_circuit_open() -> bool:
+    """Whether LLM calls are currently being rejected"""
+    return _breaker is not None and _breaker.is_open()
+
+
+def reset_breaker() -> None:
+    """Drop the shared breaker so it is rebuilt from config on next use"""
+    global _breaker
+    with _breaker_lock:
+        _breaker = None
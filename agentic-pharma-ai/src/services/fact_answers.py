@@ -0,0 +1,204 @@
+"""
+Fact Answers
+Fast path answering single-field questions about one patent or regulatory
+application, named by its id, straight from the database without any LLM
+"""
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.metrics import register_cache
+from tools import patent_data, regulatory_data
+from tools.entities import extract_entities
+
+
+# Longer questions, or ones asking for analysis, go to the agents
+MAX_QUERY_WORDS = 25
+_ANALYSIS_PATTERN = re.compile(
+    r"\b(why|how does|explain|compare|analy[sz]|implication|recommend|should|strateg|landscape|summar|impact|risk)"
+)
+# Questions asking about more than one thing go to the agents
+_COMPOUND_PATTERN = re.compile(r"\b(and|also|as well as|along with|plus|together with|versus|vs)\b|\?.*\?")
+# Topics outside a source's records: a question touching them needs the
+# agents even when it also names a field the record has
+_CLINICAL_PATTERN = r"\btrials?\b|\bclinical\b|\bphase\b|\bnct\d|\benrol|\bendpoints?\b|\bcohort"
+_LITERATURE_PATTERN = r"\bstud(y|ies)\b|\bpublish|\bpublication|\bjournals?\b|\bpapers?\b|\barticles?\b|\bliterature\b|\bresearch\b"
+_REGION_PATTERN = (
+    r"\beurope|\beu\b|\bema\b|\bjapan|\bpmda\b|\bchina\b|\bcanad|\buk\b|\bmhra\b|\binternational"
+    r"|\bglobal|\bworldwide|\boutside (the )?(us|u\.s\.|united states)"
+)
+_OTHER_DOMAINS = {
+    "patent": re.compile("|".join([
+        _CLINICAL_PATTERN, _LITERATURE_PATTERN, _REGION_PATTERN,
+        r"\bfda\b|\bapprov|\blabel|\brems\b|\bdos(e|es|age|ing)\b|\bside effects?\b|\badverse"
+    ])),
+    "regulatory": re.compile("|".join([
+        _CLINICAL_PATTERN, _LITERATURE_PATTERN, _REGION_PATTERN,
+        r"\bpatent|\bexclusivity\b|\bexpir|\bgeneric|\bbiosimilar|\bassignee\b|\binventor"
+    ])),
+}
+
+
+def _yes_no(flag: bool) -> str:
+    return "Yes" if flag else "No"
+
+
+def _join(values) -> str:
+    return "; ".join(values) if isinstance(values, list) else str(values)
+
+
+# field -> (question patterns, answer template); a template may need any
+# record field, and a record missing one is left to the agents
+PATENT_FIELDS: Dict[str, Tuple[List[str], Callable[[Dict], str]]] = {
+    "expiration_date": (
+        [r"\bexpir", r"\bexpiry\b", r"\bruns? out\b", r"\byears (remaining|left)\b", r"\bhow long\b"],
+        lambda p: f"Patent {p['patent_number']} ({p['title']}) expires on {p['expiration_date']}, "
+                  f"with {p['years_remaining']} years remaining."
+    ),
+    "filing_date": ([r"\bfiled\b", r"\bfiling\b"], lambda p: f"Patent {p['patent_number']} was filed on {p['filing_date']}."),
+    "grant_date": ([r"\bgrant(ed)?\b", r"\bissued\b"], lambda p: f"Patent {p['patent_number']} was granted on {p['grant_date']}."),
+    "status": (
+        [r"\bstatus\b", r"\bstill (active|valid|in force)\b"],
+        lambda p: f"Patent {p['patent_number']} is {p['status'].lower()} (expires {p['expiration_date']})."
+    ),
+    "assignee": (
+        [r"\bassignee\b", r"\bassigned to\b", r"\bwho (owns|holds)\b", r"\bowner\b"],
+        lambda p: f"Patent {p['patent_number']} is assigned to {p['assignee']}."
+    ),
+    "inventors": (
+        [r"\binventors?\b", r"\binvented\b"],
+        lambda p: f"The inventors of patent {p['patent_number']} are {', '.join(p['inventors'])}."
+    ),
+    "claims_count": (
+        [r"\bhow many claims\b", r"\bnumber of claims\b"],
+        lambda p: f"Patent {p['patent_number']} has {p['claims_count']} claims."
+    ),
+    "freedom_to_operate": (
+        [r"\bfreedom to operate\b", r"\bfto\b"],
+        lambda p: f"Freedom-to-operate assessment for patent {p['patent_number']}: {p['freedom_to_operate']}."
+    ),
+}
+
+REGULATORY_FIELDS: Dict[str, Tuple[List[str], Callable[[Dict], str]]] = {
+    "rems_required": (
+        [r"\brems\b"],
+        lambda a: f"{_yes_no(a['rems_required'])}. {a['drug_name']} ({a['application_number']}) "
+                  + (f"requires a REMS: {a['rems_details']}." if a["rems_required"] else "does not require a REMS.")
+    ),
+    "black_box_warning": (
+        [r"\bblack[- ]?box\b", r"\bboxed warning\b"],
+        lambda a: f"{_yes_no(a['black_box_warning'])}. {a['drug_name']} ({a['application_number']}) "
+                  + (f"carries a black box warning: {a['black_box_details']}." if a["black_box_warning"]
+                     else "has no black box warning.")
+    ),
+    "approval_date": (
+        [r"\bwhen (was|is|did)\b.*\bapprov", r"\bapproval date\b"],
+        lambda a: f"{a['drug_name']} ({a['application_number']}) was approved on {a['approval_date']}"
+                  + (f" ({a['approval_type']})." if a.get("approval_type") else ".")
+    ),
+    "submission_date": (
+        [r"\bsubmitt", r"\bsubmission\b"],
+        lambda a: f"{a['application_number']} ({a['drug_name']}) was submitted on {a['submission_date']}."
+    ),
+    "status": (
+        # "approved for" / "approved to treat" asks for the indication
+        [r"\bstatus\b", r"\bis\b.*\bapproved\b(?!\s+(for|to)\b)"],
+        lambda a: f"{a['application_number']} ({a['drug_name']}) status: {a['status']}."
+    ),
+    "indication": (
+        [r"\bindicat", r"\b(used|approved) (to treat|for)\b", r"\bwhat does\b.*\btreat\b"],
+        lambda a: f"{a['drug_name']} ({a['application_number']}) is indicated for: {a['indication']}."
+    ),
+    "dosage": ([r"\bdos(e|es|age|ing)\b"], lambda a: f"Dosage of {a['drug_name']} ({a['application_number']}): {a['dosage']}."),
+    "manufacturer": (
+        [r"\bmanufactur", r"\bwho makes\b"],
+        lambda a: f"{a['drug_name']} ({a['application_number']}) is manufactured by {a['manufacturer']}."
+    ),
+    "adverse_events_reported": (
+        [r"\badverse events?\b", r"\bside effects?\b"],
+        lambda a: f"Adverse events reported for {a['drug_name']} ({a['application_number']}): "
+                  f"{_join(a['adverse_events_reported'])}."
+    ),
+    "approval_type": (
+        [r"\b(approval|review) (type|pathway)\b", r"\bpriority review\b", r"\baccelerated approval\b"],
+        lambda a: f"{a['drug_name']} ({a['application_number']}) was approved via {a['approval_type']}."
+    ),
+}
+
+_COMPILED = {
+    source: {field: [re.compile(p) for p in patterns] for field, (patterns, _) in fields.items()}
+    for source, fields in (("patent", PATENT_FIELDS), ("regulatory", REGULATORY_FIELDS))
+}
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+register_cache("fact_fast_path", lambda: (_stats["hits"], _stats["misses"]))
+
+
+def _resolve_entity(query: str) -> Optional[Tuple[str, Dict]]:
+    """
+    The patent or application the query names by id, if it names exactly one
+
+    A drug name alone is not enough: a question about a drug may be about
+    its trials, patents or literature rather than its application record.
+    """
+    ids = [e for e in extract_entities(query) if e["type"] != "drug_name"]
+    if len(ids) != 1 or not ids[0]["found"]:
+        return None
+    entity = ids[0]
+    if entity["type"] == "patent_number":
+        return "patent", patent_data.PATENTS_DB[entity["value"]]
+    if entity["type"] == "application_number":
+        return "regulatory", regulatory_data.REGULATORY_DB[entity["value"]]
+    return None
+
+
+def answer_fact(query: str) -> Optional[Dict]:
+    """
+    Answer a single-entity, single-field factual question from the database
+
+    The question must name exactly one known patent or application by its
+    id and ask for exactly one field of it. Questions that ask for
+    analysis, ask about more than one thing, or mention a topic outside
+    the record (trials, literature, other regions, or patents for an
+    application and vice versa) return None and take the agent path.
+    Every call counts towards the fast path hit rate.
+
+    Args:
+        query: The user's question
+
+    Returns:
+        Dictionary with the answer, the agent whose data answered it, the
+        entity id and the field, or None
+    """
+    result = None
+    lowered = query.lower()
+    if (len(lowered.split()) <= MAX_QUERY_WORDS and not _ANALYSIS_PATTERN.search(lowered)
+            and not _COMPOUND_PATTERN.search(lowered)):
+        resolved = _resolve_entity(query)
+        if resolved is not None and not _OTHER_DOMAINS[resolved[0]].search(lowered):
+            source, record = resolved
+            fields = [
+                field for field, patterns in _COMPILED[source].items()
+                if any(p.search(lowered) for p in patterns)
+            ]
+            if len(fields) == 1:
+                templates = PATENT_FIELDS if source == "patent" else REGULATORY_FIELDS
+                try:
+                    answer = templates[fields[0]][1](record)
+                except KeyError:
+                    answer = None  # the record lacks a field the template needs
+                if answer is not None:
+                    entity = record.get("patent_number") or record.get("application_number")
+                    result = {"answer": answer, "agent": source, "entity": entity, "field": fields[0]}
+
+    with _stats_lock:
+        _stats["hits" if result else "misses"] += 1
+    return result
+
+
+def fast_path_stats() -> Dict:
+    """Fast path hits, misses and hit rate since start"""
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0}
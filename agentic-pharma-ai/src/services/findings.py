@@ -0,0 +1,121 @@
+"""
+Findings
+Parsing of structured specialist findings and their deterministic merge,
+so multi-agent answers only need the LLM summarizer for real synthesis
+"""
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import ValidationError
+
+from models.findings import Finding
+
+
+# Appended to a specialist's prompt in structured mode
+FINDING_INSTRUCTIONS = (
+    "Respond with a single JSON object and nothing else, with these fields:\n"
+    '- "summary": one or two sentences answering the question\n'
+    '- "key_facts": list of facts taken from the data above, one per item\n'
+    '- "risks": list of risks, warnings or open issues (may be empty)\n'
+    '- "cited_ids": list of the record ids (NCT, patent, application numbers, DOIs) the facts come from\n'
+    '- "confidence": number from 0 to 1, how well the data answers the question'
+)
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Findings below this confidence are handed to the LLM summarizer
+MIN_MERGE_CONFIDENCE = 0.6
+# Questions asking for judgement across domains need the LLM summarizer
+_SYNTHESIS_PATTERN = re.compile(
+    r"\b(compare|comparison|versus|vs\.?|recommend|should|strateg|trade-?offs?|implications?|overall|assess|conflict)"
+)
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def parse_finding(content: str, retrieved_ids: Iterable[str] = ()) -> Optional[Finding]:
+    """
+    Validate a specialist's JSON reply as a Finding
+
+    Cited ids not among the retrieved records are dropped, so a finding
+    only cites data the specialist was given.
+
+    Args:
+        content: The LLM reply (JSON, possibly wrapped in prose or a code fence)
+        retrieved_ids: Ids of the records in the specialist's data context
+
+    Returns:
+        The finding, or None if the reply is not a valid finding
+    """
+    match = _JSON_OBJECT.search(content or "")
+    if match is None:
+        return None
+    try:
+        finding = Finding.model_validate(json.loads(match.group(0)))
+    except (ValueError, ValidationError):
+        return None
+    known = {i.lower(): i for i in retrieved_ids if i}
+    finding.cited_ids = list(dict.fromkeys(known[c.lower()] for c in finding.cited_ids if c.lower() in known))
+    return finding
+
+
+def render_finding(finding: Finding) -> str:
+    """Finding as readable markdown, used as the specialist's response text"""
+    parts = [finding.summary]
+    if finding.key_facts:
+        parts.append("\n".join(f"- {fact}" for fact in finding.key_facts))
+    if finding.risks:
+        parts.append("Risks:\n" + "\n".join(f"- {risk}" for risk in finding.risks))
+    if finding.cited_ids:
+        parts.append(f"Sources: {', '.join(finding.cited_ids)}")
+    return "\n\n".join(parts)
+
+
+def needs_synthesis(query: str, findings: List[Optional[Dict]]) -> Optional[str]:
+    """
+    Whether combining specialist outputs needs the LLM summarizer
+
+    Returns:
+        None when the findings can be merged deterministically, otherwise
+        the reason: "unstructured" (an output has no finding),
+        "low_confidence" or "question" (the question asks for comparison
+        or judgement)
+    """
+    if any(f is None for f in findings):
+        return "unstructured"
+    if any(f["confidence"] < MIN_MERGE_CONFIDENCE for f in findings):
+        return "low_confidence"
+    if _SYNTHESIS_PATTERN.search(query.lower()):
+        return "question"
+    return None
+
+
+def merge_findings(outputs: List[Dict]) -> str:
+    """
+    Combine specialist findings without an LLM call
+
+    Summaries and facts stay under each specialist's heading; risks are
+    deduplicated across specialists and listed once, followed by all
+    cited sources and the lowest confidence.
+
+    Args:
+        outputs: Agent output entries, each with "agent" and "finding"
+    """
+    sections = []
+    risks: Dict[str, None] = {}
+    sources: Dict[str, None] = {}
+    for output in outputs:
+        finding = output["finding"]
+        lines = [f"## {output['agent'].replace('_', ' ').title()}", "", finding["summary"]]
+        if finding["key_facts"]:
+            lines += [""] + [f"- {fact}" for fact in finding["key_facts"]]
+        sections.append("\n".join(lines))
+        risks.update(dict.fromkeys(finding["risks"]))
+        sources.update(dict.fromkeys(finding["cited_ids"]))
+
+    if risks:
+        sections.append("## Risks\n\n" + "\n".join(f"- {risk}" for risk in risks))
+    if sources:
+        sections.append(f"Sources: {', '.join(sources)}")
+    confidence = min(output["finding"]["confidence"] for output in outputs)
+    sections.append(f"Confidence: {confidence:.2f}")
+    return "\n\n".join(sections)
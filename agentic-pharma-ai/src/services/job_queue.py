@@ -0,0 +1,236 @@
+"""
+Background Job Queue
+Persistent queue with a bounded async worker pool for long-running
+orchestrator queries
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(".cache", "jobs.sqlite3"))
+DEFAULT_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Wait times kept for percentile metrics
+WAIT_SAMPLE_SIZE = 1000
+
+# runner(request, on_partial) -> JSON-serializable result; request holds
+# the submitted "query" and its options (plan limits, deadline, ...)
+JobRunner = Callable[[Dict, Callable[[Dict], None]], Dict]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    request BLOB,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    partial_results BLOB,
+    result BLOB,
+    error TEXT
+)
+"""
+
+
+class JobQueue:
+    """
+    Persistent job queue backed by SQLite
+
+    Jobs are persisted on submit and on every status change. On start,
+    jobs that were queued or still running when the process stopped are
+    queued again, so a restart does not lose work. The database is opened
+    on first use, so importing the app does not create it.
+    """
+
+    def __init__(self, runner: JobRunner, db_path: str = DEFAULT_DB_PATH, workers: int = DEFAULT_WORKERS):
+        self.runner = runner
+        self.workers = workers
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = 0
+        self._wait_times: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "recovered": 0}
+
+    # ------------------------------------------------------------------
+    # Persistence helpers
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        db = sqlite3.connect(self.db_path, check_same_thread=False)
+        db.execute(_SCHEMA)
+        columns = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+        if "request" not in columns:
+            # Databases created before job options were persisted
+            db.execute("ALTER TABLE jobs ADD COLUMN request BLOB")
+        db.commit()
+        return db
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._db_lock:
+            if self._db is None:
+                self._db = self._connect()
+            rows = self._db.execute(sql, params).fetchall()
+            self._db.commit()
+            return rows
+
+    def _update(self, job_id: str, **fields) -> None:
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        values = tuple(orjson.dumps(v) if name in ("partial_results", "result", "request") else v
+                       for name, v in fields.items())
+        self._execute(f"UPDATE jobs SET {columns} WHERE id = ?", values + (job_id,))
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the worker pool and re-queue unfinished jobs"""
+        self._queue = asyncio.Queue()
+        unfinished = self._execute(
+            "SELECT id FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+        )
+        for (job_id,) in unfinished:
+            self._update(job_id, status="queued", started_at=None)
+            self._queue.put_nowait(job_id)
+        self._counters["recovered"] += len(unfinished)
+        if unfinished:
+            logger.info(f"Recovered {len(unfinished)} unfinished jobs")
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs still running are recovered on next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, request: Dict) -> str:
+        """
+        Persist and enqueue a job, returning its id
+
+        Args:
+            request: The query request ("query" plus its options); it is
+                stored with the job and passed to the runner as is
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not started")
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, query, request, status, created_at, partial_results) "
+            "VALUES (?, ?, ?, 'queued', ?, ?)",
+            (job_id, request["query"], orjson.dumps(request), time.time(), orjson.dumps([]))
+        )
+        self._counters["submitted"] += 1
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        rows = self._execute("SELECT query, request, created_at FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return
+        query, request, created_at = rows[0]
+        request = orjson.loads(request) if request else {"query": query}
+        started_at = time.time()
+        self._wait_times.append(started_at - created_at)
+        self._update(job_id, status="running", started_at=started_at)
+        self._running += 1
+
+        partial: List[Dict] = []
+        partial_lock = threading.Lock()
+
+        def on_partial(item: Dict) -> None:
+            # Incremental synthesis drafts arrive from another thread; keep only the latest
+            with partial_lock:
+                if item.get("draft"):
+                    partial[:] = [p for p in partial if not p.get("draft")]
+                partial.append(item)
+                self._update(job_id, partial_results=partial)
+
+        try:
+            result = await asyncio.to_thread(self.runner, request, on_partial)
+            self._update(job_id, status="completed", finished_at=time.time(), result=result)
+            self._counters["completed"] += 1
+        except asyncio.CancelledError:
+            # Leave the job 'running' so the next start picks it up again
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self._update(job_id, status="failed", finished_at=time.time(), error=str(e))
+            self._counters["failed"] += 1
+        finally:
+            self._running -= 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job's status, partial results and final result"""
+        rows = self._execute(
+            "SELECT id, query, status, created_at, started_at, finished_at, partial_results, result, error "
+            "FROM jobs WHERE id = ?", (job_id,)
+        )
+        if not rows:
+            return None
+        job_id, query, status, created_at, started_at, finished_at, partial, result, error = rows[0]
+        position = None
+        if status == "queued":
+            position = self._execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?", (created_at,)
+            )[0][0]
+        return {
+            "job_id": job_id,
+            "query": query,
+            "status": status,
+            "queue_position": position,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "partial_results": orjson.loads(partial) if partial else [],
+            "result": orjson.loads(result) if result else None,
+            "error": error
+        }
+
+    def metrics(self) -> Dict:
+        """Queue depth, worker utilisation and wait-time statistics"""
+        waits = sorted(self._wait_times)
+
+        def percentile(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 2)
+
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "workers": self.workers,
+            **self._counters,
+            "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 2) if waits else None,
+            "wait_ms_p50": percentile(0.50),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_max": round(waits[-1] * 1000, 2) if waits else None
+        }
@@ -0,0 +1,189 @@
+"""
+LLM Hedging
+Duplicate LLM calls that are slow to produce a first token and keep
+whichever attempt answers first
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel, generate_from_stream
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from pydantic import PrivateAttr
+
+from services.metrics import observe_hedge
+
+
+# Defaults for the `llm.hedging` config section
+DEFAULT_HEDGING_CONFIG = {
+    "enabled": False,
+    # Hedge once a call is slower than this percentile of recent first-token latencies
+    "percentile": 95,
+    "min_samples": 20,
+    "min_delay_ms": 250,
+    "window": 500,
+    # At most this fraction of calls is hedged (with a burst of HEDGE_BURST)
+    "max_hedge_rate": 0.05,
+}
+HEDGE_BURST = 10.0
+
+_attempt_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-hedge")
+
+
+def supports_streaming(model: BaseChatModel) -> bool:
+    """Whether a model (or the model a wrapper delegates to) implements _stream"""
+    inner = getattr(model, "inner", None)
+    if isinstance(inner, BaseChatModel):
+        return supports_streaming(inner)
+    return type(model)._stream is not BaseChatModel._stream
+
+
+class _Race:
+    """Shared state of the attempts of one hedged call"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.winner: Optional[int] = None
+        self.first_token_ms: Optional[float] = None
+        self.done: Dict[int, Tuple[Optional[ChatResult], Optional[Exception]]] = {}
+        self.launched = 0
+
+    def claim(self, attempt: int, started: float) -> bool:
+        """Called when an attempt produces its first token; True if it won"""
+        with self.cond:
+            if self.winner is None:
+                self.winner = attempt
+                self.first_token_ms = (time.perf_counter() - started) * 1000
+                self.cond.notify_all()
+            return self.winner == attempt
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Chat model wrapper hedging slow calls
+
+    A call that has not produced its first token after the configured
+    percentile of recently observed first-token latencies (for this role)
+    is duplicated; the attempt whose first token arrives first wins and
+    the other is cancelled. Streaming models are cancelled by closing
+    their stream; non-streaming models cannot be interrupted, so there
+    "first token" means the full response and the loser's reply is
+    discarded. Hedges are rationed by a token bucket earning
+    max_hedge_rate per call, so hedging cannot multiply load.
+    """
+
+    inner: BaseChatModel
+    role: str = ""
+    percentile: float = 95
+    min_samples: int = 20
+    min_delay_ms: float = 250
+    window: int = 500
+    max_hedge_rate: float = 0.05
+
+    _latencies: Deque[float] = PrivateAttr(default_factory=deque)
+    _credits: float = PrivateAttr(default=HEDGE_BURST)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_config(cls, inner: BaseChatModel, config: Dict, role: Optional[str] = None) -> "HedgedChatModel":
+        settings = {**DEFAULT_HEDGING_CONFIG, **config}
+        settings.pop("enabled")
+        return cls(inner=inner, role=role or "", **settings)
+
+    @property
+    def _llm_type(self) -> str:
+        return f"hedged_{self.inner._llm_type}"
+
+    def hedge_delay_ms(self) -> Optional[float]:
+        """Current hedge delay, or None until enough latencies are observed"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay_ms, ordered[index])
+
+    def _record(self, first_token_ms: float) -> None:
+        with self._lock:
+            self._latencies.append(first_token_ms)
+            while len(self._latencies) > self.window:
+                self._latencies.popleft()
+            self._credits = min(HEDGE_BURST, self._credits + self.max_hedge_rate)
+
+    def _take_credit(self) -> bool:
+        with self._lock:
+            if self._credits < 1:
+                return False
+            self._credits -= 1
+            return True
+
+    def _attempt(self, race: _Race, attempt: int, messages: List[BaseMessage],
+                 stop: Optional[List[str]], kwargs: Dict) -> None:
+        started = time.perf_counter()
+        result, error = None, None
+        try:
+            if supports_streaming(self.inner):
+                chunks = []
+                stream = self.inner._stream(messages, stop=stop, **kwargs)
+                try:
+                    for chunk in stream:
+                        if not chunks and not race.claim(attempt, started):
+                            break  # lost the race: closing the stream cancels it
+                        chunks.append(chunk)
+                finally:
+                    stream.close()
+                if chunks and race.winner == attempt:
+                    result = generate_from_stream(iter(chunks))
+            else:
+                result = self.inner._generate(messages, stop=stop, **kwargs)
+            if result is not None:
+                race.claim(attempt, started)
+        except Exception as e:
+            error = e
+        with race.cond:
+            race.done[attempt] = (result, error)
+            race.cond.notify_all()
+
+    def _launch(self, race: _Race, messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict) -> None:
+        attempt = race.launched
+        race.launched += 1
+        _attempt_pool.submit(contextvars.copy_context().run, self._attempt, race, attempt, messages, stop, kwargs)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        delay_ms = self.hedge_delay_ms()
+        race = _Race()
+        self._launch(race, messages, stop, kwargs)
+
+        outcome = "not_needed"
+        if delay_ms is not None:
+            with race.cond:
+                race.cond.wait_for(lambda: race.winner is not None or race.done, timeout=delay_ms / 1000)
+                slow = race.winner is None and not race.done
+            if slow and self._take_credit():
+                self._launch(race, messages, stop, kwargs)
+                outcome = "hedged"
+            elif slow:
+                outcome = "throttled"
+
+        with race.cond:
+            race.cond.wait_for(lambda: race.winner in race.done or len(race.done) == race.launched)
+            winner = race.winner
+
+        if outcome == "hedged":
+            outcome = "hedge_won" if winner == 1 else "primary_won"
+        observe_hedge(self.role, outcome)
+
+        if winner is not None and race.done[winner][0] is not None:
+            self._record(race.first_token_ms)
+            result = race.done[winner][0]
+            result.generations[0].message.response_metadata["hedge"] = outcome
+            return result
+        errors = [error for _, (_, error) in sorted(race.done.items()) if error is not None]
+        if errors:
+            raise errors[0]
+        raise RuntimeError("LLM call produced no response")
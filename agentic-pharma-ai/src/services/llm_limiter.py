@@ -0,0 +1,297 @@
+"""
+LLM Rate Limiter
+Token-bucket pacing of LLM calls with per-user fair queueing and AIMD
+concurrency control driven by 429 and latency feedback
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from services.metrics import observe_limiter_wait, register_limiter
+from tools.summarization import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+# Defaults for the `llm.limiter` config section
+DEFAULT_LIMITER_CONFIG = {
+    "enabled": False,
+    "tokens_per_minute": 200000,
+    "initial_concurrency": 8,
+    "min_concurrency": 1,
+    "max_concurrency": 64,
+    # Calls slower than this shrink the concurrency limit (None: 429s only)
+    "latency_target_ms": None,
+    "expected_output_tokens": 500,
+    "max_retries": 3,
+    "backoff_base_s": 1.0,
+    "queue_timeout_s": 120.0,
+}
+# Multiplicative decrease on a 429, and on a call over the latency target
+RATE_LIMIT_BACKOFF = 0.5
+LATENCY_BACKOFF = 0.9
+
+_user: contextvars.ContextVar[str] = contextvars.ContextVar("llm_user", default="anonymous")
+
+
+def set_llm_user(user: str) -> None:
+    """Attribute LLM calls made from the current context to a user (for fair queueing)"""
+    _user.set(user or "anonymous")
+
+
+def estimate_prompt_tokens(messages: List[BaseMessage]) -> int:
+    """Cheap prompt token estimate over all messages"""
+    return sum(estimate_tokens(m.content if isinstance(m.content, str) else str(m.content)) for m in messages)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an LLM client error is a provider 429"""
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def _retry_after_s(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class _Ticket:
+    __slots__ = ("user", "tokens", "granted", "enqueued_at")
+
+    def __init__(self, user: str, tokens: int):
+        self.user = user
+        self.tokens = tokens
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+
+class LLMRateLimiter:
+    """
+    Admission control for LLM calls
+
+    A call is admitted when the concurrency limit has room and the token
+    bucket (refilled at tokens_per_minute) covers its estimated tokens.
+    Waiting calls queue per user and users are served round-robin, so one
+    heavy user cannot starve the rest. After each call the bucket is
+    corrected by the actual token usage, and the concurrency limit adapts
+    AIMD-style: +1/limit per success, halved on a 429, and scaled by 0.9
+    when a call exceeds latency_target_ms.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = {**DEFAULT_LIMITER_CONFIG, **(config or {})}
+        self.tokens_per_minute = float(self.config["tokens_per_minute"])
+        self.limit = float(self.config["initial_concurrency"])
+        self._bucket = self.tokens_per_minute
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._queues: "OrderedDict[str, Deque[_Ticket]]" = OrderedDict()
+        self._usage: Deque[tuple] = deque()
+        self._cond = threading.Condition()
+        self.counters = {"calls": 0, "rate_limited": 0, "latency_backoffs": 0, "timeouts": 0}
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._bucket = min(self.tokens_per_minute,
+                           self._bucket + (now - self._refilled_at) * self.tokens_per_minute / 60)
+        self._refilled_at = now
+
+    def _dispatch(self) -> None:
+        """Grant queued tickets round-robin across users while capacity allows"""
+        self._refill()
+        while self._queues and self._in_flight < int(self.limit):
+            user, queue = next(iter(self._queues.items()))
+            ticket = queue[0]
+            # A call larger than the whole bucket waits for a full bucket
+            if self._bucket < min(ticket.tokens, self.tokens_per_minute):
+                break
+            queue.popleft()
+            self._queues.pop(user)
+            if queue:
+                self._queues[user] = queue  # back of the rotation
+            self._bucket -= ticket.tokens
+            self._in_flight += 1
+            ticket.granted = True
+
+    def acquire(self, tokens: int, user: Optional[str] = None) -> _Ticket:
+        """
+        Wait until a call of `tokens` estimated tokens may start
+
+        Raises:
+            TimeoutError: If not admitted within queue_timeout_s
+        """
+        ticket = _Ticket(user or _user.get(), tokens)
+        deadline = ticket.enqueued_at + self.config["queue_timeout_s"]
+        with self._cond:
+            self._queues.setdefault(ticket.user, deque()).append(ticket)
+            while True:
+                self._dispatch()
+                if ticket.granted:
+                    self._cond.notify_all()
+                    observe_limiter_wait(time.monotonic() - ticket.enqueued_at)
+                    return ticket
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._queues[ticket.user].remove(ticket)
+                    if not self._queues[ticket.user]:
+                        del self._queues[ticket.user]
+                    self.counters["timeouts"] += 1
+                    raise TimeoutError("Timed out waiting for LLM capacity")
+                # Wake for releases, or when the bucket should have refilled
+                shortfall = max(0.0, ticket.tokens - self._bucket)
+                self._cond.wait(min(remaining, max(0.01, shortfall * 60 / self.tokens_per_minute)))
+
+    def release(self, ticket: _Ticket, actual_tokens: Optional[int], latency_ms: float,
+                rate_limited: bool = False) -> None:
+        """Finish a call: correct the bucket and adapt the concurrency limit"""
+        with self._cond:
+            self._in_flight -= 1
+            self.counters["calls"] += 1
+            if actual_tokens is not None:
+                self._bucket -= actual_tokens - ticket.tokens
+                self._usage.append((time.monotonic(), actual_tokens))
+
+            low, high = self.config["min_concurrency"], self.config["max_concurrency"]
+            target = self.config["latency_target_ms"]
+            if rate_limited:
+                self.counters["rate_limited"] += 1
+                self.limit = max(low, self.limit * RATE_LIMIT_BACKOFF)
+            elif target is not None and latency_ms > target:
+                self.counters["latency_backoffs"] += 1
+                self.limit = max(low, self.limit * LATENCY_BACKOFF)
+            else:
+                self.limit = min(high, self.limit + 1 / self.limit)
+
+            self._dispatch()
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def tokens_last_minute(self) -> int:
+        cutoff = time.monotonic() - 60
+        with self._cond:
+            while self._usage and self._usage[0][0] < cutoff:
+                self._usage.popleft()
+            return sum(tokens for _, tokens in self._usage)
+
+    def stats(self) -> Dict:
+        """Current limit, in-flight and queued calls, token usage and counters"""
+        with self._cond:
+            self._refill()
+            snapshot = {
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self._in_flight,
+                "queued": sum(len(q) for q in self._queues.values()),
+                "queued_users": len(self._queues),
+                "bucket_tokens": int(self._bucket),
+                **self.counters,
+            }
+        snapshot["tokens_last_minute"] = self.tokens_last_minute()
+        return snapshot
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Chat model wrapper routing every call through an LLMRateLimiter
+
+    Provider 429s are retried here (honouring Retry-After) after feeding
+    the limiter, so the wrapped client should not retry them itself.
+    """
+
+    inner: BaseChatModel
+    limiter: Any
+    expected_output_tokens: int = 500
+    max_retries: int = 3
+    backoff_base_s: float = 1.0
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate_limited_{self.inner._llm_type}"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        estimate = estimate_prompt_tokens(messages) + (kwargs.get("max_tokens") or self.expected_output_tokens)
+        for attempt in range(self.max_retries + 1):
+            ticket = self.limiter.acquire(estimate)
+            started = time.perf_counter()
+            try:
+                result = self.inner._generate(messages, stop=stop, **kwargs)
+            except Exception as e:
+                latency_ms = (time.perf_counter() - started) * 1000
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    self.limiter.release(ticket, None, latency_ms, rate_limited=is_rate_limit_error(e))
+                    raise
+                self.limiter.release(ticket, None, latency_ms, rate_limited=True)
+                delay = _retry_after_s(e) or random.uniform(0, self.backoff_base_s * 2 ** attempt)
+                logger.warning(f"LLM rate limited, retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            usage = getattr(result.generations[0].message, "usage_metadata", None) or {}
+            self.limiter.release(ticket, usage.get("total_tokens"), (time.perf_counter() - started) * 1000)
+            return result
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        # Like _generate, but a 429 is only retried before the first chunk
+        estimate = estimate_prompt_tokens(messages) + (kwargs.get("max_tokens") or self.expected_output_tokens)
+        for attempt in range(self.max_retries + 1):
+            ticket = self.limiter.acquire(estimate)
+            started = time.perf_counter()
+            tokens: Optional[int] = None
+            rate_limited = yielded = False
+            try:
+                for chunk in self.inner._stream(messages, stop=stop, **kwargs):
+                    usage = getattr(chunk.message, "usage_metadata", None)
+                    if usage:
+                        tokens = (tokens or 0) + usage.get("total_tokens", 0)
+                    yielded = True
+                    yield chunk
+                return
+            except Exception as e:
+                rate_limited = is_rate_limit_error(e)
+                if not rate_limited or yielded or attempt == self.max_retries:
+                    raise
+                delay = _retry_after_s(e) or random.uniform(0, self.backoff_base_s * 2 ** attempt)
+                logger.warning(f"LLM rate limited, retrying in {delay:.2f}s")
+            finally:
+                # Also runs when the consumer stops reading early
+                self.limiter.release(ticket, tokens, (time.perf_counter() - started) * 1000, rate_limited)
+            time.sleep(delay)
+
+
+_limiter: Optional[LLMRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter(config: Optional[Dict] = None) -> LLMRateLimiter:
+    """Shared limiter (one per process, across all model roles)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = LLMRateLimiter(config)
+            register_limiter(_limiter.stats)
+        return _limiter
+
+
+def reset_limiter() -> None:
+    """Drop the shared limiter so it is rebuilt from config on next use"""
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
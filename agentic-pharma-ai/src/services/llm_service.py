@@ -1,19 +1,218 @@
-# placeholder
-from langchain_openai import ChatOpenAI
+"""
+LLM Service
+Provider registry resolving the chat model for each role (router,
+specialist, specialist_small, summarizer), configured from config.yaml
+with environment variable overrides
+"""
 import os
+import threading
+from typing import Callable, Dict, Optional
+
+import yaml
 from dotenv import load_dotenv
+from langchain_core.language_models.chat_models import BaseChatModel
 
 load_dotenv()
 
-llm = ChatOpenAI(model="gpt-5-nano",
-    stream_usage=True,
-    temperature=0,
-    # max_tokens=None,
-    # timeout=None,
-    # reasoning_effort="low",
-    # max_retries=2,
-    api_key=os.getenv("OPEN_API_KEY"),  # If you prefer to pass api key in directly
-    # base_url="...",
-    # organization="...",
-    # other params...
+
+CONFIG_PATH = os.getenv(
+    "LLM_CONFIG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "config.yaml")
 )
+DEFAULT_CONFIG = {"provider": "openai", "model": "gpt-5-nano", "temperature": 0}
+# Environment variable -> config key; set variables win over config.yaml
+ENV_OVERRIDES = {
+    "LLM_PROVIDER": "provider",
+    "LLM_MODEL": "model",
+    "LLM_BASE_URL": "base_url",
+    "LLM_API_KEY": "api_key",
+}
+
+# Roles agents resolve models for; unconfigured roles use the base settings
+ROLES = ("router", "specialist", "specialist_small", "summarizer")
+
+_providers: Dict[str, Callable[[Dict], BaseChatModel]] = {}
+_config: Optional[Dict] = None
+_clients: Dict[Optional[str], BaseChatModel] = {}
+_client_lock = threading.Lock()
+
+
+def register_provider(name: str) -> Callable:
+    """Register a factory building a chat model from the `llm` config section"""
+    def decorator(factory: Callable[[Dict], BaseChatModel]) -> Callable[[Dict], BaseChatModel]:
+        _providers[name] = factory
+        return factory
+    return decorator
+
+
+@register_provider("openai")
+def _openai(config: Dict) -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model=config["model"],
+        stream_usage=True,
+        temperature=config.get("temperature", 0),
+        timeout=config.get("timeout"),
+        max_retries=config.get("max_retries", 2),
+        api_key=config.get("api_key") or os.getenv("OPEN_API_KEY"),
+    )
+
+
+@register_provider("openai_compatible")
+def _openai_compatible(config: Dict) -> BaseChatModel:
+    """Any server speaking the OpenAI chat API (vLLM, llama.cpp, Ollama, ...)"""
+    from langchain_openai import ChatOpenAI
+    if not config.get("base_url"):
+        raise ValueError("The openai_compatible LLM provider requires base_url")
+    return ChatOpenAI(
+        model=config["model"],
+        base_url=config["base_url"],
+        stream_usage=True,
+        temperature=config.get("temperature", 0),
+        timeout=config.get("timeout"),
+        max_retries=config.get("max_retries", 2),
+        # Local servers usually ignore the key, but the client requires one
+        api_key=config.get("api_key") or "not-needed",
+    )
+
+
+@register_provider("stub")
+def _stub(config: Dict) -> BaseChatModel:
+    from services.stub_llm import StubChatModel
+    return StubChatModel(**(config.get("stub") or {}))
+
+
+def load_llm_config(path: str = CONFIG_PATH) -> Dict:
+    """
+    Read the `llm` section of config.yaml and apply environment overrides
+
+    Per-role model overrides come from LLM_<ROLE>_MODEL (e.g.
+    LLM_SUMMARIZER_MODEL), LLM_CASCADE=1/0 toggles the specialist
+    cascade, LLM_TOKENS_PER_MINUTE enables the rate limiter with that
+    budget and LLM_HEDGING=1/0 toggles request hedging.
+
+    Args:
+        path: Config file (missing file means defaults)
+
+    Returns:
+        Provider configuration dictionary
+    """
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as fh:
+            config.update((yaml.safe_load(fh) or {}).get("llm") or {})
+    for env_name, key in ENV_OVERRIDES.items():
+        if os.getenv(env_name):
+            config[key] = os.getenv(env_name)
+
+    roles = {role: dict(overrides or {}) for role, overrides in (config.get("roles") or {}).items()}
+    for role in ROLES:
+        model = os.getenv(f"LLM_{role.upper()}_MODEL")
+        if model:
+            roles.setdefault(role, {})["model"] = model
+    config["roles"] = roles
+
+    cascade = dict(config.get("cascade") or {})
+    if os.getenv("LLM_CASCADE"):
+        cascade["enabled"] = os.getenv("LLM_CASCADE") not in ("0", "false", "no")
+    config["cascade"] = cascade
+
+    limiter = dict(config.get("limiter") or {})
+    if os.getenv("LLM_TOKENS_PER_MINUTE"):
+        limiter.update(enabled=True, tokens_per_minute=int(os.getenv("LLM_TOKENS_PER_MINUTE")))
+    config["limiter"] = limiter
+
+    hedging = dict(config.get("hedging") or {})
+    if os.getenv("LLM_HEDGING"):
+        hedging["enabled"] = os.getenv("LLM_HEDGING") not in ("0", "false", "no")
+    config["hedging"] = hedging
+    return config
+
+
+def get_llm_config() -> Dict:
+    """Loaded LLM configuration (read once; reset_llm() re-reads it)"""
+    global _config
+    if _config is None:
+        _config = load_llm_config()
+    return _config
+
+
+def role_config(config: Dict, role: Optional[str]) -> Dict:
+    """Base provider settings with a role's overrides applied"""
+    base = {k: v for k, v in config.items() if k not in ("roles", "cascade", "limiter", "hedging", "circuit_breaker")}
+    if role is None:
+        return base
+    return {**base, **(config.get("roles") or {}).get(role, {})}
+
+
+def create_llm(config: Dict, limiter: Optional[Dict] = None) -> BaseChatModel:
+    """
+    Build a chat model for a provider configuration
+
+    Args:
+        config: Provider settings (see role_config)
+        limiter: `llm.limiter` settings; when enabled the model is wrapped
+            so its calls go through the shared rate limiter, which also
+            takes over retrying 429s from the client
+    """
+    provider = config.get("provider", DEFAULT_CONFIG["provider"])
+    if provider not in _providers:
+        raise ValueError(f"Unknown LLM provider: {provider} (available: {', '.join(sorted(_providers))})")
+    if not (limiter or {}).get("enabled"):
+        return _providers[provider](config)
+
+    from services.llm_limiter import DEFAULT_LIMITER_CONFIG, RateLimitedChatModel, get_limiter
+    settings = {**DEFAULT_LIMITER_CONFIG, **limiter}
+    return RateLimitedChatModel(
+        inner=_providers[provider]({**config, "max_retries": 0}),
+        limiter=get_limiter(settings),
+        expected_output_tokens=settings["expected_output_tokens"],
+        max_retries=settings["max_retries"],
+        backoff_base_s=settings["backoff_base_s"],
+    )
+
+
+def get_llm(role: Optional[str] = None) -> BaseChatModel:
+    """
+    Shared chat model for a role, built on first use
+
+    Args:
+        role: "router", "specialist", "specialist_small", "summarizer" or
+            None for the base model
+    """
+    client = _clients.get(role)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(role)
+            if client is None:
+                config = get_llm_config()
+                client = create_llm(role_config(config, role), config.get("limiter"))
+                if (config.get("hedging") or {}).get("enabled"):
+                    # Outside the limiter, so hedges count against the token budget
+                    from services.llm_hedging import HedgedChatModel
+                    client = HedgedChatModel.from_config(client, config["hedging"], role or "default")
+                breaker = {"enabled": True, **(config.get("circuit_breaker") or {})}
+                if breaker["enabled"]:
+                    from services.circuit_breaker import CircuitBreakerChatModel, get_breaker
+                    client = CircuitBreakerChatModel(inner=client, breaker=get_breaker(breaker))
+                _clients[role] = client
+    return client
+
+
+def reset_llm() -> None:
+    """Drop the loaded config and chat models so they are rebuilt on next use"""
+    global _config
+    from services.circuit_breaker import reset_breaker
+    from services.llm_limiter import reset_limiter
+    with _client_lock:
+        _config = None
+        _clients.clear()
+        reset_limiter()
+        reset_breaker()
+
+
+def __getattr__(name: str):
+    # Keeps `from services.llm_service import llm` working, resolved lazily
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
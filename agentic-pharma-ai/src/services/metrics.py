@@ -0,0 +1,223 @@
+"""
+Metrics
+Prometheus metrics for the orchestrator API: HTTP latency, in-flight
+requests, stage and LLM timings, token usage, cache hit ratios, LLM
+rate limiter state, request hedging, the circuit breaker and extractive
+pre-summarization
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import REGISTRY, CounterMetricFamily, GaugeMetricFamily
+
+
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+STAGE_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10, 30, 60)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "pharma_ai_http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"]
+)
+HTTP_IN_FLIGHT = Gauge("pharma_ai_http_requests_in_flight", "HTTP requests currently being served")
+STAGE_SECONDS = Histogram(
+    "pharma_ai_stage_duration_seconds", "Orchestrator stage latency (planning, tool_lookup, format_context, ...)",
+    ["stage", "agent"], buckets=STAGE_BUCKETS
+)
+LLM_CALL_SECONDS = Histogram("pharma_ai_llm_call_duration_seconds", "LLM call latency by agent", ["agent"], buckets=LLM_BUCKETS)
+LLM_TOKENS = Counter("pharma_ai_llm_tokens_total", "LLM tokens by agent and kind (prompt, completion, cached)", ["agent", "kind"])
+CASCADE_DECISIONS = Counter(
+    "pharma_ai_llm_cascade_decisions_total", "Cascade outcomes of small-model specialist answers",
+    ["agent", "outcome", "reason"]
+)
+ORCHESTRATOR_RUNS = Counter("pharma_ai_orchestrator_runs_total", "Orchestrator runs by outcome", ["outcome"])
+HEDGE_REQUESTS = Counter(
+    "pharma_ai_llm_hedge_requests_total",
+    "LLM calls by hedging outcome (not_needed, primary_won, hedge_won, throttled)", ["role", "outcome"]
+)
+LLM_CIRCUIT_STATE = Gauge(
+    "pharma_ai_llm_circuit_state", "LLM circuit breaker state (1 for the current state)", ["state"]
+)
+LLM_QUEUE_WAIT_SECONDS = Histogram(
+    "pharma_ai_llm_queue_wait_seconds", "Time LLM calls waited for rate limiter admission", buckets=STAGE_BUCKETS
+)
+
+# name -> callable returning (hits, misses); read on scrape
+_cache_sources: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Tuple[int, int]]) -> None:
+    """Expose a cache's cumulative (hits, misses) as metrics"""
+    _cache_sources[name] = stats
+
+
+class _CacheCollector:
+    """Reads registered cache stats at scrape time, so hits cost nothing extra"""
+
+    def collect(self):
+        hits = CounterMetricFamily("pharma_ai_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("pharma_ai_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("pharma_ai_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        for name, stats in list(_cache_sources.items()):
+            h, m = stats()
+            hits.add_metric([name], h)
+            misses.add_metric([name], m)
+            ratio.add_metric([name], h / (h + m) if h + m else 0.0)
+        yield hits
+        yield misses
+        yield ratio
+
+
+REGISTRY.register(_CacheCollector())
+
+# Callable returning LLMRateLimiter.stats(); read on scrape
+_limiter_stats: Optional[Callable[[], Dict]] = None
+
+
+def register_limiter(stats: Callable[[], Dict]) -> None:
+    """Expose the LLM rate limiter's state as metrics"""
+    global _limiter_stats
+    _limiter_stats = stats
+
+
+class _LimiterCollector:
+    """Reads the rate limiter's concurrency window, queue and token usage at scrape time"""
+
+    GAUGES = {
+        "concurrency_limit": "Adaptive LLM concurrency limit",
+        "in_flight": "LLM calls in flight",
+        "queued": "LLM calls waiting for admission",
+        "tokens_last_minute": "LLM tokens used in the last minute",
+    }
+    COUNTERS = {
+        "rate_limited": "LLM calls rejected with a 429",
+        "latency_backoffs": "Concurrency decreases from calls over the latency target",
+        "timeouts": "LLM calls that timed out waiting for admission",
+    }
+
+    def collect(self):
+        if _limiter_stats is None:
+            return
+        snapshot = _limiter_stats()
+        for key, doc in self.GAUGES.items():
+            yield GaugeMetricFamily(f"pharma_ai_llm_limiter_{key}", doc, value=snapshot[key])
+        for key, doc in self.COUNTERS.items():
+            yield CounterMetricFamily(f"pharma_ai_llm_limiter_{key}", doc, value=snapshot[key])
+
+
+REGISTRY.register(_LimiterCollector())
+
+# Callable returning get_summarization_stats(); read on scrape
+_summarization_stats: Optional[Callable[[], Dict]] = None
+
+
+def register_summarization(stats: Callable[[], Dict]) -> None:
+    """Expose extractive pre-summarization's token reduction and CPU cost as metrics"""
+    global _summarization_stats
+    _summarization_stats = stats
+
+
+class _SummarizationCollector:
+    """Reads the pre-summarization counters at scrape time"""
+
+    COUNTERS = {
+        "calls": "Texts passed through extractive pre-summarization",
+        "compressed": "Texts shortened by pre-summarization",
+        "input_tokens": "Estimated tokens before pre-summarization",
+        "output_tokens": "Estimated tokens after pre-summarization",
+    }
+
+    def collect(self):
+        if _summarization_stats is None:
+            return
+        snapshot = _summarization_stats()
+        for key, doc in self.COUNTERS.items():
+            yield CounterMetricFamily(f"pharma_ai_summarization_{key}", doc, value=snapshot[key])
+        yield CounterMetricFamily("pharma_ai_summarization_cpu_seconds", "CPU time spent pre-summarizing",
+                                  value=snapshot["cpu_ms"] / 1000)
+        yield GaugeMetricFamily("pharma_ai_summarization_reduction_ratio",
+                                "Share of estimated tokens removed by pre-summarization since start",
+                                value=snapshot["reduction_percent"] / 100)
+
+
+REGISTRY.register(_SummarizationCollector())
+
+
+def observe_run(state: Dict) -> None:
+    """Record an orchestrator run's stage timings and token usage"""
+    if state.get("degraded"):
+        outcome = "degraded"
+    else:
+        outcome = "partial" if state.get("partial") else "complete"
+    ORCHESTRATOR_RUNS.labels(outcome).inc()
+    stages: List[Dict] = state.get("timings", {}).get("stages", [])
+    for record in stages:
+        agent = record.get("agent") or ""
+        STAGE_SECONDS.labels(record["stage"], agent).observe(record["ms"] / 1000)
+        if record["stage"] == "llm":
+            LLM_CALL_SECONDS.labels(agent).observe(record["ms"] / 1000)
+            for kind in ("prompt", "completion", "cached"):
+                tokens = record.get(f"{kind}_tokens")
+                if tokens:
+                    LLM_TOKENS.labels(agent, kind).inc(tokens)
+
+
+def observe_limiter_wait(seconds: float) -> None:
+    """Record how long an LLM call queued in the rate limiter"""
+    LLM_QUEUE_WAIT_SECONDS.observe(seconds)
+
+
+def observe_hedge(role: str, outcome: str) -> None:
+    """Count a hedging decision; hedge rate is (primary_won + hedge_won) / total"""
+    HEDGE_REQUESTS.labels(role, outcome).inc()
+
+
+def observe_circuit(state: str) -> None:
+    """Mark the LLM circuit breaker's current state ("closed", "open" or "half_open")"""
+    for name in ("closed", "open", "half_open"):
+        LLM_CIRCUIT_STATE.labels(name).set(1 if name == state else 0)
+
+
+def observe_cascade(agent: str, outcome: str, reason: Optional[str] = None) -> None:
+    """Count a cascade decision ("accepted" or "escalated", with the failed check)"""
+    CASCADE_DECISIONS.labels(agent or "", outcome, reason or "").inc()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request
+
+    Requests are labelled with the matched route template (not the raw
+    path), so per-id URLs do not explode label cardinality.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status["code"])
+            ).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Metrics in the Prometheus text exposition format, with its content type"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,76 @@
+"""
+Single-Flight Request Coalescing
+Concurrent calls with the same key share one in-flight execution
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical work
+
+    The first caller for a key starts the work; callers arriving while it
+    is in flight await the same result (or exception) instead of starting
+    their own. Once the work finishes the key is released, so later calls
+    run fresh. The work runs as its own task, so a caller that goes away
+    does not cancel it for the others; it is cancelled only once every
+    caller waiting on it has been cancelled.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self._counters = {"executions": 0, "coalesced": 0, "failed": 0, "abandoned": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() for key, or join the execution already in flight
+
+        Args:
+            key: Coalescing key (e.g. a normalized query)
+            fn: Coroutine factory doing the work
+
+        Returns:
+            The shared result
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self._counters["coalesced"] += 1
+        else:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            self._counters["executions"] += 1
+            future.add_done_callback(lambda f: self._release(key, f))
+
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.done() and self._waiters[future] == 1:
+                # Last interested caller gone: stop the work
+                future.cancel()
+                self._counters["abandoned"] += 1
+            raise
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+
+    def _release(self, key: str, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled() and future.exception() is not None:
+            self._counters["failed"] += 1
+
+    def metrics(self) -> Dict:
+        """Executions, coalesced requests and keys currently in flight"""
+        requests = self._counters["executions"] + self._counters["coalesced"]
+        return {
+            "in_flight": len(self._calls),
+            **self._counters,
+            "requests": requests,
+            "coalesced_ratio": round(self._counters["coalesced"] / requests, 4) if requests else 0.0
+        }
@@ -0,0 +1,140 @@
+"""
+Stub LLM
+Deterministic in-process chat model with configurable latency and token
+rate distributions, for offline runs, CI and load tests
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from typing import Any, Iterator, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from tools.entities import extract_entities
+from tools.summarization import estimate_tokens, split_sentences
+
+
+_RISK_PATTERN = re.compile(r"risk|warning|adverse|toxicity", re.IGNORECASE)
+
+
+def _json_mode(kwargs: dict) -> bool:
+    return (kwargs.get("response_format") or {}).get("type") == "json_object"
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Offline stand-in for a chat model
+
+    The reply is an extract of the prompt's non-system content, so agents
+    still produce output grounded in their data context. Everything is
+    derived from a hash of the prompt (and `seed`): the same prompt always
+    gets the same reply, token counts and simulated latency.
+
+    Latency is time-to-first-token drawn from a lognormal around
+    `latency_ms`, plus output tokens at a rate drawn from a lognormal
+    around `tokens_per_s`. With response_format json_object the extract
+    is returned as a structured finding.
+    """
+
+    model_name: str = "stub"
+    latency_ms: float = 800.0
+    latency_sigma: float = 0.35
+    tokens_per_s: float = 60.0
+    tokens_per_s_sigma: float = 0.2
+    max_output_tokens: int = 350
+    seed: int = 0
+    # False reports the simulated latency without waiting for it
+    sleep: bool = True
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    @staticmethod
+    def _text(message: BaseMessage) -> str:
+        return message.content if isinstance(message.content, str) else str(message.content)
+
+    def _respond(self, messages: List[BaseMessage], max_tokens: Optional[int],
+                 json_mode: bool = False) -> Tuple[AIMessage, float, float]:
+        prompt = "\n".join(self._text(m) for m in messages)
+        rng = random.Random(hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).digest())
+
+        budget = min(self.max_output_tokens, max_tokens or self.max_output_tokens)
+        sentences = [
+            s for m in messages if not isinstance(m, SystemMessage)
+            for s in split_sentences(self._text(m))
+        ]
+        picked: List[str] = []
+        used = 0
+        for sentence in sentences:
+            cost = estimate_tokens(sentence)
+            if used + cost > budget:
+                break
+            picked.append(sentence)
+            used += cost
+        content = " ".join(picked) or "No content to analyze."
+        if json_mode:
+            # JSON mode: the same extract shaped as a structured finding
+            cited = [e["value"] for e in extract_entities(" ".join(picked)) if e["type"] != "drug_name"]
+            content = json.dumps({
+                "summary": picked[0] if picked else "No content to analyze.",
+                "key_facts": picked[1:],
+                "risks": [s for s in picked if _RISK_PATTERN.search(s)],
+                "cited_ids": cited,
+                # Confident when the extract cites records
+                "confidence": round((0.7 if cited else 0.3) + 0.3 * rng.random(), 2),
+            })
+
+        output_tokens = estimate_tokens(content)
+        input_tokens = estimate_tokens(prompt)
+        ttft_s = self.latency_ms * math.exp(self.latency_sigma * rng.gauss(0, 1)) / 1000
+        rate = self.tokens_per_s * math.exp(self.tokens_per_s_sigma * rng.gauss(0, 1))
+        delay_s = ttft_s + output_tokens / max(rate, 1e-6)
+
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            response_metadata={"model_name": self.model_name, "simulated_latency_ms": round(delay_s * 1000, 3)},
+        )
+        return message, ttft_s, delay_s
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message, _, delay_s = self._respond(messages, kwargs.get("max_tokens"), _json_mode(kwargs))
+        if self.sleep:
+            time.sleep(delay_s)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message, _, delay_s = self._respond(messages, kwargs.get("max_tokens"), _json_mode(kwargs))
+        if self.sleep:
+            await asyncio.sleep(delay_s)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        # Words arrive after the time to first token, spread over the generation time
+        message, ttft_s, delay_s = self._respond(messages, kwargs.get("max_tokens"), _json_mode(kwargs))
+        words = message.content.split(" ")
+        if self.sleep:
+            time.sleep(ttft_s)
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            if self.sleep and i:
+                time.sleep((delay_s - ttft_s) / len(words))
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content=word if last else word + " ",
+                usage_metadata=message.usage_metadata if last else None,
+                response_metadata=message.response_metadata if last else {},
+            ))
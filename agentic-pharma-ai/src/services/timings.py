@@ -0,0 +1,94 @@
+"""
+Stage Timings
+Per-run timing and token instrumentation for the orchestrator and agents
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+_stages: contextvars.ContextVar[Optional[List[Dict]]] = contextvars.ContextVar("timing_stages", default=None)
+_agent: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("timing_agent", default=None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[List[Dict]]:
+    """
+    Collect stage timings recorded inside this scope
+
+    Like the shared lookup cache, the collector follows the context into
+    asyncio tasks and worker threads started with a copied context.
+
+    Yields:
+        List that receives one record per timed stage
+    """
+    stages: List[Dict] = []
+    token = _stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _stages.reset(token)
+
+
+@contextmanager
+def agent_scope(agent: str) -> Iterator[None]:
+    """Attribute stages timed inside this scope to an agent"""
+    token = _agent.set(agent)
+    try:
+        yield
+    finally:
+        _agent.reset(token)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[Dict]:
+    """
+    Time a stage
+
+    Yields a record the caller may add fields to (e.g. token counts). The
+    record is kept only when a collect_timings() scope is active.
+
+    Args:
+        stage: Stage name ("planning", "tool_lookup", "llm", ...)
+    """
+    record = {"stage": stage, "agent": _agent.get()}
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = round((time.perf_counter() - started) * 1000, 3)
+        stages = _stages.get()
+        if stages is not None:
+            stages.append(record)
+
+
+def current_agent() -> Optional[str]:
+    """Agent of the active agent_scope(), if any"""
+    return _agent.get()
+
+
+def current_stages() -> List[Dict]:
+    """Stages recorded so far in the active collect_timings() scope"""
+    return list(_stages.get() or [])
+
+
+def token_usage(message) -> Dict[str, int]:
+    """Prompt, completion and cached prompt tokens reported on an LLM response"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    if not usage:
+        return {}
+    return {
+        "prompt_tokens": usage.get("input_tokens", 0),
+        "completion_tokens": usage.get("output_tokens", 0),
+        "cached_tokens": (usage.get("input_token_details") or {}).get("cache_read", 0),
+    }
+
+
+def summarize_timings(stages: List[Dict]) -> Dict:
+    """Stage list plus token totals across a run's LLM calls"""
+    tokens = {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    for record in stages:
+        for name in tokens:
+            tokens[name] += record.get(name, 0)
+    return {"stages": stages, "tokens": tokens}
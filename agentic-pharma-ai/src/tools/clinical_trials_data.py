@@ -5,6 +5,9 @@ Retrieves clinical trial data from dummy database
 import json
 from typing import Optional, List, Dict
 
+from tools.dataset_version import DatasetVersion
+from tools.lookup_cache import shared_lookup
+
 
 # Dummy Clinical Trials Database
 CLINICAL_TRIALS_DB = {
@@ -64,6 +67,11 @@ CLINICAL_TRIALS_DB = {
 }
 
 
+# Content version of CLINICAL_TRIALS_DB; get_dataset_version(refresh=True) after modifying it
+get_dataset_version = DatasetVersion(CLINICAL_TRIALS_DB, __file__)
+
+
+@shared_lookup("nct_number")
 def get_clinical_trial_data(query: str) -> Dict:
     """
     Retrieves clinical trial data from dummy database
@@ -0,0 +1,62 @@
+"""
+Dataset Version Tool
+Computes content version hashes for the data tool databases
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+def compute_dataset_hash(db: Dict) -> str:
+    """Hash of the canonical JSON form of a dataset"""
+    payload = json.dumps(db, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class DatasetVersion:
+    """
+    Content version of a data tool database
+
+    The version is a hash of the dataset, so it only changes when the
+    content changes. The last modified time starts as the mtime of the
+    file the data is loaded from and moves to the refresh time only when
+    a refresh (e.g. after merging fetched records) changes the content,
+    so it is stable across restarts.
+
+    Call the instance for the current version; pass refresh=True after
+    the database is modified.
+    """
+
+    def __init__(self, db: Dict, source_path: str):
+        self.db = db
+        self.source_path = source_path
+        self._version: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def _source_mtime(self) -> datetime:
+        return datetime.fromtimestamp(int(os.path.getmtime(self.source_path)), timezone.utc)
+
+    def __call__(self, refresh: bool = False) -> Dict:
+        """
+        Get the dataset's content version
+
+        Args:
+            refresh: Recompute the version (call after the database is modified)
+
+        Returns:
+            Dictionary with version hash, last modified time and record count
+        """
+        with self._lock:
+            if refresh or self._version is None:
+                version = compute_dataset_hash(self.db)
+                if self._version is None:
+                    last_modified = self._source_mtime()
+                elif version != self._version["version"]:
+                    last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+                else:
+                    last_modified = self._version["last_modified"]
+                self._version = {"version": version, "last_modified": last_modified, "record_count": len(self.db)}
+            return self._version
@@ -0,0 +1,79 @@
+"""
+Entity Extraction
+Rule-based detection of record identifiers (NCT, patent, application
+numbers, DOIs) and known drug names in a query
+"""
+import re
+from typing import Dict, List
+
+from tools import clinical_trials_data, patent_data, regulatory_data, scientific_journal_data
+
+
+NCT_PATTERN = re.compile(r"\bNCT\d{8}\b", re.IGNORECASE)
+# US10234567, US 10,234,567
+PATENT_PATTERN = re.compile(r"\bUS ?(\d{1,2},?\d{3},?\d{3})\b", re.IGNORECASE)
+# NDA-207524, BLA 256789, IND123456
+APPLICATION_PATTERN = re.compile(r"\b(NDA|BLA|IND)[- ]?(\d{6})\b", re.IGNORECASE)
+DOI_PATTERN = re.compile(r"\b10\.\d{4,9}/\S+")
+
+
+def _drug_names() -> List[str]:
+    """Known drug names, longest first so "DTZ-100 Extended Release" wins over "DTZ-100" """
+    names = {
+        record["drug_name"]
+        for db in (clinical_trials_data.CLINICAL_TRIALS_DB, regulatory_data.REGULATORY_DB)
+        for record in db.values() if record.get("drug_name")
+    }
+    return sorted(names, key=len, reverse=True)
+
+
+def extract_entities(query: str) -> List[Dict]:
+    """
+    Find record identifiers and drug names mentioned in a query
+
+    Identifiers are normalized to the form used as database keys.
+
+    Args:
+        query: The user's question
+
+    Returns:
+        List of {"type", "value", "found"} in order of appearance, where
+        type is nct_number, patent_number, application_number, doi or
+        drug_name and found tells whether the value is in its database
+    """
+    entities = []
+
+    for match in NCT_PATTERN.finditer(query):
+        value = match.group(0).upper()
+        entities.append((match.start(), "nct_number", value, value in clinical_trials_data.CLINICAL_TRIALS_DB))
+
+    for match in PATENT_PATTERN.finditer(query):
+        value = "US" + match.group(1).replace(",", "")
+        entities.append((match.start(), "patent_number", value, value in patent_data.PATENTS_DB))
+
+    for match in APPLICATION_PATTERN.finditer(query):
+        value = f"{match.group(1).upper()}-{match.group(2)}"
+        entities.append((match.start(), "application_number", value, value in regulatory_data.REGULATORY_DB))
+
+    dois = {doi.lower(): doi for doi in scientific_journal_data.JOURNAL_DB}
+    for match in DOI_PATTERN.finditer(query):
+        raw = match.group(0).rstrip(".,;:?!")
+        if raw.endswith(")") and raw.count("(") < raw.count(")"):
+            raw = raw[:-1]
+        value = dois.get(raw.lower(), raw)
+        entities.append((match.start(), "doi", value, value in scientific_journal_data.JOURNAL_DB))
+
+    # Drug names: skip spans already covered by a longer name
+    taken: List[range] = []
+    lowered = query.lower()
+    for name in _drug_names():
+        for match in re.finditer(rf"(?<![\w-]){re.escape(name.lower())}(?![\w-])", lowered):
+            if any(match.start() in span for span in taken):
+                continue
+            taken.append(range(match.start(), match.end()))
+            entities.append((match.start(), "drug_name", name, True))
+
+    return [
+        {"type": kind, "value": value, "found": found}
+        for _, kind, value, found in sorted(entities, key=lambda e: e[0])
+    ]
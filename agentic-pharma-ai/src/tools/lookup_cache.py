@@ -0,0 +1,107 @@
+"""
+Shared Lookup Cache
+Inside a scope (e.g. one batch request), resolves data tool lookups to the
+records a question names and memoizes them, so work sharing the scope runs
+each record lookup only once. Outside a scope the tools are unchanged
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+_lookup_cache: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar("lookup_cache", default=None)
+
+
+@contextmanager
+def shared_lookups() -> Iterator[Dict]:
+    """
+    Share data tool lookups inside this scope
+
+    Inside the scope, data tools look up the records a question names (see
+    shared_lookup). The cache travels with the context, including into
+    asyncio tasks and asyncio.to_thread workers started inside the scope.
+
+    Yields:
+        Stats dictionary with "hits" and "misses"
+    """
+    cache = {"entries": {}, "stats": {"hits": 0, "misses": 0}}
+    token = _lookup_cache.set(cache)
+    try:
+        yield cache["stats"]
+    finally:
+        _lookup_cache.reset(token)
+
+
+def lookup_terms(query: str, id_type: str) -> List[str]:
+    """
+    Resolve a question to the terms a data tool should look up
+
+    Args:
+        query: Question or search term
+        id_type: Entity type the tool's records are keyed by (nct_number,
+            patent_number, application_number or doi)
+
+    Returns:
+        The tool's record identifiers and the drug names mentioned in the
+        query, in order of appearance; the stripped query itself if it
+        names none
+    """
+    # Imported here: the entity extractor imports the data tool modules
+    from tools.entities import extract_entities
+
+    terms = []
+    for entity in extract_entities(query):
+        if entity["type"] in (id_type, "drug_name") and entity["value"] not in terms:
+            terms.append(entity["value"])
+    return terms or [query.strip()]
+
+
+def _merge_results(results: List[Dict]) -> Dict:
+    """Combine the results of several term lookups into one tool result"""
+    found = [result for result in results if result.get("found")]
+    if not found:
+        return results[0]
+    merged: Dict = {"found": True}
+    for result in found:
+        for name, value in result.items():
+            if isinstance(value, list):
+                records = merged.setdefault(name, [])
+                records.extend(record for record in value if record not in records)
+    merged["count"] = sum(len(value) for value in merged.values() if isinstance(value, list))
+    return merged
+
+
+def shared_lookup(id_type: str) -> Callable:
+    """
+    Share a data tool's lookups within a shared_lookups() scope
+
+    Inside a scope the query is resolved with lookup_terms(), so "When does
+    US10234567 expire?" looks up US10234567 and two questions about the same
+    drug run the same lookup. Each term's result is memoized for the scope,
+    keyed on the resolved term rather than the question text. Outside a
+    scope the tool is called with the query unchanged.
+
+    Args:
+        id_type: Entity type the tool's records are keyed by
+    """
+    def decorator(fn: Callable[[str], Dict]) -> Callable[[str], Dict]:
+        def lookup(cache: Dict, term: str) -> Dict:
+            key = (fn.__module__, fn.__qualname__, term)
+            entries = cache["entries"]
+            if key in entries:
+                cache["stats"]["hits"] += 1
+                return entries[key]
+            cache["stats"]["misses"] += 1
+            result = entries[key] = fn(term)
+            return result
+
+        @wraps(fn)
+        def wrapper(query: str) -> Dict:
+            cache = _lookup_cache.get()
+            if cache is None:
+                return fn(query)
+            results = [lookup(cache, term) for term in lookup_terms(query, id_type)]
+            return results[0] if len(results) == 1 else _merge_results(results)
+        return wrapper
+    return decorator
@@ -1 +1,268 @@
-# placeholder
+"""
+Patent API Connector
+Async client for a USPTO-style patent REST API with pooled connections,
+bounded-concurrency pagination, rate-limit backoff and an on-disk cache
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import orjson
+import zstandard
+
+from tools import patent_data
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BASE_URL = os.getenv("PATENT_API_BASE_URL", "https://developer.uspto.gov/ds-api")
+DEFAULT_CACHE_DIR = os.getenv("PATENT_API_CACHE_DIR", os.path.join(".cache", "patent_api"))
+DEFAULT_CACHE_TTL_S = 24 * 3600
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_CONCURRENCY = 8
+MAX_RETRIES = 5
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 30.0
+
+
+class PatentAPIError(Exception):
+    """Raised when the patent API returns an unrecoverable error"""
+
+
+class ResponseCache:
+    """
+    Request-keyed on-disk cache for API responses
+
+    Entries are keyed by the SHA-256 of the request (method, path, sorted
+    params), stored zstd-compressed under a two-level fan-out directory and
+    expire after `ttl_s` seconds. get/put block on disk I/O and zstd; async
+    code uses aget/aput, which run them on a worker thread.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl_s: float = DEFAULT_CACHE_TTL_S):
+        self.cache_dir = cache_dir
+        self.ttl_s = ttl_s
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    @staticmethod
+    def key(method: str, path: str, params: Optional[Dict] = None) -> str:
+        canonical = orjson.dumps([method.upper(), path, sorted((params or {}).items())])
+        return hashlib.sha256(canonical).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.zst")
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_s:
+                return None
+            with open(path, "rb") as fh:
+                return orjson.loads(self._decompressor.decompress(fh.read()))
+        except (OSError, zstandard.ZstdError, orjson.JSONDecodeError):
+            return None
+
+    def put(self, key: str, payload: Dict) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(self._compressor.compress(orjson.dumps(payload)))
+        os.replace(tmp_path, path)
+
+    async def aget(self, key: str) -> Optional[Dict]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, payload: Dict) -> None:
+        await asyncio.to_thread(self.put, key, payload)
+
+
+class PatentAPIConnector:
+    """
+    Async patent API connector
+
+    Use as an async context manager so the pooled client is closed:
+
+        async with PatentAPIConnector() as api:
+            patents = await api.search_all("metformin")
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        api_key: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        timeout_s: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        headers = {"Accept": "application/json"}
+        api_key = api_key or os.getenv("PATENT_API_KEY")
+        if api_key:
+            headers["X-Api-Key"] = api_key
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout_s,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            transport=transport
+        )
+        self.cache = cache if cache is not None else ResponseCache()
+        self.page_size = page_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.stats = {"requests": 0, "cache_hits": 0, "retries": 0}
+
+    async def __aenter__(self) -> "PatentAPIConnector":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    async def _get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        """GET a JSON resource through the cache, retrying 429/5xx with backoff"""
+        key = ResponseCache.key("GET", path, params)
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        for attempt in range(MAX_RETRIES + 1):
+            async with self._semaphore:
+                self.stats["requests"] += 1
+                try:
+                    response = await self.client.get(path, params=params)
+                except httpx.TransportError as e:
+                    response = None
+                    error = str(e)
+
+            if response is not None:
+                if response.status_code == 200:
+                    payload = response.json()
+                    await self.cache.aput(key, payload)
+                    return payload
+                if response.status_code == 404:
+                    raise PatentAPIError(f"Not found: {path}")
+                if response.status_code != 429 and response.status_code < 500:
+                    raise PatentAPIError(f"{path} returned {response.status_code}: {response.text[:200]}")
+                error = f"HTTP {response.status_code}"
+
+            if attempt == MAX_RETRIES:
+                break
+            self.stats["retries"] += 1
+            delay = _retry_after(response) if response is not None else None
+            if delay is None:
+                delay = random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** attempt))
+            logger.warning(f"Patent API {path} failed ({error}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        raise PatentAPIError(f"{path} failed after {MAX_RETRIES + 1} attempts: {error}")
+
+    async def get_patent(self, patent_number: str) -> Dict:
+        """Fetch a single patent by number"""
+        return await self._get(f"/patents/{patent_number}")
+
+    async def search_page(self, query: str, page: int = 1) -> Dict:
+        """Fetch one page of search results"""
+        return await self._get("/patents", {"q": query, "page": page, "per_page": self.page_size})
+
+    async def search_all(self, query: str, max_pages: Optional[int] = None) -> List[Dict]:
+        """
+        Fetch every page of a search
+
+        The first page gives the total; the remaining pages are fetched
+        concurrently, bounded by the connector's concurrency limit.
+        """
+        first = await self.search_page(query, 1)
+        results = list(first.get("results", []))
+        total = first.get("total", len(results))
+        pages = -(-total // self.page_size) if total else 1
+        if max_pages is not None:
+            pages = min(pages, max_pages)
+
+        rest = await asyncio.gather(*(self.search_page(query, page) for page in range(2, pages + 1)))
+        for payload in rest:
+            results.extend(payload.get("results", []))
+        return results
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds"""
+    value = response.headers.get("retry-after")
+    try:
+        return min(float(value), BACKOFF_MAX_S) if value is not None else None
+    except ValueError:
+        return None
+
+
+def to_patent_record(raw: Dict) -> Dict:
+    """
+    Map an API patent record onto the PATENTS_DB record shape
+
+    Args:
+        raw: Patent record as returned by the API
+
+    Returns:
+        Patent dictionary usable by patent_data and format_patent_for_llm
+    """
+    expiration = raw.get("expiration_date") or raw.get("expirationDate") or "N/A"
+    try:
+        years_remaining = max(int(expiration[:4]) - time.gmtime().tm_year, 0)
+    except (TypeError, ValueError):
+        years_remaining = "N/A"
+    return {
+        "title": raw.get("title") or raw.get("inventionTitle", "N/A"),
+        "patent_number": raw.get("patent_number") or raw.get("patentNumber", "N/A"),
+        "filing_date": raw.get("filing_date") or raw.get("filingDate", "N/A"),
+        "grant_date": raw.get("grant_date") or raw.get("grantDate", "N/A"),
+        "expiration_date": expiration,
+        "years_remaining": years_remaining,
+        "status": raw.get("status", "Active" if years_remaining not in (0, "N/A") else "Expired"),
+        "assignee": raw.get("assignee") or raw.get("assigneeEntityName", "N/A"),
+        "inventors": raw.get("inventors") or raw.get("inventorNameArrayText", []),
+        "claims_count": raw.get("claims_count", raw.get("claimCount", "N/A")),
+        "abstract": raw.get("abstract") or raw.get("abstractText", "N/A"),
+        "key_claims": raw.get("key_claims", []),
+        "citations": raw.get("citations", 0),
+        "freedom_to_operate": raw.get("freedom_to_operate", "Not assessed")
+    }
+
+
+async def fetch_into_patent_db(query: str, connector: Optional[PatentAPIConnector] = None,
+                               max_pages: Optional[int] = None) -> Dict:
+    """
+    Fetch patents for a query and merge them into the patent database
+
+    Refreshes the patent dataset version so /data/patents ETags change.
+
+    Returns:
+        Dictionary with the number of fetched and newly added patents
+    """
+    owns_connector = connector is None
+    connector = connector or PatentAPIConnector()
+    try:
+        raw_patents = await connector.search_all(query, max_pages=max_pages)
+    finally:
+        if owns_connector:
+            await connector.close()
+
+    added = 0
+    for raw in raw_patents:
+        record = to_patent_record(raw)
+        number = record["patent_number"]
+        if number == "N/A":
+            continue
+        added += number not in patent_data.PATENTS_DB
+        patent_data.PATENTS_DB[number] = record
+
+    patent_data.get_dataset_version(refresh=True)
+    return {"found": True, "fetched": len(raw_patents), "added": added, "count": len(patent_data.PATENTS_DB)}
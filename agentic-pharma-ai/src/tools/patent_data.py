@@ -5,6 +5,9 @@ Retrieves patent information from dummy database
 import json
 from typing import Optional, List, Dict
 
+from tools.dataset_version import DatasetVersion
+from tools.lookup_cache import shared_lookup
+
 
 # Dummy Patent Database
 PATENTS_DB = {
@@ -91,6 +94,11 @@ PATENTS_DB = {
 }
 
 
+# Content version of PATENTS_DB; get_dataset_version(refresh=True) after modifying it
+get_dataset_version = DatasetVersion(PATENTS_DB, __file__)
+
+
+@shared_lookup("patent_number")
 def get_patent_data(query: str) -> Dict:
     """
     Retrieves patent data from dummy database
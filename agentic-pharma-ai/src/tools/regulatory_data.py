@@ -5,6 +5,9 @@ Retrieves FDA approval and regulatory data from dummy database
 import json
 from typing import Optional, List, Dict
 
+from tools.dataset_version import DatasetVersion
+from tools.lookup_cache import shared_lookup
+
 
 # Dummy Regulatory Database
 REGULATORY_DB = {
@@ -87,6 +90,11 @@ REGULATORY_DB = {
 }
 
 
+# Content version of REGULATORY_DB; get_dataset_version(refresh=True) after modifying it
+get_dataset_version = DatasetVersion(REGULATORY_DB, __file__)
+
+
+@shared_lookup("application_number")
 def get_regulatory_data(query: str) -> Dict:
     """
     Retrieves regulatory data from dummy database
@@ -5,6 +5,9 @@ Retrieves published research and literature from dummy database
 import json
 from typing import Optional, List, Dict
 
+from tools.dataset_version import DatasetVersion
+from tools.lookup_cache import shared_lookup
+
 
 # Dummy Scientific Journal Database
 JOURNAL_DB = {
@@ -101,6 +104,11 @@ JOURNAL_DB = {
 }
 
 
+# Content version of JOURNAL_DB; get_dataset_version(refresh=True) after modifying it
+get_dataset_version = DatasetVersion(JOURNAL_DB, __file__)
+
+
+@shared_lookup("doi")
 def get_journal_data(query: str) -> Dict:
     """
     Retrieves scientific journal data from dummy database
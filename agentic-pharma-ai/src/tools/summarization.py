@@ -1,2 +1,176 @@
-# placeholder
-from langchain_core.tools import tool
\ No newline at end of file
+"""
+Summarization Tool
+Fast extractive pre-summarization (TextRank / centroid sentence scoring)
+used to shrink record text and agent outputs before they reach the LLM
+"""
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List
+
+import numpy as np
+from langchain_core.tools import tool
+
+
+# Token budgets (estimated tokens); set PRESUMMARIZE=0 to disable
+PRESUMMARIZE_ENABLED = os.getenv("PRESUMMARIZE", "1") != "0"
+FIELD_MAX_TOKENS = int(os.getenv("PRESUMMARIZE_FIELD_TOKENS", "120"))
+AGENT_OUTPUT_MAX_TOKENS = int(os.getenv("PRESUMMARIZE_AGENT_TOKENS", "600"))
+
+# Free-text record fields worth compressing
+LONG_TEXT_FIELDS = ("abstract", "results", "notes", "safety_profile", "post_marketing_commitment", "excerpt", "summary")
+
+VECTOR_DIM = 1024
+DAMPING = 0.85
+TEXTRANK_ITERATIONS = 30
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(\[])|\n+")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_stats_lock = threading.Lock()
+_stats = {"calls": 0, "compressed": 0, "input_tokens": 0, "output_tokens": 0, "cpu_ms": 0.0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences (also on line breaks, so bullet lists split per item)"""
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s and s.strip()]
+
+
+def _sentence_vectors(sentences: List[str]) -> np.ndarray:
+    """L2-normalized hashed bag-of-words vectors, one row per sentence"""
+    rows, cols = [], []
+    for i, sentence in enumerate(sentences):
+        for token in _TOKEN_RE.findall(sentence.lower()):
+            rows.append(i)
+            cols.append(zlib.crc32(token.encode("utf-8")) % VECTOR_DIM)
+    vectors = np.zeros((len(sentences), VECTOR_DIM), dtype=np.float32)
+    np.add.at(vectors, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def score_sentences(sentences: List[str], method: str = "textrank") -> np.ndarray:
+    """
+    Score sentences by importance
+
+    Args:
+        sentences: Sentences to score
+        method: "textrank" (PageRank over cosine similarity) or "centroid"
+
+    Returns:
+        Array of scores, one per sentence
+    """
+    vectors = _sentence_vectors(sentences)
+    if method == "centroid":
+        centroid = vectors.mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        return vectors @ (centroid / norm) if norm else np.zeros(len(sentences))
+    if method != "textrank":
+        raise ValueError(f"Unknown summarization method: {method}")
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = similarity / np.where(row_sums == 0, 1, row_sums)
+    n = len(sentences)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(TEXTRANK_ITERATIONS):
+        scores = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+    return scores
+
+
+def summarize_text(text: str, max_tokens: int, method: str = "textrank") -> str:
+    """
+    Extractively compress text to roughly `max_tokens` estimated tokens
+
+    Picks the highest scoring sentences that fit the budget and returns
+    them in their original order. Text already within budget is returned
+    unchanged. Every call is recorded in the summarization stats.
+    """
+    started = time.thread_time()
+    input_tokens = estimate_tokens(text)
+    summary = text
+
+    if input_tokens > max_tokens:
+        sentences = split_sentences(text)
+        if len(sentences) > 1:
+            scores = score_sentences(sentences, method)
+            chosen, used = [], 0
+            for i in np.argsort(-scores):
+                cost = estimate_tokens(sentences[i]) + 1
+                if used + cost <= max_tokens or not chosen:
+                    chosen.append(i)
+                    used += cost
+            summary = " ".join(sentences[i] for i in sorted(chosen))
+        if estimate_tokens(summary) > max_tokens:
+            # Leave room for the ellipsis so the result stays within budget
+            summary = summary[:max_tokens * 4 - 3].rsplit(" ", 1)[0] + "..."
+
+    with _stats_lock:
+        _stats["calls"] += 1
+        _stats["compressed"] += summary is not text
+        _stats["input_tokens"] += input_tokens
+        _stats["output_tokens"] += estimate_tokens(summary)
+        _stats["cpu_ms"] += (time.thread_time() - started) * 1000
+    return summary
+
+
+def compress_record(record: Dict, fields: Iterable[str] = LONG_TEXT_FIELDS,
+                    max_tokens: int = FIELD_MAX_TOKENS) -> Dict:
+    """
+    Return a copy of a data record with long free-text fields compressed
+
+    Args:
+        record: Record dictionary (trial, patent, application, article)
+        fields: Field names to compress when present and too long
+        max_tokens: Per-field token budget
+
+    Returns:
+        Shallow copy of the record (the record itself when disabled)
+    """
+    if not PRESUMMARIZE_ENABLED:
+        return record
+    compressed = dict(record)
+    for field in fields:
+        value = compressed.get(field)
+        if isinstance(value, str) and estimate_tokens(value) > max_tokens:
+            compressed[field] = summarize_text(value, max_tokens)
+    return compressed
+
+
+def compress_agent_output(text: str, max_tokens: int = AGENT_OUTPUT_MAX_TOKENS) -> str:
+    """Compress a specialist agent's output before it is passed on for synthesis"""
+    if not PRESUMMARIZE_ENABLED:
+        return text
+    return summarize_text(text, max_tokens)
+
+
+def get_summarization_stats() -> Dict:
+    """
+    Token reduction and CPU cost of pre-summarization so far
+
+    Returns:
+        Dictionary with call counts, estimated tokens in/out, reduction
+        percentage and total/average CPU milliseconds
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["tokens_saved"] = stats["input_tokens"] - stats["output_tokens"]
+    stats["reduction_percent"] = round(
+        100 * stats["tokens_saved"] / stats["input_tokens"], 2) if stats["input_tokens"] else 0.0
+    stats["avg_cpu_ms"] = round(stats["cpu_ms"] / stats["calls"], 3) if stats["calls"] else 0.0
+    stats["cpu_ms"] = round(stats["cpu_ms"], 3)
+    return stats
+
+
+@tool
+def extractive_summary(text: str, max_tokens: int = AGENT_OUTPUT_MAX_TOKENS) -> str:
+    """Extractively summarize text to about max_tokens tokens, keeping the most central sentences."""
+    return summarize_text(text, max_tokens)
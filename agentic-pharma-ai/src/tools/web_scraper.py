@@ -1 +1,336 @@
-# placeholder
+"""
+Web Scraper Tool
+Async fetcher/crawler with polite per-host concurrency, robots.txt rules,
+HTTP keep-alive, conditional revalidation and a zstd-compressed page cache
+on disk
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+import orjson
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = os.getenv("WEB_CACHE_DIR", os.path.join(".cache", "web_pages"))
+# Cached pages younger than this are served without any request
+DEFAULT_FRESH_S = 15 * 60
+PER_HOST_CONNECTIONS = 2
+MAX_CONNECTIONS = 32
+USER_AGENT = "PharmaResearchBot/1.0 (+research assistant)"
+
+SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe", "template"}
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr", "table",
+              "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre"}
+
+
+class _TextExtractor(HTMLParser):
+    """Collect readable text, title and links while skipping boilerplate"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.title = ""
+        self.links: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self.parts.append(data)
+
+
+def extract_text(html: str) -> Dict:
+    """
+    Strip boilerplate from an HTML page
+
+    Returns:
+        Dictionary with title, main text and raw link hrefs
+    """
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in "".join(parser.parts).split("\n"))
+    # Very short lines are mostly leftover menu items and buttons
+    text = "\n".join(line for line in lines if len(line) > 1)
+    return {"title": " ".join(parser.title.split()), "text": text, "links": parser.links}
+
+
+class PageCache:
+    """
+    zstd-compressed on-disk page cache keyed by URL hash
+
+    get/put block on disk I/O and zstd; async code uses aget/aput, which run
+    them on a worker thread.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._compressor = zstandard.ZstdCompressor(level=6)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.zst")
+
+    def get(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._path(url), "rb") as fh:
+                return orjson.loads(self._decompressor.decompress(fh.read()))
+        except (OSError, zstandard.ZstdError, orjson.JSONDecodeError):
+            return None
+
+    def put(self, url: str, page: Dict) -> None:
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(self._compressor.compress(orjson.dumps(page)))
+        os.replace(tmp_path, path)
+
+    async def aget(self, url: str) -> Optional[Dict]:
+        return await asyncio.to_thread(self.get, url)
+
+    async def aput(self, url: str, page: Dict) -> None:
+        await asyncio.to_thread(self.put, url, page)
+
+
+class WebScraper:
+    """
+    Polite async page fetcher
+
+        async with WebScraper() as scraper:
+            pages = await scraper.fetch_many(urls)
+    """
+
+    def __init__(
+        self,
+        cache: Optional[PageCache] = None,
+        per_host: int = PER_HOST_CONNECTIONS,
+        fresh_s: float = DEFAULT_FRESH_S,
+        timeout_s: float = 20.0,
+        respect_robots: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+            timeout=timeout_s,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            transport=transport
+        )
+        self.cache = cache if cache is not None else PageCache()
+        self.fresh_s = fresh_s
+        self.respect_robots = respect_robots
+        self._host_limits: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(per_host))
+        # origin -> task resolving to its robots.txt rules (None: unreachable, no rules)
+        self._robots: Dict[str, asyncio.Task] = {}
+        self.stats = {"fetched": 0, "not_modified": 0, "fresh_hits": 0, "errors": 0, "robots_blocked": 0}
+
+    async def __aenter__(self) -> "WebScraper":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    async def _fetch_robots(self, origin: str) -> Optional[RobotFileParser]:
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            async with self._host_limits[urlparse(origin).netloc]:
+                response = await self.client.get(f"{origin}/robots.txt")
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch {origin}/robots.txt: {e}")
+            return None
+        if response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif response.status_code == 200:
+            parser.parse(response.text.splitlines())
+        else:
+            parser.allow_all = True
+        return parser
+
+    async def allowed(self, url: str) -> bool:
+        """
+        Whether robots.txt lets this scraper fetch a URL
+
+        Each origin's robots.txt is fetched once per scraper and shared by
+        concurrent fetches. A missing robots.txt allows everything, 401/403
+        disallows everything and an unreachable one imposes no rules.
+        """
+        if not self.respect_robots:
+            return True
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin not in self._robots:
+            self._robots[origin] = asyncio.ensure_future(self._fetch_robots(origin))
+        parser = await self._robots[origin]
+        return parser is None or parser.can_fetch(USER_AGENT, url)
+
+    async def fetch(self, url: str) -> Optional[Dict]:
+        """
+        Fetch a page, revalidating any cached copy
+
+        Cached pages within `fresh_s` are returned without a request; older
+        ones are revalidated with If-None-Match / If-Modified-Since and only
+        re-downloaded and re-parsed when the server says they changed. URLs
+        disallowed by robots.txt are not requested. Cache I/O and HTML
+        parsing run on worker threads, off the event loop.
+
+        Returns:
+            Page dictionary (url, title, text, links, ...) or None on error
+            or when robots.txt disallows the URL
+        """
+        url = urldefrag(url)[0]
+        cached = await self.cache.aget(url)
+        if cached and time.time() - cached["fetched_at"] < self.fresh_s:
+            self.stats["fresh_hits"] += 1
+            return cached
+
+        if not await self.allowed(url):
+            self.stats["robots_blocked"] += 1
+            return None
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            async with self._host_limits[urlparse(url).netloc]:
+                response = await self.client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch {url}: {e}")
+            self.stats["errors"] += 1
+            return cached
+
+        if response.status_code == 304 and cached:
+            self.stats["not_modified"] += 1
+            cached["fetched_at"] = time.time()
+            await self.cache.aput(url, cached)
+            return cached
+        if response.status_code != 200:
+            logger.warning(f"Fetching {url} returned {response.status_code}")
+            self.stats["errors"] += 1
+            return cached
+
+        self.stats["fetched"] += 1
+        content = await asyncio.to_thread(extract_text, response.text)
+        page = {
+            "url": url,
+            "final_url": str(response.url),
+            "title": content["title"],
+            "text": content["text"],
+            "links": [urldefrag(urljoin(str(response.url), href))[0] for href in content["links"]],
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fetched_at": time.time()
+        }
+        await self.cache.aput(url, page)
+        return page
+
+    async def fetch_many(self, urls: List[str]) -> List[Dict]:
+        """Fetch pages concurrently (per-host limits still apply)"""
+        pages = await asyncio.gather(*(self.fetch(url) for url in dict.fromkeys(urls)))
+        return [page for page in pages if page]
+
+    async def crawl(self, seed_urls: List[str], max_pages: int = 50, same_host: bool = True) -> List[Dict]:
+        """
+        Breadth-first crawl from seed URLs
+
+        Args:
+            seed_urls: Starting URLs
+            max_pages: Maximum number of pages to return
+            same_host: Only follow links to the seed hosts
+        """
+        hosts = {urlparse(url).netloc for url in seed_urls}
+        seen = set()
+        frontier = [urldefrag(url)[0] for url in seed_urls]
+        pages: List[Dict] = []
+
+        while frontier and len(pages) < max_pages:
+            batch = [url for url in dict.fromkeys(frontier) if url not in seen][:max_pages - len(pages)]
+            seen.update(batch)
+            frontier = []
+            for page in await self.fetch_many(batch):
+                pages.append(page)
+                for link in page["links"]:
+                    parsed = urlparse(link)
+                    if parsed.scheme in ("http", "https") and link not in seen and (
+                            not same_host or parsed.netloc in hosts):
+                        frontier.append(link)
+        return pages
+
+
+def pages_to_search_results(query: str, pages: List[Dict], top_k: int = 10) -> Dict:
+    """
+    Rank fetched pages against a query, shaped like MockDataSources.web_search results
+
+    Args:
+        query: Search query
+        pages: Pages returned by WebScraper
+        top_k: Number of results to return
+
+    Returns:
+        Dictionary with query and ranked results
+    """
+    terms = [t for t in re.findall(r"[a-z0-9]+", query.lower()) if len(t) > 2]
+    ranked = []
+    for page in pages:
+        text = page["text"].lower()
+        score = sum(text.count(term) for term in terms) + 5 * sum(term in page["title"].lower() for term in terms)
+        if score:
+            first = min((text.find(t) for t in terms if t in text), default=0)
+            ranked.append((score, page, page["text"][max(0, first - 80):first + 220].strip()))
+    ranked.sort(key=lambda item: item[0], reverse=True)
+
+    return {
+        "query": query,
+        "results": [
+            {
+                "title": page["title"] or page["url"],
+                "source": urlparse(page["url"]).netloc,
+                "url": page["url"],
+                "snippet": snippet,
+                "_relevance_score": score
+            }
+            for score, page, snippet in ranked[:top_k]
+        ]
+    }
@@ -0,0 +1,161 @@
+"""
+Shared test setup
+Puts src on the import path, runs every LLM call on the offline stub model
+and keeps all on-disk state in a temporary directory
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+from pydantic import PrivateAttr
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+# Set before any src module is imported: modules read these at import time
+_STATE_DIR = tempfile.mkdtemp(prefix="pharma-ai-tests-")
+_LLM_CONFIG = os.path.join(_STATE_DIR, "llm.yaml")
+with open(_LLM_CONFIG, "w") as fh:
+    fh.write("llm:\n  provider: stub\n  model: stub\n  stub:\n    sleep: false\n")
+os.environ["LLM_CONFIG"] = _LLM_CONFIG
+for _name in ("LLM_PROVIDER", "LLM_MODEL", "LLM_TOKENS_PER_MINUTE", "LLM_HEDGING", "LLM_CASCADE"):
+    os.environ.pop(_name, None)
+os.environ["AGENT_STATS_PATH"] = os.path.join(_STATE_DIR, "agent_stats.json")
+os.environ["JOBS_DB_PATH"] = os.path.join(_STATE_DIR, "jobs.sqlite3")
+os.environ["REPORT_STORAGE_DIR"] = os.path.join(_STATE_DIR, "reports")
+os.environ["PATENT_API_CACHE_DIR"] = os.path.join(_STATE_DIR, "patent_api")
+os.environ["WEB_CACHE_DIR"] = os.path.join(_STATE_DIR, "web_pages")
+
+from services.stub_llm import StubChatModel  # noqa: E402  (needs LLM_CONFIG set)
+
+# handler(method, path, headers) -> (status, headers, body)
+Handler = Callable[[str, str, Dict[str, str]], Tuple[int, Dict[str, str], bytes]]
+
+
+class StubServer:
+    """Local HTTP server answering every request through a handler function"""
+
+    def __init__(self, handler: Handler):
+        self.handler = handler
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        stub = self
+
+        class _RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self):
+                headers = {k.lower(): v for k, v in self.headers.items()}
+                stub.requests.append((self.command, self.path, headers))
+                status, response_headers, body = stub.handler(self.command, self.path, headers)
+                self.send_response(status)
+                for name, value in response_headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    try:
+                        self.wfile.write(body)
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass  # the client gave up (timeout tests)
+
+            do_GET = do_HEAD = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _RequestHandler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def paths(self) -> List[str]:
+        return [path for _, path, _ in self.requests]
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fresh_agent_stats(monkeypatch):
+    """Plan from the prior agent estimates, unaffected by runs in earlier tests"""
+    from services import agent_stats
+    stats = agent_stats.AgentStats(path=None)
+    monkeypatch.setattr(agent_stats, "_agent_stats", stats)
+    return stats
+
+
+@pytest.fixture
+def stub_server():
+    """Factory starting a StubServer per handler; servers stop after the test"""
+    servers: List[StubServer] = []
+
+    def start(handler: Handler) -> StubServer:
+        server = StubServer(handler)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+class RateLimitError(Exception):
+    """Provider 429, as raised by LLM clients"""
+    status_code = 429
+
+
+class ScriptedChatModel(StubChatModel):
+    """
+    Stub model with scripted failures and delays
+
+    Call n raises script[n] if it is an exception, or waits script[n]
+    seconds before answering; calls past the end of the script wait
+    `delay_s`. Streams closed before their last chunk count as cancelled.
+    """
+
+    script: List[Any] = []
+    delay_s: float = 0.0
+    sleep: bool = False
+
+    _calls: int = PrivateAttr(default=0)
+    _cancelled: int = PrivateAttr(default=0)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def cancelled(self) -> int:
+        return self._cancelled
+
+    def _step(self) -> None:
+        with self._lock:
+            step = self.script[self._calls] if self._calls < len(self.script) else self.delay_s
+            self._calls += 1
+        if isinstance(step, Exception):
+            raise step
+        if step:
+            time.sleep(step)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._step()
+        return super()._generate(messages, stop=stop, **kwargs)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self._step()
+        finished = False
+        try:
+            yield from super()._stream(messages, stop=stop, **kwargs)
+            finished = True
+        finally:
+            if not finished:
+                with self._lock:
+                    self._cancelled += 1
@@ -0,0 +1,41 @@
+"""
+Agent latency and token statistics
+"""
+import json
+
+from services.agent_stats import AgentStats
+
+
+def test_stats_are_saved_every_n_records(tmp_path):
+    path = tmp_path / "stats.json"
+    stats = AgentStats(str(path), save_every=3, save_interval_s=3600)
+    stats.record("patent", 100.0, 50)
+    stats.record("patent", 200.0, 50)
+    assert not path.exists()
+    stats.record("patent", 300.0, 50)
+    assert json.loads(path.read_text())["patent"]["samples"] == 3
+
+
+def test_stats_are_saved_once_the_interval_passes(tmp_path):
+    path = tmp_path / "stats.json"
+    stats = AgentStats(str(path), save_every=1000, save_interval_s=0)
+    stats.record("patent", 100.0)
+    assert json.loads(path.read_text())["patent"]["samples"] == 1
+
+
+def test_flush_writes_unsaved_stats_and_they_reload(tmp_path):
+    path = tmp_path / "stats.json"
+    stats = AgentStats(str(path), save_every=1000, save_interval_s=3600)
+    stats.record("patent", 100.0, 40)
+    stats.record("patent", 200.0, 60)
+    stats.flush()
+
+    reloaded = AgentStats(str(path)).estimate("patent")
+    assert reloaded == stats.estimate("patent")
+    assert reloaded["latency_ms"] == 0.8 * 100.0 + 0.2 * 200.0
+
+
+def test_flush_without_new_records_does_not_write(tmp_path):
+    path = tmp_path / "stats.json"
+    AgentStats(str(path)).flush()
+    assert not path.exists()
@@ -0,0 +1,132 @@
+"""
+Bulk synthetic data generator
+"""
+import json
+
+import numpy as np
+import pytest
+
+from database import bulk_generator
+from database.bulk_generator import GENERATORS, iter_chunks, main, write_dataset
+
+COLUMNS = {
+    "trials": {
+        "nct_number", "title", "drug_name", "phase", "status", "enrollment", "primary_outcome",
+        "efficacy_rate", "safety_profile", "adverse_events", "indication", "start_date", "duration", "sponsor",
+    },
+    "patents": {
+        "patent_number", "title", "filing_date", "grant_date", "expiration_date", "years_remaining", "status",
+        "assignee", "inventors", "claims_count", "abstract", "key_claims", "citations", "freedom_to_operate",
+    },
+    "regulatory": {
+        "application_number", "application_type", "drug_name", "brand_name", "submission_date", "approval_date",
+        "status", "approval_type", "indication", "dosage", "manufacturer", "adverse_events_reported",
+        "black_box_warning", "rems_required",
+    },
+    "articles": {
+        "doi", "title", "authors", "journal", "publication_date", "volume", "issue", "pages", "impact_factor",
+        "citations", "abstract", "study_design", "sample_size", "primary_endpoint", "keywords",
+    },
+    "exim": {
+        "row_id", "molecule", "hs_code", "quarter", "exporter", "importer", "volume_kg",
+        "unit_price_usd_per_kg", "value_usd_million",
+    },
+}
+
+ID_COLUMNS = {
+    "trials": "nct_number",
+    "patents": "patent_number",
+    "regulatory": "application_number",
+    "articles": "doi",
+    "exim": "row_id",
+}
+
+
+def collect(dataset, rows, **kwargs):
+    """Concatenate a dataset's chunks into whole columns"""
+    chunks = list(iter_chunks(dataset, rows, **kwargs))
+    return chunks, {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+
+def test_every_dataset_has_a_schema():
+    assert set(GENERATORS) == set(COLUMNS)
+
+
+@pytest.mark.parametrize("dataset", sorted(COLUMNS))
+def test_row_counts_and_schema(dataset):
+    chunks, columns = collect(dataset, 1050, chunk_size=400)
+
+    assert [len(chunk[ID_COLUMNS[dataset]]) for chunk in chunks] == [400, 400, 250]
+    assert set(columns) == COLUMNS[dataset]
+    assert all(len(column) == 1050 for column in columns.values())
+    assert len(set(columns[ID_COLUMNS[dataset]].tolist())) == 1050
+
+
+def test_column_values():
+    _, trials = collect("trials", 500)
+    assert set(trials["phase"]) <= set(bulk_generator.PHASES)
+    assert trials["enrollment"].min() >= 20 and trials["enrollment"].max() <= 5000
+    assert all(isinstance(events, list) for events in trials["adverse_events"])
+
+    _, regulatory = collect("regulatory", 500)
+    unapproved = regulatory["status"] != "Approved"
+    assert (regulatory["approval_date"][unapproved] == "N/A").all()
+    assert regulatory["black_box_warning"].dtype == bool
+
+    _, patents = collect("patents", 500)
+    expired = patents["status"] == "Expired"
+    assert (patents["years_remaining"][expired] == 0).all()
+    assert (patents["years_remaining"][~expired] > 0).all()
+
+    _, articles = collect("articles", 50)
+    assert articles["keywords"].shape == (50, 3)
+
+
+@pytest.mark.parametrize("dataset", sorted(COLUMNS))
+def test_fixed_seed_is_deterministic(dataset):
+    _, first = collect(dataset, 300, seed=7, chunk_size=128)
+    _, second = collect(dataset, 300, seed=7, chunk_size=128)
+    _, other = collect(dataset, 300, seed=8, chunk_size=128)
+
+    for key in first:
+        assert first[key].tolist() == second[key].tolist()
+    assert any(first[key].tolist() != other[key].tolist() for key in first)
+
+
+def test_unknown_dataset_and_format():
+    with pytest.raises(ValueError):
+        list(iter_chunks("nope", 10))
+    with pytest.raises(ValueError):
+        write_dataset("trials", 10, "unused", fmt="csv")
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = write_dataset("regulatory", 120, str(tmp_path), seed=3, chunk_size=50)
+    with open(path) as fh:
+        rows = [json.loads(line) for line in fh]
+
+    _, columns = collect("regulatory", 120, seed=3, chunk_size=50)
+    assert len(rows) == 120
+    assert set(rows[0]) == COLUMNS["regulatory"]
+    assert [row["application_number"] for row in rows] == columns["application_number"].tolist()
+    assert rows[5]["adverse_events_reported"] == columns["adverse_events_reported"][5]
+
+
+def test_parquet_round_trip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = write_dataset("patents", 120, str(tmp_path), fmt="parquet", chunk_size=50)
+    table = pq.read_table(path)
+    assert table.num_rows == 120
+    assert set(table.column_names) == COLUMNS["patents"]
+
+
+def test_parquet_without_pyarrow_fails_clearly(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(bulk_generator, "pa", None)
+
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        write_dataset("trials", 10, str(tmp_path), fmt="parquet")
+    assert not (tmp_path / "trials.parquet").exists()
+
+    with pytest.raises(SystemExit):
+        main(["--format", "parquet", "--rows", "10", "--out", str(tmp_path)])
+    assert "requires pyarrow" in capsys.readouterr().err
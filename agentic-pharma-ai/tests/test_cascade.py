@@ -0,0 +1,115 @@
+"""
+Small-to-large specialist model cascade
+"""
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from conftest import ScriptedChatModel
+from services import llm_service
+from services.cascade import check_confidence, invoke_specialist
+from services.metrics import CASCADE_DECISIONS
+from services.timings import agent_scope, collect_timings
+
+SETTINGS = {"enabled": True, "min_chars": 120, "min_cited_ids": 1}
+GROUNDED = ("Trial NCT04567890 enrolled 450 patients with type 2 diabetes. DTZ-100 reduced HbA1c by "
+            "1.2 percent versus placebo at 24 weeks. Nausea was the most common adverse event.")
+
+
+class ProseChatModel(ScriptedChatModel):
+    """Scripted model that ignores JSON mode and always replies in prose"""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        kwargs.pop("response_format", None)
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def _messages(text: str):
+    return [SystemMessage(content="You are a clinical trials analyst."), HumanMessage(content=text)]
+
+
+@pytest.fixture
+def tiers(monkeypatch):
+    """Cascade enabled with a scripted small and large specialist model"""
+    def install(small_max_tokens: int = 350, cascade: dict = SETTINGS, small_model=ScriptedChatModel):
+        llm_service.reset_llm()
+        config = llm_service.load_llm_config()
+        config["cascade"] = dict(cascade)
+        monkeypatch.setattr(llm_service, "_config", config)
+        small = small_model(max_output_tokens=small_max_tokens)
+        large = ScriptedChatModel(seed=1)
+        monkeypatch.setitem(llm_service._clients, "specialist_small", small)
+        monkeypatch.setitem(llm_service._clients, "specialist", large)
+        return small, large
+
+    yield install
+    llm_service.reset_llm()
+
+
+def _decisions(agent: str, outcome: str, reason: str = "") -> float:
+    return CASCADE_DECISIONS.labels(agent, outcome, reason)._value.get()
+
+
+def test_check_confidence():
+    assert check_confidence(GROUNDED, ["NCT04567890"], SETTINGS) is None
+    assert check_confidence("Too short.", [], SETTINGS) == "empty"
+    assert check_confidence("   ", [], {"min_chars": 0}) is None
+    assert check_confidence(GROUNDED + " I don't know the long-term risks.", [], SETTINGS) == "uncertain"
+    assert check_confidence(GROUNDED, ["NCT99999999"], SETTINGS) == "no_citations"
+    # Citing every retrieved id is enough even below min_cited_ids
+    assert check_confidence(GROUNDED, ["NCT04567890"], {**SETTINGS, "min_cited_ids": 3}) is None
+
+
+def test_confident_small_answer_stops_at_the_cheap_tier(tiers):
+    small, large = tiers()
+    accepted = _decisions("clinical_trials", "accepted")
+    with collect_timings() as stages, agent_scope("clinical_trials"):
+        response = invoke_specialist(_messages(GROUNDED), ["NCT04567890"])
+
+    assert "NCT04567890" in response.content
+    assert (small.calls, large.calls) == (1, 0)
+    assert [stage.get("tier") for stage in stages if stage["stage"] == "llm"] == ["small"]
+    assert _decisions("clinical_trials", "accepted") == accepted + 1
+
+
+@pytest.mark.parametrize("small_max_tokens, text, ids, reason", [
+    (8, GROUNDED, ["NCT04567890"], "empty"),
+    (350, GROUNDED + " There is not enough information on long-term benefit.", [], "uncertain"),
+    (350, GROUNDED, ["NCT11111111"], "no_citations"),
+])
+def test_low_confidence_answer_escalates_to_the_large_tier(tiers, small_max_tokens, text, ids, reason):
+    small, large = tiers(small_max_tokens=small_max_tokens)
+    escalated = _decisions("clinical_trials", "escalated", reason)
+    with collect_timings() as stages, agent_scope("clinical_trials"):
+        response = invoke_specialist(_messages(text), ids)
+
+    assert (small.calls, large.calls) == (1, 1)
+    llm_stages = [stage for stage in stages if stage["stage"] == "llm"]
+    assert [stage.get("tier") for stage in llm_stages] == ["small", "large"]
+    assert llm_stages[1]["escalation"] == reason
+    assert response.content == large.invoke(_messages(text)).content
+    assert _decisions("clinical_trials", "escalated", reason) == escalated + 1
+
+
+def test_cascade_disabled_calls_only_the_specialist(tiers):
+    small, large = tiers(cascade={"enabled": False})
+    invoke_specialist(_messages("Too short."), ["NCT04567890"])
+    assert (small.calls, large.calls) == (0, 1)
+
+
+def test_structured_reply_without_a_valid_finding_escalates(tiers):
+    small, large = tiers(small_model=ProseChatModel)
+    with collect_timings() as stages:
+        response = invoke_specialist(_messages(GROUNDED), ["NCT04567890"], structured=True)
+
+    assert (small.calls, large.calls) == (1, 1)
+    assert [stage.get("escalation") for stage in stages if stage["stage"] == "llm"] == [None, "invalid_finding"]
+    assert response.response_metadata["finding"]["cited_ids"] == ["NCT04567890"]
+
+
+def test_structured_confident_finding_is_accepted(tiers):
+    small, large = tiers()
+    response = invoke_specialist(_messages(GROUNDED), ["NCT04567890"], structured=True)
+    assert (small.calls, large.calls) == (1, 0)
+    finding = response.response_metadata["finding"]
+    assert finding["summary"] == "Trial NCT04567890 enrolled 450 patients with type 2 diabetes."
+    assert finding["cited_ids"] == ["NCT04567890"]
@@ -0,0 +1,197 @@
+"""
+LLM circuit breaker: state machine and degraded data-only answers
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import HumanMessage
+
+import app as app_module
+from conftest import RateLimitError, ScriptedChatModel
+from orchestrator import run_orchestrator
+from services import llm_service
+from services.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerChatModel, CircuitOpenError, get_breaker,
+    is_provider_failure, llm_circuit_open
+)
+from tools.lookup_cache import shared_lookups
+
+MESSAGES = [HumanMessage(content="DTZ-100 is approved.")]
+
+
+class ServerError(Exception):
+    """Provider 5xx, as raised by LLM clients"""
+    status_code = 503
+
+
+class BadRequestError(Exception):
+    """Provider 400, as raised by LLM clients"""
+    status_code = 400
+
+
+class APIConnectionError(Exception):
+    """Stands in for openai.APIConnectionError"""
+
+
+def _tripped(threshold=2, reset_timeout_s=0.05):
+    breaker = CircuitBreaker({"failure_threshold": threshold, "reset_timeout_s": reset_timeout_s})
+    for _ in range(threshold):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    return breaker
+
+
+def test_consecutive_failures_open_the_circuit():
+    breaker = CircuitBreaker({"failure_threshold": 3})
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # resets the streak
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker = _tripped(threshold=3, reset_timeout_s=60)
+    assert breaker.state == OPEN and breaker.is_open()
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1 and breaker.stats()["opened"] == 1
+
+
+def test_half_open_probe_success_closes_the_circuit():
+    breaker = _tripped()
+    time.sleep(0.06)
+    assert not breaker.is_open()
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert breaker.is_open() and not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow_request()
+
+
+def test_half_open_probe_failure_reopens_the_circuit():
+    breaker = _tripped()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow_request()
+    assert breaker.stats()["opened"] == 2
+
+
+def test_skipped_probe_frees_the_probe_slot():
+    breaker = _tripped()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_skipped()
+    assert breaker.state == HALF_OPEN and breaker.allow_request()
+
+
+def test_provider_failures():
+    assert is_provider_failure(ServerError())
+    assert is_provider_failure(RateLimitError())
+    assert is_provider_failure(ConnectionError("reset by peer"))
+    assert is_provider_failure(APIConnectionError())
+    assert not is_provider_failure(BadRequestError())
+    assert not is_provider_failure(ValueError("bad argument"))
+    assert not is_provider_failure(TimeoutError("no capacity"))
+
+
+def test_wrapper_rejects_calls_while_open():
+    inner = ScriptedChatModel(script=[ServerError("down"), ServerError("down")])
+    model = CircuitBreakerChatModel(inner=inner, breaker=CircuitBreaker({"failure_threshold": 2}))
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            model.invoke(MESSAGES)
+    with pytest.raises(CircuitOpenError):
+        model.invoke(MESSAGES)
+    assert inner.calls == 2
+
+
+def test_limiter_timeouts_do_not_trip_the_circuit():
+    inner = ScriptedChatModel(script=[TimeoutError("no capacity")] * 3)
+    breaker = CircuitBreaker({"failure_threshold": 2})
+    model = CircuitBreakerChatModel(inner=inner, breaker=breaker)
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            model.invoke(MESSAGES)
+    assert breaker.state == CLOSED
+    assert model.invoke(MESSAGES).content
+
+
+def test_caller_errors_do_not_trip_the_circuit():
+    inner = ScriptedChatModel(script=[BadRequestError("context too long"), ValueError("bad argument")] * 2)
+    breaker = CircuitBreaker({"failure_threshold": 2})
+    model = CircuitBreakerChatModel(inner=inner, breaker=breaker)
+    for _ in range(4):
+        with pytest.raises((BadRequestError, ValueError)):
+            model.invoke(MESSAGES)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["failures"] == 0
+    assert model.invoke(MESSAGES).content
+
+
+@pytest.mark.parametrize("error", [RateLimitError(), ConnectionError("reset by peer"), APIConnectionError()])
+def test_rate_limits_and_transport_errors_trip_the_circuit(error):
+    breaker = CircuitBreaker({"failure_threshold": 1})
+    model = CircuitBreakerChatModel(inner=ScriptedChatModel(script=[error]), breaker=breaker)
+    with pytest.raises(type(error)):
+        model.invoke(MESSAGES)
+    assert breaker.state == OPEN
+
+
+def test_caller_error_on_the_probe_frees_the_probe_slot():
+    breaker = _tripped()
+    time.sleep(0.06)
+    model = CircuitBreakerChatModel(inner=ScriptedChatModel(script=[ValueError("bad argument")]), breaker=breaker)
+    with pytest.raises(ValueError):
+        model.invoke(MESSAGES)
+    assert breaker.state == HALF_OPEN
+    assert model.invoke(MESSAGES).content
+    assert breaker.state == CLOSED
+
+
+@pytest.fixture
+def open_circuit():
+    """Open the shared LLM circuit for one test"""
+    llm_service.reset_llm()
+    breaker = get_breaker({"failure_threshold": 1, "reset_timeout_s": 60})
+    breaker.record_failure()
+    yield breaker
+    llm_service.reset_llm()
+
+
+def test_open_circuit_answers_from_data(open_circuit, fresh_agent_stats):
+    query = "What are the clinical trials and patents for DTZ-100?"
+    # Data tools look up the drug the question names only inside a scope
+    with shared_lookups():
+        state = run_orchestrator(query)
+    assert state["degraded"]
+    assert state["synthesis"] in ("none", "skipped")
+    outputs = state["agent_outputs"]
+    assert len(outputs) >= 2
+    # Each specialist's answer is its formatted records
+    assert all("DTZ-100" in output["response"] for output in outputs)
+    assert open_circuit.stats()["rejected"] == 0  # no LLM call was attempted
+
+
+def test_circuit_opening_mid_run_degrades_the_rest(monkeypatch, fresh_agent_stats):
+    llm_service.reset_llm()
+    failing = ScriptedChatModel(script=[ServerError("provider down")] * 10)
+    breaker = get_breaker({"failure_threshold": 1, "reset_timeout_s": 60})
+    model = CircuitBreakerChatModel(inner=failing, breaker=breaker)
+    for role in (None, *llm_service.ROLES):
+        monkeypatch.setitem(llm_service._clients, role, model)
+    try:
+        with shared_lookups():
+            state = run_orchestrator("What are the clinical trials and patents for DTZ-100?")
+    finally:
+        llm_service.reset_llm()
+    # The first specialist's failure opens the circuit; later ones are answered from data
+    assert state["degraded"]
+    assert failing.calls == 1
+    assert any("DTZ-100" in output["response"] for output in state["agent_outputs"])
+
+
+def test_health_reports_degraded_while_open(open_circuit):
+    assert llm_circuit_open()
+    response = TestClient(app_module.app).get("/health")
+    assert response.json()["status"] == "degraded"
@@ -0,0 +1,19 @@
+"""
+Retrieval-only query context
+"""
+from fastapi.testclient import TestClient
+
+import app as app_module
+
+
+def test_context_marks_which_agents_look_up_the_question(fresh_agent_stats):
+    response = TestClient(app_module.app).post("/query/context", json={
+        "query": "What are the clinical trials and patents for DTZ-100?", "max_agents": 3
+    })
+    assert response.status_code == 200
+    agents = response.json()["agents"]
+    assert len(agents) >= 2
+    assert [a["live_lookup_input"] for a in agents] == ["query"] + ["previous_answer"] * (len(agents) - 1)
+    for agent in agents:
+        assert agent["lookup_query"] == "What are the clinical trials and patents for DTZ-100?"
+        assert agent["messages"][-1]["content"] == agent["lookup_query"]
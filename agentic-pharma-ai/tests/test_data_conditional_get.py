@@ -0,0 +1,71 @@
+"""
+Conditional GET on the data tool endpoints
+"""
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+
+
+client = TestClient(app_module.app)
+
+ENDPOINTS = [
+    "/data/clinical-trials?query=DTZ-100", "/data/clinical-trials/all",
+    "/data/patents?query=EndoPharm", "/data/patents/active",
+    "/data/regulatory?query=DTZ-100", "/data/regulatory/approved",
+    "/data/journal?query=diabetes", "/data/journal/all",
+]
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_validators_are_present(url):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"') and response.headers["ETag"].endswith('"')
+    assert parsedate_to_datetime(response.headers["Last-Modified"]) is not None
+    assert "must-revalidate" in response.headers["Cache-Control"]
+
+
+@pytest.mark.parametrize("if_none_match", [
+    "{etag}", "W/{etag}", '"other", {etag}', "*",
+])
+def test_matching_if_none_match_returns_304(if_none_match):
+    etag = client.get(ENDPOINTS[0]).headers["ETag"]
+    response = client.get(ENDPOINTS[0], headers={"If-None-Match": if_none_match.format(etag=etag)})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_stale_etag_returns_the_body():
+    response = client.get(ENDPOINTS[0], headers={"If-None-Match": '"clinical_trials-stale"'})
+    assert response.status_code == 200 and response.json()["found"]
+
+
+def test_if_modified_since():
+    last_modified = parsedate_to_datetime(client.get(ENDPOINTS[2]).headers["Last-Modified"])
+    later = format_datetime(last_modified + timedelta(seconds=1), usegmt=True)
+    earlier = format_datetime(last_modified - timedelta(days=1), usegmt=True)
+    assert client.get(ENDPOINTS[2], headers={"If-Modified-Since": later}).status_code == 304
+    assert client.get(ENDPOINTS[2], headers={"If-Modified-Since": earlier}).status_code == 200
+    assert client.get(ENDPOINTS[2], headers={"If-Modified-Since": "not a date"}).status_code == 200
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    last_modified = client.get(ENDPOINTS[2]).headers["Last-Modified"]
+    response = client.get(ENDPOINTS[2], headers={
+        "If-None-Match": '"patent-stale"', "If-Modified-Since": last_modified
+    })
+    assert response.status_code == 200
+
+
+def test_repeat_request_reuses_the_serialized_body():
+    url = "/data/regulatory?query=BLA-256789"
+    first = client.get(url)
+    hits = app_module._data_response_stats["hits"]
+    second = client.get(url)
+    assert first.content == second.content
+    assert app_module._data_response_stats["hits"] == hits + 1
@@ -0,0 +1,140 @@
+"""
+Orchestrator deadlines, cancellation, partial answers and synthesis budgets
+"""
+import threading
+import time
+
+import pytest
+
+import orchestrator
+from conftest import ScriptedChatModel
+from orchestrator import run_orchestrator
+from services import llm_service
+
+QUERY = "What are the clinical trials and patents for DTZ-100?"
+
+
+@pytest.fixture
+def slow_llm(monkeypatch, fresh_agent_stats):
+    """Install a ScriptedChatModel for every LLM role"""
+    def install(**kwargs) -> ScriptedChatModel:
+        llm_service.reset_llm()
+        model = ScriptedChatModel(**kwargs)
+        for role in (None, *llm_service.ROLES):
+            monkeypatch.setitem(llm_service._clients, role, model)
+        return model
+
+    monkeypatch.setattr(orchestrator, "STRUCTURED_FINDINGS", False)
+    yield install
+    llm_service.reset_llm()
+
+
+def _run(**kwargs):
+    partials = []
+    started = time.monotonic()
+    state = run_orchestrator(QUERY, on_partial=partials.append, max_agents=2, incremental=False, **kwargs)
+    return state, partials, time.monotonic() - started
+
+
+def test_expiring_deadline_returns_the_completed_agents(slow_llm):
+    slow_llm(delay_s=0.3)
+    state, partials, elapsed = _run(deadline=time.monotonic() + 0.45)
+
+    assert elapsed < 0.7
+    assert state["partial"]
+    assert [output["agent"] for output in state["agent_outputs"]] == state["plan"]["agents"][:1]
+    assert state["skipped_agents"] == state["plan"]["agents"][1:]
+    # No time is left for the summarizer, so the outputs are merged under headings
+    assert state["synthesis"] == "skipped"
+    first = state["agent_outputs"][0]
+    assert state["message"][-1].content.startswith(f"## {first['agent'].replace('_', ' ').title()}")
+    assert partials == [{"agent": first["agent"], "response": first["response"]}]
+
+
+def test_deadline_before_any_agent_finishes(slow_llm):
+    slow_llm(delay_s=0.5)
+    state, partials, elapsed = _run(deadline=time.monotonic() + 0.1)
+
+    assert elapsed < 0.4
+    assert state["partial"] and state["agent_outputs"] == []
+    assert state["skipped_agents"] == state["plan"]["agents"]
+    assert state["message"][-1].content == "No agent completed before the request deadline."
+    assert partials == []
+
+
+def test_cancel_event_stops_the_run(slow_llm):
+    model = slow_llm(delay_s=0.5)
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    state, partials, elapsed = _run(cancel_event=cancel)
+
+    assert elapsed < 0.4
+    assert state["partial"]
+    assert state["skipped_agents"] == state["plan"]["agents"]
+    assert state["synthesis"] == "none"
+    assert partials == []
+    # The in-flight call finishes on the pool, but no further call starts
+    time.sleep(0.6)
+    assert model.calls == 1
+
+
+def test_cancel_after_first_agent_keeps_its_partial_answer(slow_llm):
+    slow_llm(script=[0.0], delay_s=0.5)
+    cancel = threading.Event()
+    partials = []
+
+    def on_partial(update):
+        # The client disconnects right after the first answer streams out
+        partials.append(update)
+        cancel.set()
+
+    state = run_orchestrator(QUERY, on_partial=on_partial, cancel_event=cancel, max_agents=2, incremental=False)
+    assert state["partial"]
+    assert [output["agent"] for output in state["agent_outputs"]] == state["plan"]["agents"][:1]
+    assert [update["agent"] for update in partials] == state["plan"]["agents"][:1]
+    assert state["synthesis"] == "none"
+
+
+def test_full_synthesis_without_deadline(slow_llm):
+    slow_llm()
+    state, partials, _ = _run()
+    assert not state["partial"]
+    assert state["synthesis"] == "full"
+    assert "summary_max_tokens" not in state
+    assert partials[-1]["agent"] == "summarizer"
+
+
+def test_short_budget_shortens_the_summary(slow_llm, monkeypatch):
+    slow_llm()
+    monkeypatch.setattr(orchestrator, "SUMMARIZER_MIN_BUDGET_MS", 100)
+    monkeypatch.setattr(orchestrator, "SUMMARIZER_FULL_BUDGET_MS", 60_000)
+    state, partials, _ = _run(deadline=time.monotonic() + 5)
+
+    assert not state["partial"]
+    assert state["synthesis"] == "shortened"
+    assert state["summary_max_tokens"] == orchestrator.SHORT_SUMMARY_TOKENS
+    assert partials[-1]["agent"] == "summarizer"
+
+
+def test_too_little_budget_skips_the_summarizer(slow_llm, monkeypatch):
+    model = slow_llm()
+    monkeypatch.setattr(orchestrator, "SUMMARIZER_MIN_BUDGET_MS", 60_000)
+    state, partials, _ = _run(deadline=time.monotonic() + 5)
+
+    assert state["synthesis"] == "skipped" and state["partial"]
+    assert state["skipped_agents"] == []
+    assert model.calls == len(state["plan"]["agents"])
+    assert state["message"][-1].content == orchestrator.merge_agent_outputs(state["agent_outputs"])
+    assert all(update["agent"] != "summarizer" for update in partials)
+
+
+def test_deadline_during_synthesis_skips_it(slow_llm, monkeypatch):
+    slow_llm(script=[0.0, 0.0], delay_s=1.0)
+    monkeypatch.setattr(orchestrator, "SUMMARIZER_MIN_BUDGET_MS", 0)
+    monkeypatch.setattr(orchestrator, "SUMMARIZER_FULL_BUDGET_MS", 0)
+    state, _, elapsed = _run(deadline=time.monotonic() + 0.3)
+
+    assert elapsed < 0.8
+    assert len(state["agent_outputs"]) == 2
+    assert state["synthesis"] == "skipped" and state["partial"]
+    assert state["message"][-1].content == orchestrator.merge_agent_outputs(state["agent_outputs"])
@@ -0,0 +1,198 @@
+"""
+Internal document index
+"""
+import os
+import threading
+
+import pytest
+
+from database import doc_index
+from database.doc_index import INDEX_DIRNAME, InternalDocIndex, get_internal_doc_index
+
+
+def write(path, text, mtime=None):
+    path.write_text(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def docs(tmp_path):
+    write(tmp_path / "metformin.txt", "Metformin lowers glucose in type 2 diabetes. " * 5, mtime=1_000_000)
+    write(tmp_path / "oncology.md", "Pembrolizumab improves survival in melanoma and lung cancer.", mtime=1_000_000)
+    return tmp_path
+
+
+def files_found(index, query):
+    """Files of the ranked hits (trigram vectors give most chunks some score)"""
+    return [hit["file"] for hit in index.search(query)]
+
+
+def top_file(index, query):
+    return files_found(index, query)[0]
+
+
+def test_add_modify_delete(docs):
+    index = InternalDocIndex(str(docs))
+    stats = index.refresh()
+    assert (stats["added"], stats["updated"], stats["removed"]) == (2, 0, 0)
+    assert top_file(index, "melanoma") == "oncology.md"
+
+    write(docs / "metformin.txt", "Metformin reduces hepatic gluconeogenesis.", mtime=2_000_000)
+    write(docs / "sub.txt", "Atorvastatin lowers LDL cholesterol.")
+    stats = index.refresh()
+    assert (stats["added"], stats["updated"], stats["unchanged"]) == (1, 1, 1)
+    assert top_file(index, "gluconeogenesis") == "metformin.txt"
+    assert not any("diabetes" in chunk["text"] for chunk in index.chunks)
+    assert top_file(index, "cholesterol") == "sub.txt"
+
+    (docs / "oncology.md").unlink()
+    stats = index.refresh()
+    assert stats["removed"] == 1
+    assert "oncology.md" not in index.files
+    assert "oncology.md" not in files_found(index, "melanoma survival")
+    assert {chunk["file"] for chunk in index.chunks} == {"metformin.txt", "sub.txt"}
+    assert len(index.vectors) == len(index.chunks)
+
+
+def test_unchanged_refresh_keeps_the_index(docs, monkeypatch):
+    index = InternalDocIndex(str(docs))
+    index.refresh()
+    chunks, vectors = index.chunks, index.vectors
+    manifest = docs / INDEX_DIRNAME / "manifest.json"
+    saved_at = manifest.stat().st_mtime_ns
+
+    rebuilds = []
+    monkeypatch.setattr(doc_index, "_lexical_index", lambda chunks: rebuilds.append(1))
+    stats = index.refresh()
+
+    assert stats["unchanged"] == 2 and stats["chunks"] == len(chunks)
+    assert rebuilds == []
+    assert index.chunks is chunks and index.vectors is vectors
+    assert manifest.stat().st_mtime_ns == saved_at
+
+
+def test_restart_loads_the_persisted_index(docs, monkeypatch):
+    InternalDocIndex(str(docs)).refresh()
+
+    def fail(path):
+        raise AssertionError(f"re-parsed {path}")
+
+    monkeypatch.setattr(doc_index, "_extract_pages", fail)
+    index = InternalDocIndex(str(docs))
+    assert top_file(index, "melanoma") == "oncology.md"
+    assert index.refresh()["unchanged"] == 2
+
+
+def test_failed_parse_drops_old_chunks_and_is_not_retried(docs, monkeypatch):
+    index = InternalDocIndex(str(docs))
+    index.refresh()
+    assert top_file(index, "diabetes") == "metformin.txt"
+
+    original = doc_index._extract_pages
+    attempts = []
+
+    def extract(path):
+        if path.endswith("metformin.txt"):
+            attempts.append(path)
+            raise ValueError("corrupt file")
+        return original(path)
+
+    monkeypatch.setattr(doc_index, "_extract_pages", extract)
+    write(docs / "metformin.txt", "corrupted", mtime=3_000_000)
+
+    stats = index.refresh()
+    assert stats["failed"] == 1
+    assert index.files["metformin.txt"]["failed"] is True
+    assert "metformin.txt" not in files_found(index, "diabetes")
+    assert index.search_response("diabetes")["_metadata"]["search_completeness"].startswith("1 documents")
+
+    # Neither a refresh nor a restart retries the file at the same mtime and size
+    assert index.refresh()["unchanged"] == 2
+    assert InternalDocIndex(str(docs)).refresh()["unchanged"] == 2
+    assert len(attempts) == 1
+
+    monkeypatch.setattr(doc_index, "_extract_pages", original)
+    write(docs / "metformin.txt", "Metformin is first-line therapy for diabetes.", mtime=4_000_000)
+    stats = index.refresh()
+    assert stats["updated"] == 1
+    assert "failed" not in index.files["metformin.txt"]
+    assert top_file(index, "diabetes") == "metformin.txt"
+
+
+def test_search_ranking(tmp_path):
+    write(tmp_path / "dense.txt", "Semaglutide weight loss. Semaglutide dosing. Semaglutide obesity outcomes.")
+    write(tmp_path / "passing.txt", "Obesity guidelines mention semaglutide once among many other therapies "
+                                    "including lifestyle changes, surgery, orlistat and phentermine.")
+    write(tmp_path / "unrelated.txt", "Warfarin anticoagulation requires INR monitoring.")
+    index = InternalDocIndex(str(tmp_path))
+    index.refresh()
+
+    hits = index.search("semaglutide")
+    assert [hit["file"] for hit in hits[:2]] == ["dense.txt", "passing.txt"]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert all(hit["file"] != "unrelated.txt" or hit["score"] < hits[1]["score"] for hit in hits)
+    # Trigram vectors still match a misspelled query with no exact token
+    assert index.search("warfarine anticoagulant")[0]["file"] == "unrelated.txt"
+    assert index.search("semaglutide", top_k=1)[0]["file"] == "dense.txt"
+
+    response = index.search_response("INR monitoring")
+    assert response["relevant_documents"][0]["filename"] == "unrelated.txt"
+    assert "INR monitoring" in response["relevant_documents"][0]["excerpt"]
+    assert response["key_insights"][0]["source"] == "unrelated.txt, Page 1"
+
+
+def test_empty_index_search(tmp_path):
+    index = InternalDocIndex(str(tmp_path))
+    assert index.search("anything") == []
+    assert index.refresh()["chunks"] == 0
+    assert index.search("anything") == []
+
+
+@pytest.fixture
+def shared_index(docs, monkeypatch):
+    monkeypatch.setenv("INTERNAL_DOCS_DIR", str(docs))
+    monkeypatch.setattr(doc_index, "_index", None)
+    yield docs
+    index = doc_index._index
+    if index is not None and index._refresh_thread is not None:
+        index._refresh_thread.join(5)
+
+
+def test_shared_index_refreshes_in_the_background(shared_index, monkeypatch):
+    index = get_internal_doc_index()
+    assert top_file(index, "melanoma") == "oncology.md"
+    assert index._refresh_thread is None
+
+    original = doc_index._extract_pages
+    release = threading.Event()
+    parsing = threading.Event()
+
+    def slow_extract(path):
+        parsing.set()
+        release.wait(5)
+        return original(path)
+
+    monkeypatch.setattr(doc_index, "_extract_pages", slow_extract)
+    write(shared_index / "new.txt", "Tirzepatide trial results.")
+    index._last_refresh = 0.0
+
+    # The request path returns at once and keeps serving the previous index
+    assert get_internal_doc_index() is index
+    assert parsing.wait(5)
+    assert "new.txt" not in files_found(index, "tirzepatide")
+    assert index.search_response("melanoma")["relevant_documents"][0]["filename"] == "oncology.md"
+    # A second stale call does not start another refresh
+    assert index.refresh_if_stale(wait=False) is False
+
+    release.set()
+    index._refresh_thread.join(5)
+    assert top_file(index, "tirzepatide") == "new.txt"
+    assert index.refresh_if_stale(wait=False) is False
+
+
+def test_shared_index_unset_or_missing(monkeypatch, tmp_path):
+    monkeypatch.delenv("INTERNAL_DOCS_DIR", raising=False)
+    assert get_internal_doc_index() is None
+    monkeypatch.setenv("INTERNAL_DOCS_DIR", str(tmp_path / "missing"))
+    assert get_internal_doc_index() is None
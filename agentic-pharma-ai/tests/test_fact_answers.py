@@ -0,0 +1,71 @@
+"""
+Fact fast path: which questions are answered straight from the database
+"""
+import pytest
+
+from orchestrator import run_orchestrator
+from services.fact_answers import answer_fact, fast_path_stats
+
+
+@pytest.mark.parametrize("query, entity, field", [
+    ("When does US10234567 expire?", "US10234567", "expiration_date"),
+    ("Who is the assignee of US 11,123,456?", "US11123456", "assignee"),
+    ("Is BLA-256789 under REMS?", "BLA-256789", "rems_required"),
+    ("What is the status of NDA 207524?", "NDA-207524", "status"),
+    ("Is NDA-207524 approved?", "NDA-207524", "status"),
+    # Regression: "approved for" asks for the indication, not the status
+    ("What is NDA-207524 approved for?", "NDA-207524", "indication"),
+    ("Is NDA-207524 approved to treat type 2 diabetes?", "NDA-207524", "indication"),
+    ("What is the dosage for NDA-207524?", "NDA-207524", "dosage"),
+    ("Who manufactures nda-207892?", "NDA-207892", "manufacturer"),
+])
+def test_single_field_questions_about_an_id_are_answered(query, entity, field):
+    fact = answer_fact(query)
+    assert fact is not None
+    assert (fact["entity"], fact["field"]) == (entity, field)
+
+
+@pytest.mark.parametrize("query", [
+    # No explicit patent or application id
+    "What are the clinical trials and FDA approval status for Cancer Drug XYZ?",
+    "What is the patent status of Cancer Drug XYZ?",
+    "status of the clinical trials for DTZ-100",
+    "Is Cancer Drug XYZ approved in Europe?",
+    "What dose was used in the Phase 3 trial of DTZ-100?",
+    "What side effects were reported in published studies of DTZ-100?",
+    # An id, but the question reaches outside the record
+    "What is the patent status of NDA-207524?",
+    "Status of the clinical trials for NDA-207524",
+    "Is NDA-207524 approved in Europe?",
+    "What dose was used in the Phase 3 trial behind NDA-207524?",
+    "What side effects of NDA-207524 were reported in published studies?",
+    "Is US10234567 still active after FDA approval?",
+    # More than one thing, or analysis
+    "What is the status and expiration of US10234567?",
+    "When was NDA-207524 submitted? Is it approved?",
+    "Who is the assignee of US10234567 and US10567890?",
+    "Why does US10234567 expire in 2035?",
+    # Unknown id
+    "When does US12345678 expire?",
+])
+def test_questions_beyond_one_field_of_one_record_take_the_agent_path(query):
+    assert answer_fact(query) is None
+
+
+def test_misses_count_towards_the_hit_rate():
+    before = fast_path_stats()
+    answer_fact("What is the patent status of Cancer Drug XYZ?")
+    answer_fact("When does US10234567 expire?")
+    after = fast_path_stats()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_orchestrator_uses_the_fast_path_only_for_fact_questions(fresh_agent_stats):
+    fact = run_orchestrator("When does US10234567 expire?")
+    assert fact["fast_path"] == {"agent": "patent", "entity": "US10234567", "field": "expiration_date"}
+    assert [output["agent"] for output in fact["agent_outputs"]] == ["patent"]
+
+    question = run_orchestrator("What are the clinical trials and FDA approval status for Cancer Drug XYZ?")
+    assert not question.get("fast_path")
+    assert len(question["agent_outputs"]) >= 2
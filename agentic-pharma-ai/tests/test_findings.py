@@ -0,0 +1,83 @@
+"""
+Structured findings: parsing, merge decision and deterministic merge
+"""
+import json
+
+import orchestrator
+from services.findings import merge_findings, needs_synthesis, parse_finding, render_finding
+from tools.lookup_cache import shared_lookups
+
+
+def _finding(**overrides):
+    return {"summary": "DTZ-100 is approved.", "key_facts": [], "risks": [], "cited_ids": [],
+            "confidence": 0.9, **overrides}
+
+
+def test_parse_finding_keeps_only_retrieved_ids():
+    reply = "Here you go:\n```json\n" + json.dumps(_finding(
+        key_facts=["Approved 2020-09-14"], cited_ids=["nda-207892", "NDA-999999", "NDA-207892", "NCT01234567"]
+    )) + "\n```"
+    finding = parse_finding(reply, ["NDA-207892", "US10567890", None])
+    assert finding.summary == "DTZ-100 is approved."
+    # Matched case-insensitively, normalized to the retrieved form, deduplicated
+    assert finding.cited_ids == ["NDA-207892"]
+
+
+def test_parse_finding_rejects_invalid_replies():
+    assert parse_finding("DTZ-100 is approved.") is None
+    assert parse_finding("{not json}") is None
+    assert parse_finding(json.dumps({"summary": "x"})) is None  # missing confidence
+    assert parse_finding(json.dumps(_finding(confidence=1.5))) is None
+    assert parse_finding(json.dumps(_finding(summary=""))) is None
+    assert parse_finding(None) is None
+
+
+def test_render_finding_lists_facts_risks_and_sources():
+    finding = parse_finding(json.dumps(_finding(key_facts=["fact"], risks=["risk"], cited_ids=["NDA-207892"])),
+                            ["NDA-207892"])
+    text = render_finding(finding)
+    assert "- fact" in text and "Risks:\n- risk" in text and text.endswith("Sources: NDA-207892")
+
+
+def test_needs_synthesis_reasons():
+    query = "What are the trials and patents for DTZ-100?"
+    assert needs_synthesis(query, [_finding(), _finding()]) is None
+    assert needs_synthesis(query, [_finding(), None]) == "unstructured"
+    assert needs_synthesis(query, [_finding(), _finding(confidence=0.4)]) == "low_confidence"
+    assert needs_synthesis("Compare the trials and patents for DTZ-100", [_finding()]) == "question"
+    assert needs_synthesis("Should we license DTZ-100?", [_finding()]) == "question"
+
+
+def test_merge_findings_deduplicates_risks_and_sources():
+    merged = merge_findings([
+        {"agent": "clinical_trials", "finding": _finding(
+            summary="Phase 3 ongoing.", key_facts=["NCT05123456 enrolling"], risks=["Hypoglycemia"],
+            cited_ids=["NCT05123456"], confidence=0.8)},
+        {"agent": "regulatory", "finding": _finding(
+            summary="Approved.", risks=["Hypoglycemia", "Pancreatitis"], cited_ids=["NDA-207892", "NCT05123456"],
+            confidence=0.7)},
+    ])
+    assert merged.index("## Clinical Trials") < merged.index("## Regulatory")
+    assert "- NCT05123456 enrolling" in merged
+    assert merged.count("Hypoglycemia") == 1
+    assert "## Risks\n\n- Hypoglycemia\n- Pancreatitis" in merged
+    assert "Sources: NCT05123456, NDA-207892" in merged
+    assert merged.endswith("Confidence: 0.70")
+
+
+def test_orchestrator_merges_structured_findings_without_the_summarizer(monkeypatch, fresh_agent_stats):
+    monkeypatch.setattr(orchestrator, "STRUCTURED_FINDINGS", True)
+    with shared_lookups():
+        state = orchestrator.run_orchestrator("What are the clinical trials and patents for DTZ-100?")
+    outputs = state["agent_outputs"]
+    assert len(outputs) >= 2
+    assert all(output["finding"] is not None for output in outputs)
+    assert state["synthesis"] == "merged"
+    assert "summarizer" not in [stage.get("agent") for stage in state["timings"]["stages"]]
+    assert state["message"][-1].content.startswith("## ")
+
+
+def test_orchestrator_summarizes_questions_asking_for_judgement(monkeypatch, fresh_agent_stats):
+    monkeypatch.setattr(orchestrator, "STRUCTURED_FINDINGS", True)
+    state = orchestrator.run_orchestrator("Compare the clinical trials and patents for DTZ-100")
+    assert state["synthesis"] != "merged"
@@ -0,0 +1,110 @@
+"""
+Async data source gateway
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from database.gateway import DEFAULT_SOURCES, DataSourceGateway, SourceConfig, SourceError
+
+FAST = SourceConfig(timeout_s=1.0, retries=0, backoff_base_s=0.001, backoff_max_s=0.001)
+
+
+def test_semaphore_bounds_concurrent_calls_per_source():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def source(arg):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.03)
+        with lock:
+            state["active"] -= 1
+        return {"arg": arg}
+
+    config = SourceConfig(timeout_s=5.0, max_concurrency=2, retries=0)
+    gateway = DataSourceGateway(sources={"slow": source}, default_config=config)
+
+    async def run():
+        return await asyncio.gather(*(gateway.fetch("slow", str(i)) for i in range(6)))
+
+    results = asyncio.run(run())
+    assert [result["arg"] for result in results] == [str(i) for i in range(6)]
+    assert state["peak"] == 2
+
+
+def test_per_source_timeout():
+    configs = {"slow": SourceConfig(timeout_s=0.05, retries=0, latency_ms=500)}
+    gateway = DataSourceGateway(sources={"slow": lambda arg: {}, "fast": lambda arg: {"ok": True}},
+                                configs=configs, default_config=FAST)
+
+    async def run():
+        started = time.perf_counter()
+        with pytest.raises(SourceError, match="timed out after 0.05s"):
+            await gateway.fetch("slow", "x")
+        elapsed = time.perf_counter() - started
+        return elapsed, await gateway.fetch("fast", "x")
+
+    elapsed, fast = asyncio.run(run())
+    assert elapsed < 0.4
+    assert fast == {"ok": True}
+
+
+def test_retries_until_a_call_succeeds():
+    attempts = []
+
+    def flaky(arg):
+        attempts.append(arg)
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+        return {"attempt": len(attempts)}
+
+    config = SourceConfig(retries=2, backoff_base_s=0.001, backoff_max_s=0.001)
+    gateway = DataSourceGateway(sources={"flaky": flaky}, default_config=config, seed=1)
+    assert asyncio.run(gateway.fetch("flaky", "x")) == {"attempt": 3}
+
+    attempts.clear()
+    gateway = DataSourceGateway(sources={"flaky": flaky},
+                                default_config=SourceConfig(retries=1, backoff_base_s=0.001), seed=1)
+    with pytest.raises(SourceError, match="failed after 2 attempts: reset"):
+        asyncio.run(gateway.fetch("flaky", "x"))
+
+
+def test_unknown_source():
+    with pytest.raises(ValueError):
+        asyncio.run(DataSourceGateway(sources={}).fetch("nope", "x"))
+
+
+def test_partial_failure_reports_errors_per_source():
+    def broken(arg):
+        raise RuntimeError("upstream 503")
+
+    sources = {"ok": lambda arg: {"molecule": arg}, "broken": broken, "slow": lambda arg: {}}
+    configs = {"slow": SourceConfig(timeout_s=0.05, retries=0, latency_ms=500)}
+    gateway = DataSourceGateway(sources=sources, configs=configs, default_config=FAST)
+
+    result = asyncio.run(gateway.search_molecule("Metformin"))
+
+    assert result["molecule"] == "Metformin"
+    assert result["sources"] == {"ok": {"molecule": "Metformin"}}
+    assert set(result["errors"]) == {"broken", "slow"}
+    assert "upstream 503" in result["errors"]["broken"]
+    assert "timed out" in result["errors"]["slow"]
+    assert set(result["timings_ms"]) == set(sources)
+    assert result["total_ms"] < 400
+
+
+def test_simulated_errors_with_default_sources():
+    config = SourceConfig(retries=0, error_rate=1.0)
+    gateway = DataSourceGateway(default_config=config, seed=0)
+    result = asyncio.run(gateway.search_molecule("Metformin"))
+    assert result["sources"] == {}
+    assert set(result["errors"]) == set(DEFAULT_SOURCES)
+
+    gateway = DataSourceGateway(default_config=FAST)
+    result = asyncio.run(gateway.search_molecule("Metformin"))
+    assert set(result["sources"]) == set(DEFAULT_SOURCES)
+    assert result["sources"]["iqvia"]["molecule"] == "Metformin"
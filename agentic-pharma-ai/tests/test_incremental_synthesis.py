@@ -0,0 +1,73 @@
+"""
+Incremental synthesis: the draft is revised as specialists finish
+"""
+import pytest
+from langchain_core.messages import AIMessage
+
+import orchestrator
+from agents import summarizer_agent
+
+QUERY = "What are the clinical trials and patents for DTZ-100?"
+
+
+def test_each_step_revises_the_whole_draft(monkeypatch):
+    steps = []
+
+    def revise(query, draft, outputs, max_tokens=None):
+        steps.append({"draft": draft, "agents": [o["agent"] for o in outputs], "max_tokens": max_tokens})
+        return AIMessage(content=f"Report covering {len(steps)} step(s)")
+
+    monkeypatch.setattr(summarizer_agent, "summarize_increment", revise)
+    drafts = []
+    synthesizer = orchestrator.IncrementalSynthesizer(QUERY, on_draft=drafts.append)
+    synthesizer.add({"agent": "clinical_trials", "response": "DTZ-100 is in Phase 3."})
+    synthesizer.finish()
+    synthesizer.add({"agent": "patent", "response": "US10567890 expires in 2037."})
+    final = synthesizer.finish()
+
+    # The second step sees the first draft, and its result replaces it
+    assert steps[0]["draft"] == "" and steps[1]["draft"] == "Report covering 1 step(s)"
+    assert final.content == "Report covering 2 step(s)"
+    # The budget grows with the specialists the report covers
+    assert steps[1]["max_tokens"] == 2 * orchestrator.INCREMENT_TOKENS_PER_OUTPUT
+    assert drafts[-1] == {"agent": "summarizer", "response": final.content, "draft": True,
+                          "agents": ["clinical_trials", "patent"]}
+
+
+def test_incremental_run_returns_the_revised_draft(fresh_agent_stats):
+    partials = []
+    state = orchestrator.run_orchestrator(QUERY, on_partial=partials.append, incremental=True)
+    assert state["synthesis"] == "incremental"
+    drafts = [p for p in partials if p.get("draft")]
+    assert drafts and drafts[-1]["agents"] == state["plan"]["agents"]
+    assert state["message"][-1].content == drafts[-1]["response"]
+
+
+def _failing_step(query, draft, outputs, max_tokens=None):
+    raise RuntimeError("summarizer returned malformed output")
+
+
+def test_failed_step_is_raised_and_starts_no_more_steps(monkeypatch):
+    monkeypatch.setattr(summarizer_agent, "summarize_increment", _failing_step)
+    synthesizer = orchestrator.IncrementalSynthesizer(QUERY)
+    synthesizer.add({"agent": "clinical_trials", "response": "DTZ-100 is in Phase 3."})
+    with pytest.raises(RuntimeError):
+        synthesizer.finish()
+    assert synthesizer._future is None
+
+    synthesizer.add({"agent": "patent", "response": "US10567890 expires in 2037."})
+    assert synthesizer._future is None
+    with pytest.raises(RuntimeError):
+        synthesizer.finish()
+
+
+def test_failed_increment_falls_back_to_the_full_synthesis(monkeypatch, fresh_agent_stats):
+    monkeypatch.setattr(summarizer_agent, "summarize_increment", _failing_step)
+    partials = []
+    state = orchestrator.run_orchestrator(QUERY, on_partial=partials.append, incremental=True)
+
+    assert state["synthesis"] == "full"
+    assert not state["partial"] and not state["degraded"]
+    assert not any(p.get("draft") for p in partials)
+    assert partials[-1]["agent"] == "summarizer"
+    assert state["message"][-1].content == partials[-1]["response"]
@@ -0,0 +1,111 @@
+"""
+Background job queue
+"""
+import asyncio
+import sqlite3
+
+import app as app_module
+from services.job_queue import JobQueue
+
+
+REQUEST = {"query": "Compare clinical trials and patents for DTZ-100", "max_agents": 1,
+           "deadline_ms": 30000, "token_budget": 5000, "include_timings": True}
+
+
+async def _wait(queue, job_id):
+    while queue.get(job_id)["status"] in ("queued", "running"):
+        await asyncio.sleep(0.01)
+    return queue.get(job_id)
+
+
+def test_database_is_created_on_first_use(tmp_path):
+    db_path = tmp_path / "jobs" / "jobs.sqlite3"
+    queue = JobQueue(runner=lambda request, on_partial: {}, db_path=str(db_path))
+    assert not db_path.exists()
+    assert queue.get("missing") is None
+    assert db_path.exists()
+
+
+def test_runner_receives_the_whole_request(tmp_path):
+    received = []
+
+    def runner(request, on_partial):
+        received.append(request)
+        on_partial({"agent": "clinical_trials", "response": "..."})
+        return {"answer": request["query"]}
+
+    async def run():
+        queue = JobQueue(runner=runner, db_path=str(tmp_path / "jobs.sqlite3"), workers=1)
+        await queue.start()
+        try:
+            return await _wait(queue, queue.submit(REQUEST))
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(run())
+    assert received == [REQUEST]
+    assert job["status"] == "completed" and job["query"] == REQUEST["query"]
+    assert job["result"] == {"answer": REQUEST["query"]}
+    assert job["partial_results"] == [{"agent": "clinical_trials", "response": "..."}]
+
+
+def test_unfinished_jobs_keep_their_options_across_restarts(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    received = []
+
+    async def run():
+        first = JobQueue(runner=lambda request, on_partial: {}, db_path=db_path, workers=0)
+        await first.start()
+        job_id = first.submit(REQUEST)
+        await first.stop()
+
+        second = JobQueue(runner=lambda request, on_partial: received.append(request) or {},
+                          db_path=db_path, workers=1)
+        await second.start()
+        try:
+            return await _wait(second, job_id)
+        finally:
+            await second.stop()
+
+    job = asyncio.run(run())
+    assert job["status"] == "completed"
+    assert received == [REQUEST]
+
+
+def test_jobs_created_before_options_were_stored_still_run(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    db = sqlite3.connect(db_path)
+    db.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, query TEXT NOT NULL, status TEXT NOT NULL, "
+               "created_at REAL NOT NULL, started_at REAL, finished_at REAL, partial_results BLOB, "
+               "result BLOB, error TEXT)")
+    db.execute("INSERT INTO jobs (id, query, status, created_at) VALUES ('old', 'DTZ-100 trials', 'queued', 0)")
+    db.commit()
+    db.close()
+    received = []
+
+    async def run():
+        queue = JobQueue(runner=lambda request, on_partial: received.append(request) or {},
+                         db_path=db_path, workers=1)
+        await queue.start()
+        try:
+            return await _wait(queue, "old")
+        finally:
+            await queue.stop()
+
+    assert asyncio.run(run())["status"] == "completed"
+    assert received == [{"query": "DTZ-100 trials"}]
+
+
+def test_job_runner_applies_plan_limits(monkeypatch):
+    calls = []
+
+    def fake_run(query, on_partial=None, deadline=None, cancel_event=None, max_agents=None, token_budget=None):
+        calls.append({"query": query, "deadline": deadline, "max_agents": max_agents,
+                      "token_budget": token_budget})
+        return app_module.initialize_state(query)
+
+    monkeypatch.setattr(app_module, "run_orchestrator", fake_run)
+    result = app_module._run_job(REQUEST, on_partial=lambda item: None)
+    assert calls[0]["max_agents"] == 1 and calls[0]["token_budget"] == 5000
+    assert calls[0]["deadline"] is not None
+    assert result["query"] == REQUEST["query"]
@@ -0,0 +1,86 @@
+"""
+LLM hedging: hedge races, loser cancellation and the hedge rate cap
+"""
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from conftest import ScriptedChatModel
+from services.llm_hedging import HEDGE_BURST, HedgedChatModel
+
+MESSAGES = [HumanMessage(content="DTZ-100 is approved for type 2 diabetes.")]
+
+
+def _hedged(inner, **settings):
+    model = HedgedChatModel(inner=inner, role="test", min_samples=1, min_delay_ms=20, **settings)
+    model._record(10.0)  # one observed latency, so the hedge delay is min_delay_ms
+    return model
+
+
+def _wait_for(condition, timeout_s=5.0):
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.005)
+
+
+def test_no_hedging_until_latencies_are_observed():
+    inner = ScriptedChatModel()
+    model = HedgedChatModel(inner=inner, min_samples=5)
+    assert model.hedge_delay_ms() is None
+    assert model.invoke(MESSAGES).response_metadata["hedge"] == "not_needed"
+    assert inner.calls == 1
+
+
+def test_fast_primary_is_not_hedged():
+    inner = ScriptedChatModel()
+    result = _hedged(inner).invoke(MESSAGES)
+    assert result.response_metadata["hedge"] == "not_needed"
+    assert inner.calls == 1
+
+
+def test_hedge_wins_over_a_slow_primary_and_the_primary_is_cancelled():
+    inner = ScriptedChatModel(script=[0.5, 0])
+    started = time.perf_counter()
+    result = _hedged(inner).invoke(MESSAGES)
+    elapsed = time.perf_counter() - started
+
+    assert result.response_metadata["hedge"] == "hedge_won"
+    assert "DTZ-100" in result.content
+    assert elapsed < 0.4
+    # The primary loses its first-token race and its stream is closed
+    _wait_for(lambda: inner.cancelled == 1)
+    assert inner.calls == 2
+
+
+def test_primary_can_still_win_after_a_hedge():
+    inner = ScriptedChatModel(script=[0.05, 0.5])
+    result = _hedged(inner).invoke(MESSAGES)
+    assert result.response_metadata["hedge"] == "primary_won"
+    _wait_for(lambda: inner.cancelled == 1)
+
+
+def test_hedge_rate_is_capped():
+    inner = ScriptedChatModel(delay_s=0.04)
+    # percentile 0 keeps the hedge delay at min_delay_ms as slow latencies are observed
+    model = _hedged(inner, max_hedge_rate=0.0, percentile=0)
+    outcomes = [model.invoke(MESSAGES).response_metadata["hedge"] for _ in range(int(HEDGE_BURST) + 3)]
+    hedged = [o for o in outcomes if o in ("hedge_won", "primary_won")]
+    assert len(hedged) == HEDGE_BURST
+    assert outcomes[-3:] == ["throttled"] * 3
+
+
+def test_hedge_credits_are_earned_per_call():
+    model = _hedged(ScriptedChatModel(), max_hedge_rate=0.5)
+    model._credits = 0.0
+    assert not model._take_credit()
+    model._record(10.0)
+    model._record(10.0)
+    assert model._take_credit()
+
+
+def test_attempt_error_is_raised():
+    inner = ScriptedChatModel(script=[ValueError("provider down")])
+    with pytest.raises(ValueError, match="provider down"):
+        _hedged(inner).invoke(MESSAGES)
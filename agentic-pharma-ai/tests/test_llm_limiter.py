@@ -0,0 +1,124 @@
+"""
+LLM rate limiter: AIMD concurrency, token bucket and fair queueing
+"""
+import threading
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from conftest import RateLimitError, ScriptedChatModel
+from services.llm_limiter import LLMRateLimiter, RateLimitedChatModel
+
+
+def _limiter(**config):
+    return LLMRateLimiter({"enabled": True, "tokens_per_minute": 1_000_000, **config})
+
+
+def test_success_grows_the_limit_additively():
+    limiter = _limiter(initial_concurrency=4)
+    limiter.release(limiter.acquire(10), 10, latency_ms=50)
+    assert limiter.limit == pytest.approx(4.25)
+
+
+def test_rate_limit_halves_the_limit_down_to_the_minimum():
+    limiter = _limiter(initial_concurrency=8, min_concurrency=2)
+    limiter.release(limiter.acquire(10), None, latency_ms=50, rate_limited=True)
+    assert limiter.limit == 4
+    for _ in range(3):
+        limiter.release(limiter.acquire(10), None, latency_ms=50, rate_limited=True)
+    assert limiter.limit == 2
+    assert limiter.counters["rate_limited"] == 4
+
+
+def test_slow_calls_shrink_the_limit():
+    limiter = _limiter(initial_concurrency=10, latency_target_ms=100)
+    limiter.release(limiter.acquire(10), 10, latency_ms=250)
+    assert limiter.limit == pytest.approx(9)
+    assert limiter.counters["latency_backoffs"] == 1
+
+
+def test_users_are_served_round_robin():
+    limiter = _limiter(initial_concurrency=1, max_concurrency=1)
+    holder = limiter.acquire(10, user="holder")
+    granted = []
+
+    def call(user):
+        ticket = limiter.acquire(10, user=user)
+        granted.append(user)
+        limiter.release(ticket, 10, latency_ms=1)
+
+    threads = []
+    for user in ["heavy", "heavy", "heavy", "light"]:
+        queued = limiter.stats()["queued"]
+        threads.append(threading.Thread(target=call, args=(user,)))
+        threads[-1].start()
+        while limiter.stats()["queued"] == queued:
+            time.sleep(0.001)
+
+    limiter.release(holder, 10, latency_ms=1)
+    for thread in threads:
+        thread.join(5)
+    # The light user is not stuck behind the heavy user's whole backlog
+    assert granted == ["heavy", "light", "heavy", "heavy"]
+
+
+def test_calls_wait_for_the_token_bucket_to_refill():
+    limiter = _limiter(tokens_per_minute=6000)
+    limiter.release(limiter.acquire(6000), 6000, latency_ms=1)
+    started = time.monotonic()
+    limiter.release(limiter.acquire(20), 20, latency_ms=1)
+    # 20 tokens at 100 tokens/s
+    assert time.monotonic() - started >= 0.15
+    assert limiter.tokens_last_minute() == 6020
+
+
+def test_queue_timeout_raises():
+    limiter = _limiter(tokens_per_minute=6000, queue_timeout_s=0.05)
+    limiter.acquire(6000)
+    with pytest.raises(TimeoutError):
+        limiter.acquire(6000)
+    assert limiter.counters["timeouts"] == 1
+    assert limiter.stats()["queued"] == 0
+
+
+def _model(inner, limiter, max_retries=3):
+    return RateLimitedChatModel(inner=inner, limiter=limiter, max_retries=max_retries, backoff_base_s=0.001)
+
+
+def test_429_is_retried_and_halves_the_limit():
+    limiter = _limiter(initial_concurrency=8)
+    inner = ScriptedChatModel(script=[RateLimitError("slow down")])
+    result = _model(inner, limiter).invoke([HumanMessage(content="DTZ-100 is approved.")])
+    assert result.content
+    assert inner.calls == 2
+    assert limiter.counters["rate_limited"] == 1
+    # Halved by the 429, then +1/limit for the successful retry
+    assert limiter.limit == pytest.approx(4.25)
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_429_retries_are_bounded():
+    limiter = _limiter()
+    inner = ScriptedChatModel(script=[RateLimitError("slow down")] * 5)
+    with pytest.raises(RateLimitError):
+        _model(inner, limiter, max_retries=2).invoke([HumanMessage(content="DTZ-100")])
+    assert inner.calls == 3
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_other_errors_are_not_retried():
+    limiter = _limiter()
+    inner = ScriptedChatModel(script=[ValueError("bad request")])
+    with pytest.raises(ValueError):
+        _model(inner, limiter).invoke([HumanMessage(content="DTZ-100")])
+    assert inner.calls == 1
+    assert limiter.counters["rate_limited"] == 0
+
+
+def test_streamed_429_is_retried_before_the_first_chunk():
+    limiter = _limiter()
+    inner = ScriptedChatModel(script=[RateLimitError("slow down")])
+    chunks = list(_model(inner, limiter).stream([HumanMessage(content="DTZ-100 is approved.")]))
+    assert "".join(chunk.content for chunk in chunks).strip()
+    assert inner.calls == 2 and limiter.counters["rate_limited"] == 1
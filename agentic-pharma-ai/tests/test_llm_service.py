@@ -0,0 +1,156 @@
+"""
+LLM provider registry, per-role configuration and the stub model
+"""
+import json
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from services import llm_service
+from services.circuit_breaker import CircuitBreakerChatModel
+from services.llm_limiter import RateLimitedChatModel
+from services.llm_service import create_llm, get_llm, load_llm_config, role_config
+from services.stub_llm import StubChatModel
+
+MESSAGES = [
+    SystemMessage(content="You are a regulatory analyst."),
+    HumanMessage(content="DTZ-100 was approved under NDA-207524. The label carries a boxed warning. "
+                         "Post-marketing studies are ongoing."),
+]
+
+
+@pytest.fixture
+def llm_config(tmp_path, monkeypatch):
+    """Load an `llm` config section as the service's active configuration"""
+    def load(text: str):
+        path = tmp_path / "llm.yaml"
+        path.write_text(text)
+        llm_service.reset_llm()
+        monkeypatch.setattr(llm_service, "_config", load_llm_config(str(path)))
+        return llm_service._config
+
+    yield load
+    llm_service.reset_llm()
+
+
+def test_missing_config_uses_defaults(tmp_path):
+    config = load_llm_config(str(tmp_path / "missing.yaml"))
+    assert config["provider"] == "openai" and config["model"] == "gpt-5-nano"
+    assert config["roles"] == {} and config["cascade"] == {}
+
+
+def test_environment_overrides(tmp_path, monkeypatch):
+    path = tmp_path / "llm.yaml"
+    path.write_text("llm:\n  provider: stub\n  model: base\n  roles:\n    router:\n      model: small\n"
+                    "  cascade:\n    enabled: false\n")
+    monkeypatch.setenv("LLM_MODEL", "env-model")
+    monkeypatch.setenv("LLM_SUMMARIZER_MODEL", "env-summarizer")
+    monkeypatch.setenv("LLM_CASCADE", "1")
+    monkeypatch.setenv("LLM_TOKENS_PER_MINUTE", "5000")
+
+    config = load_llm_config(str(path))
+    assert config["provider"] == "stub" and config["model"] == "env-model"
+    assert config["roles"] == {"router": {"model": "small"}, "summarizer": {"model": "env-summarizer"}}
+    assert config["cascade"]["enabled"] is True
+    assert config["limiter"] == {"enabled": True, "tokens_per_minute": 5000}
+
+
+def test_role_config_applies_role_overrides():
+    config = {"provider": "stub", "model": "base", "temperature": 0,
+              "roles": {"summarizer": {"model": "large"}}, "cascade": {"enabled": True}}
+    assert role_config(config, None) == {"provider": "stub", "model": "base", "temperature": 0}
+    assert role_config(config, "summarizer")["model"] == "large"
+    assert role_config(config, "router")["model"] == "base"
+
+
+def test_provider_selection():
+    stub = create_llm({"provider": "stub", "stub": {"seed": 3, "sleep": False}})
+    assert isinstance(stub, StubChatModel) and stub.seed == 3
+
+    compatible = create_llm({"provider": "openai_compatible", "model": "local", "base_url": "http://127.0.0.1:9/v1"})
+    assert type(compatible).__name__ == "ChatOpenAI"
+    assert compatible.model_name == "local"
+    assert str(compatible.openai_api_base) == "http://127.0.0.1:9/v1"
+
+    limited = create_llm({"provider": "stub", "stub": {"sleep": False}}, {"enabled": True, "max_retries": 1})
+    assert isinstance(limited, RateLimitedChatModel) and isinstance(limited.inner, StubChatModel)
+    assert limited.max_retries == 1
+    llm_service.reset_llm()
+
+
+def test_registered_provider(monkeypatch):
+    built = []
+
+    def factory(config):
+        built.append(config)
+        return StubChatModel(sleep=False)
+
+    monkeypatch.setitem(llm_service._providers, "custom", factory)
+    assert isinstance(create_llm({"provider": "custom", "model": "m"}), StubChatModel)
+    assert built == [{"provider": "custom", "model": "m"}]
+
+
+def test_unknown_provider_raises():
+    with pytest.raises(ValueError, match=r"Unknown LLM provider: nope \(available: .*stub"):
+        create_llm({"provider": "nope"})
+
+
+def test_openai_compatible_requires_base_url():
+    with pytest.raises(ValueError, match="base_url"):
+        create_llm({"provider": "openai_compatible", "model": "local"})
+
+
+def test_get_llm_builds_one_model_per_role(llm_config):
+    llm_config("llm:\n  provider: stub\n  stub:\n    sleep: false\n"
+               "  roles:\n    summarizer:\n      stub:\n        seed: 7\n        sleep: false\n")
+
+    summarizer = get_llm("summarizer")
+    assert get_llm("summarizer") is summarizer
+    assert isinstance(summarizer, CircuitBreakerChatModel)
+    assert summarizer.inner.seed == 7
+    assert get_llm("router").inner.seed == 0
+    assert get_llm() is not get_llm("router")
+
+    llm_service.reset_llm()
+    assert llm_service._clients == {}
+
+
+def test_unknown_provider_in_config_fails_on_first_use(llm_config):
+    llm_config("llm:\n  provider: stub\n  roles:\n    router:\n      provider: nope\n")
+    with pytest.raises(ValueError, match="Unknown LLM provider: nope"):
+        get_llm("router")
+    assert isinstance(get_llm("specialist").inner, StubChatModel)
+
+
+def test_stub_output_is_deterministic():
+    first = StubChatModel(sleep=False).invoke(MESSAGES)
+    second = StubChatModel(sleep=False).invoke(MESSAGES)
+    assert first.content == second.content
+    assert first.usage_metadata == second.usage_metadata
+    assert first.response_metadata == second.response_metadata
+    # The reply extracts the non-system content
+    assert first.content.startswith("DTZ-100 was approved under NDA-207524.")
+    assert "regulatory analyst" not in first.content
+
+    reseeded = StubChatModel(sleep=False, seed=1).invoke(MESSAGES)
+    assert reseeded.content == first.content
+    assert reseeded.response_metadata["simulated_latency_ms"] != first.response_metadata["simulated_latency_ms"]
+
+
+def test_stub_respects_max_tokens_and_streams_the_same_reply():
+    model = StubChatModel(sleep=False)
+    short = model.invoke(MESSAGES, max_tokens=12)
+    assert short.usage_metadata["output_tokens"] <= 12
+    assert short.content == "DTZ-100 was approved under NDA-207524."
+
+    streamed = "".join(chunk.content for chunk in model.stream(MESSAGES))
+    assert streamed == model.invoke(MESSAGES).content
+
+
+def test_stub_json_mode_returns_a_finding():
+    reply = StubChatModel(sleep=False).invoke(MESSAGES, response_format={"type": "json_object"})
+    finding = json.loads(reply.content)
+    assert finding["summary"] == "DTZ-100 was approved under NDA-207524."
+    assert "NDA-207524" in finding["cited_ids"]
+    assert finding["risks"] == ["The label carries a boxed warning."]
+    assert 0.7 <= finding["confidence"] <= 1.0
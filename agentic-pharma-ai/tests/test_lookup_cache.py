@@ -0,0 +1,72 @@
+"""
+Shared data tool lookups
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+from tools.clinical_trials_data import get_clinical_trial_data
+from tools.lookup_cache import lookup_terms, shared_lookup, shared_lookups
+from tools.patent_data import get_patent_data
+
+
+def test_lookup_terms_resolve_records_and_drug_names():
+    assert lookup_terms("When does US 10,567,890 expire?", "patent_number") == ["US10567890"]
+    assert lookup_terms("Trials and FDA status for DTZ-100 (NDA-207524)", "nct_number") == ["DTZ-100"]
+    assert lookup_terms("  EndoPharm ", "patent_number") == ["EndoPharm"]
+
+
+def test_different_questions_about_one_drug_share_a_lookup():
+    with shared_lookups() as stats:
+        first = get_clinical_trial_data("What are the clinical trials for DTZ-100?")
+        second = get_clinical_trial_data("Summarize the DTZ-100 trial results")
+    assert first["found"] and first is second
+    assert stats == {"hits": 1, "misses": 1}
+
+
+def test_lookups_are_not_shared_outside_a_scope():
+    with shared_lookups() as stats:
+        pass
+    get_clinical_trial_data("DTZ-100 trials")
+    assert stats == {"hits": 0, "misses": 0}
+
+
+def test_tools_get_the_question_unchanged_outside_a_scope():
+    queries = []
+
+    @shared_lookup("patent_number")
+    def tool(query):
+        queries.append(query)
+        return {"found": True, "patents": [query]}
+
+    question = "Compare the patents on DTZ-100 and US 10,567,890"
+    assert tool(question) == {"found": True, "patents": [question]}
+    assert queries == [question]
+
+    queries.clear()
+    with shared_lookups():
+        tool(question)
+    assert queries == ["DTZ-100", "US10567890"]
+
+    question = "Compare the patents on DTZ-100 and IMT-50"
+    assert get_patent_data(question) == get_patent_data.__wrapped__(question)
+
+
+def test_questions_naming_several_drugs_merge_their_records():
+    with shared_lookups():
+        result = get_patent_data("Compare the patents on DTZ-100 and IMT-50")
+    numbers = {patent["patent_number"] for patent in result["patents"]}
+    assert {"US10567890", "US11123456"} <= numbers
+    assert result["count"] == len(result["patents"])
+
+
+def test_batch_reports_shared_lookup_hits():
+    client = TestClient(app_module.app)
+    response = client.post("/query/batch", json={
+        "queries": ["What are the clinical trials for DTZ-100?", "Summarize the DTZ-100 trial results"],
+        "concurrency": 1
+    })
+    summary = json.loads(response.text.splitlines()[-1])["summary"]
+    assert summary["unique"] == 2
+    assert summary["shared_lookup_hits"] > 0
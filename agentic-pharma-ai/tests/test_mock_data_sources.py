@@ -0,0 +1,76 @@
+"""
+Seeded mock data sources
+"""
+import threading
+from types import MappingProxyType
+
+import pytest
+
+from database import MockDataSources
+
+SEEDED = [
+    MockDataSources.search_iqvia,
+    MockDataSources.search_exim,
+    MockDataSources.search_patents,
+    MockDataSources.search_clinical_trials,
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    for source in SEEDED:
+        source.cache_clear()
+    yield
+    for source in SEEDED:
+        source.cache_clear()
+
+
+@pytest.mark.parametrize("source", SEEDED, ids=lambda source: source.__name__)
+def test_same_molecule_regenerates_the_same_payload(source):
+    first = source("Metformin")
+    source.cache_clear()
+    assert source("Metformin") == first
+
+
+def test_payload_depends_on_molecule_and_source():
+    metformin = MockDataSources.search_iqvia("Metformin")
+    lisinopril = MockDataSources.search_iqvia("Lisinopril")
+    assert metformin["market_overview"] != lisinopril["market_overview"]
+    assert (MockDataSources.search_exim("Metformin")["trade_summary"]
+            != MockDataSources.search_exim("Lisinopril")["trade_summary"])
+
+
+def test_dataset_version_bump_regenerates(monkeypatch):
+    before = MockDataSources.search_iqvia("Metformin")
+    monkeypatch.setattr(MockDataSources, "DATASET_VERSION", "test-bump")
+    after = MockDataSources.search_iqvia("Metformin")
+    assert after["market_overview"] != before["market_overview"]
+    monkeypatch.undo()
+    assert MockDataSources.search_iqvia("Metformin") == before
+
+
+def test_repeat_calls_share_one_read_only_payload():
+    first = MockDataSources.search_patents("Metformin")
+    assert MockDataSources.search_patents("Metformin") is first
+    assert MockDataSources.search_patents.cache_info().hits == 1
+
+    assert isinstance(first, MappingProxyType)
+    assert isinstance(first["patents"], tuple)
+    with pytest.raises(TypeError):
+        first["molecule"] = "changed"
+    with pytest.raises(TypeError):
+        first["patents"][0]["status"] = "Expired"
+
+
+def test_concurrent_calls_get_identical_payloads():
+    results = []
+
+    def call():
+        results.append(MockDataSources.search_clinical_trials("Atorvastatin"))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,142 @@
+"""
+Patent API connector against a local stub HTTP server
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from tools import patent_api_connector, patent_data
+from tools.patent_api_connector import PatentAPIConnector, PatentAPIError, ResponseCache
+
+
+PATENT = {"patent_number": "US99999999", "title": "Stub Formulation", "expiration_date": "2040-01-01"}
+
+
+def _json(status, payload, headers=None):
+    return status, {"Content-Type": "application/json", **(headers or {})}, json.dumps(payload).encode()
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(patent_api_connector, "BACKOFF_BASE_S", 0.001)
+
+
+def _connector(server, tmp_path, **kwargs):
+    return PatentAPIConnector(base_url=server.url, cache=ResponseCache(str(tmp_path / "cache")), **kwargs)
+
+
+async def _get_patent(server, tmp_path, number="US99999999"):
+    async with _connector(server, tmp_path) as api:
+        return await api.get_patent(number), api.stats
+
+
+def test_retries_server_errors_with_backoff(stub_server, tmp_path):
+    attempts = []
+
+    def handler(method, path, headers):
+        attempts.append(path)
+        return _json(503, {"error": "busy"}) if len(attempts) < 3 else _json(200, PATENT)
+
+    server = stub_server(handler)
+    payload, stats = asyncio.run(_get_patent(server, tmp_path))
+    assert payload == PATENT
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+
+
+def test_honors_retry_after_on_429(stub_server, tmp_path):
+    attempts = []
+
+    def handler(method, path, headers):
+        attempts.append(path)
+        return _json(429, {}, {"Retry-After": "0"}) if len(attempts) == 1 else _json(200, PATENT)
+
+    server = stub_server(handler)
+    payload, stats = asyncio.run(_get_patent(server, tmp_path))
+    assert payload == PATENT
+    assert stats["retries"] == 1
+
+
+def test_gives_up_after_max_retries(stub_server, tmp_path):
+    server = stub_server(lambda method, path, headers: _json(500, {}))
+    with pytest.raises(PatentAPIError, match="attempts"):
+        asyncio.run(_get_patent(server, tmp_path))
+    assert len(server.requests) == patent_api_connector.MAX_RETRIES + 1
+
+
+def test_client_errors_are_not_retried(stub_server, tmp_path):
+    server = stub_server(lambda method, path, headers: _json(404 if "missing" in path else 400, {}))
+    with pytest.raises(PatentAPIError, match="Not found"):
+        asyncio.run(_get_patent(server, tmp_path, "missing"))
+    with pytest.raises(PatentAPIError, match="400"):
+        asyncio.run(_get_patent(server, tmp_path, "bad"))
+    assert len(server.requests) == 2
+
+
+def test_second_request_is_served_from_cache(stub_server, tmp_path):
+    server = stub_server(lambda method, path, headers: _json(200, PATENT))
+
+    async def run():
+        async with _connector(server, tmp_path) as api:
+            first = await api.get_patent("US99999999")
+            second = await api.get_patent("US99999999")
+            return first, second, api.stats
+
+    first, second, stats = asyncio.run(run())
+    assert first == second == PATENT
+    assert len(server.requests) == 1
+    assert stats["cache_hits"] == 1
+
+    # The cache is on disk: a new connector does not hit the server either
+    payload, stats = asyncio.run(_get_patent(server, tmp_path))
+    assert payload == PATENT
+    assert len(server.requests) == 1
+
+
+def test_expired_cache_entries_are_refetched(stub_server, tmp_path):
+    server = stub_server(lambda method, path, headers: _json(200, PATENT))
+
+    async def run():
+        cache = ResponseCache(str(tmp_path / "cache"), ttl_s=-1)
+        async with PatentAPIConnector(base_url=server.url, cache=cache) as api:
+            await api.get_patent("US99999999")
+            await api.get_patent("US99999999")
+
+    asyncio.run(run())
+    assert len(server.requests) == 2
+
+
+def test_search_all_fetches_every_page(stub_server, tmp_path):
+    def handler(method, path, headers):
+        page = int(parse_qs(urlparse(path).query)["page"][0])
+        results = [{"patent_number": f"US{page:02d}{i:06d}"} for i in range(2 if page < 3 else 1)]
+        return _json(200, {"total": 5, "results": results})
+
+    server = stub_server(handler)
+
+    async def run():
+        async with _connector(server, tmp_path, page_size=2) as api:
+            return await api.search_all("stub")
+
+    results = asyncio.run(run())
+    assert len(results) == 5
+    assert len(server.requests) == 3
+
+
+def test_fetch_into_patent_db_merges_records(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(patent_data, "PATENTS_DB", dict(patent_data.PATENTS_DB))
+    monkeypatch.setattr(patent_data, "get_dataset_version", lambda refresh=False: None)
+    server = stub_server(lambda method, path, headers: _json(200, {"total": 1, "results": [PATENT]}))
+
+    async def run():
+        connector = _connector(server, tmp_path)
+        try:
+            return await patent_api_connector.fetch_into_patent_db("stub", connector)
+        finally:
+            await connector.close()
+
+    result = asyncio.run(run())
+    assert result["added"] == 1
+    assert patent_data.PATENTS_DB["US99999999"]["title"] == "Stub Formulation"
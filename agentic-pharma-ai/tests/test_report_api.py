@@ -0,0 +1,80 @@
+"""
+Report export endpoints
+"""
+import threading
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+
+
+client = TestClient(app_module.app)
+
+
+def test_report_digest_fetches_the_stored_report():
+    response = client.post("/report", json={"query": "What are the clinical trials for Cancer Drug XYZ?",
+                                            "format": "md"})
+    assert response.status_code == 200
+    digest = response.headers["X-Report-Digest"]
+    assert response.headers["ETag"] == f'"{digest}"'
+
+    stored = client.get(f"/reports/{digest}", params={"format": "md"})
+    assert stored.status_code == 200
+    assert stored.content == response.content
+
+
+def test_unknown_report_digest_is_not_found():
+    assert client.get("/reports/" + "0" * 64).status_code == 404
+    assert client.get("/reports/not-a-digest").status_code == 404
+
+
+def test_report_applies_plan_limits(monkeypatch):
+    calls = []
+
+    def fake_run(query, on_partial=None, deadline=None, cancel_event=None, max_agents=None, token_budget=None):
+        calls.append((max_agents, token_budget, deadline is not None))
+        return app_module.initialize_state(query)
+
+    monkeypatch.setattr(app_module, "run_orchestrator", fake_run)
+    response = client.post("/report", json={"query": "Patents for DTZ-100", "max_agents": 1,
+                                            "token_budget": 3000, "deadline_ms": 10000})
+    assert response.status_code == 200
+    assert calls == [(1, 3000, True)]
+
+
+def test_report_rendering_runs_off_the_event_loop(monkeypatch):
+    threads = {}
+
+    async def fake_run(query, deadline_ms=None, max_agents=None, token_budget=None):
+        threads["loop"] = threading.get_ident()
+        return app_module.initialize_state(query)
+
+    def fake_export(state, fmt):
+        for part in (b"first", b" second", b" third"):
+            threads.setdefault("render", []).append(threading.get_ident())
+            yield part
+
+    monkeypatch.setattr(app_module, "run_orchestrator_coalesced", fake_run)
+    monkeypatch.setattr(app_module, "stream_export", fake_export)
+    response = client.post("/report", json={"query": "Patents for DTZ-100", "format": "pdf"})
+
+    assert response.status_code == 200
+    assert response.content == b"first second third"
+    assert len(threads["render"]) == 3
+    assert threads["loop"] not in threads["render"]
+
+
+def test_report_render_error_is_an_http_error(monkeypatch):
+    async def fake_run(query, deadline_ms=None, max_agents=None, token_budget=None):
+        return app_module.initialize_state(query)
+
+    def broken_export(state, fmt):
+        raise RuntimeError("renderer unavailable")
+        yield b""
+
+    monkeypatch.setattr(app_module, "run_orchestrator_coalesced", fake_run)
+    monkeypatch.setattr(app_module, "stream_export", broken_export)
+    response = client.post("/report", json={"query": "Patents for DTZ-100", "format": "docx"})
+
+    assert response.status_code == 500
+    assert "renderer unavailable" in response.json()["error"]
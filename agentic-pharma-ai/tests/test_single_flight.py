@@ -0,0 +1,130 @@
+"""
+Single-flight request coalescing
+"""
+import asyncio
+import time
+
+import pytest
+
+import app as app_module
+from services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"answer": 42}
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("q", work) for _ in range(5)))
+        return flight, results
+
+    flight, results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    metrics = flight.metrics()
+    assert metrics["executions"] == 1 and metrics["coalesced"] == 4
+    assert metrics["coalesced_ratio"] == 0.8 and metrics["in_flight"] == 0
+
+
+def test_key_is_released_once_work_finishes():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        flight = SingleFlight()
+        return await flight.do("q", work), await flight.do("q", work), await flight.do("other", work)
+
+    assert asyncio.run(run()) == (1, 2, 3)
+
+
+def test_exceptions_reach_every_waiter():
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(flight.do("q", work), flight.do("q", work), return_exceptions=True)
+        return flight, results
+
+    flight, results = asyncio.run(run())
+    assert [type(r) for r in results] == [ValueError, ValueError]
+    assert flight.metrics()["failed"] == 1
+
+
+def test_cancelled_caller_does_not_cancel_work_for_others():
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return "done"
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.create_task(flight.do("q", work))
+        second = asyncio.create_task(flight.do("q", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return flight, await second
+
+    flight, result = asyncio.run(run())
+    assert result == "done" and finished == [1]
+    assert flight.metrics()["abandoned"] == 0
+
+
+def test_work_is_cancelled_when_every_caller_is_gone():
+    started, finished = [], []
+
+    async def work():
+        started.append(1)
+        await asyncio.sleep(1)
+        finished.append(1)
+
+    async def run():
+        flight = SingleFlight()
+        callers = [asyncio.create_task(flight.do("q", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return flight
+
+    flight = asyncio.run(run())
+    assert started == [1] and finished == []
+    assert flight.metrics()["abandoned"] == 1 and flight.metrics()["in_flight"] == 0
+
+
+def test_identical_queries_coalesce_into_one_orchestrator_run(monkeypatch):
+    runs = []
+
+    def fake_run(query, *args):
+        runs.append(query)
+        time.sleep(0.05)
+        return app_module.initialize_state(query)
+
+    monkeypatch.setattr(app_module, "run_orchestrator", fake_run)
+    monkeypatch.setattr(app_module, "query_flights", SingleFlight())
+
+    async def run():
+        return await asyncio.gather(
+            app_module.run_orchestrator_coalesced("What is the FDA status of DTZ-100?"),
+            app_module.run_orchestrator_coalesced("  what is the fda status of  DTZ-100? "),
+            app_module.run_orchestrator_coalesced("What is the FDA status of DTZ-100?", deadline_ms=5000),
+        )
+
+    first, second, third = asyncio.run(run())
+    # Same normalized query shares a run; different limits do not
+    assert len(runs) == 2
+    assert first is second and third is not first
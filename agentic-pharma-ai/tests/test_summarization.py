@@ -0,0 +1,124 @@
+"""
+Extractive pre-summarization
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from tools import summarization
+from tools.summarization import (
+    compress_record,
+    estimate_tokens,
+    get_summarization_stats,
+    split_sentences,
+    summarize_text,
+)
+
+client = TestClient(app_module.app)
+
+TEXT = " ".join([
+    "Metformin is the first-line therapy for type 2 diabetes.",
+    "The trial enrolled 1,200 adults with type 2 diabetes across 40 sites.",
+    "Weather on the first enrollment day was mild.",
+    "Metformin lowered HbA1c by 1.1 percent versus placebo in type 2 diabetes.",
+    "Gastrointestinal adverse events were the most common with metformin.",
+    "The cafeteria menu changed twice during the study.",
+    "Lactic acidosis was not observed in any metformin arm.",
+    "Investigators recommend metformin remain first-line therapy for type 2 diabetes.",
+])
+
+
+@pytest.fixture
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(summarization, "_stats", {key: 0 for key in summarization._stats})
+
+
+def test_summary_is_deterministic_and_keeps_sentence_order():
+    summary = summarize_text(TEXT, 50)
+    assert summarize_text(TEXT, 50) == summary
+    assert summary != TEXT
+
+    sentences = split_sentences(TEXT)
+    kept = split_sentences(summary)
+    assert set(kept) <= set(sentences)
+    assert kept == sorted(kept, key=sentences.index)
+    # Off-topic sentences are the first to go
+    assert "The cafeteria menu changed twice during the study." not in kept
+
+
+@pytest.mark.parametrize("max_tokens", [10, 25, 50, 80])
+@pytest.mark.parametrize("method", ["textrank", "centroid"])
+def test_summary_fits_the_budget(max_tokens, method):
+    summary = summarize_text(TEXT, max_tokens, method=method)
+    assert estimate_tokens(summary) <= max_tokens
+    assert summary
+
+
+def test_text_within_budget_is_returned_unchanged():
+    assert summarize_text(TEXT, estimate_tokens(TEXT)) is TEXT
+
+
+def test_single_long_sentence_is_truncated():
+    sentence = "word " * 200
+    summary = summarize_text(sentence, 20)
+    assert summary.endswith("...")
+    assert estimate_tokens(summary) <= 20
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        summarize_text(TEXT, 10, method="lexrank")
+
+
+def test_compress_record_only_touches_long_text_fields():
+    record = {"nct_number": "NCT123", "abstract": TEXT, "results": "Short.", "title": TEXT}
+    compressed = compress_record(record, max_tokens=40)
+
+    assert compressed is not record
+    assert record["abstract"] == TEXT
+    assert estimate_tokens(compressed["abstract"]) <= 40
+    assert compressed["results"] == "Short."
+    assert compressed["title"] == TEXT
+    assert compressed["nct_number"] == "NCT123"
+    assert compress_record(record, max_tokens=40) == compressed
+
+
+def test_compress_record_disabled(monkeypatch):
+    monkeypatch.setattr(summarization, "PRESUMMARIZE_ENABLED", False)
+    record = {"abstract": TEXT}
+    assert compress_record(record, max_tokens=10) is record
+
+
+def test_stats_accounting(fresh_stats):
+    short = "Already short."
+    summary = summarize_text(TEXT, 40)
+    summarize_text(short, 40)
+    compress_record({"abstract": TEXT, "results": short}, max_tokens=40)
+
+    stats = get_summarization_stats()
+    assert stats["calls"] == 3
+    assert stats["compressed"] == 2
+    assert stats["input_tokens"] == 2 * estimate_tokens(TEXT) + estimate_tokens(short)
+    assert stats["output_tokens"] == 2 * estimate_tokens(summary) + estimate_tokens(short)
+    assert stats["tokens_saved"] == stats["input_tokens"] - stats["output_tokens"]
+    assert stats["reduction_percent"] == round(100 * stats["tokens_saved"] / stats["input_tokens"], 2)
+    assert stats["cpu_ms"] >= 0 and stats["avg_cpu_ms"] >= 0
+
+
+def test_empty_stats(fresh_stats):
+    stats = get_summarization_stats()
+    assert stats["calls"] == 0
+    assert stats["reduction_percent"] == 0.0 and stats["avg_cpu_ms"] == 0.0
+
+
+def test_stats_are_exposed_on_the_metrics_endpoints(fresh_stats):
+    summarize_text(TEXT, 40)
+
+    summary = client.get("/query/metrics").json()["summarization"]
+    assert summary["calls"] == 1 and summary["compressed"] == 1
+    assert summary["tokens_saved"] > 0
+
+    body = client.get("/metrics").text
+    assert "pharma_ai_summarization_calls_total 1.0" in body
+    assert f"pharma_ai_summarization_input_tokens_total {float(estimate_tokens(TEXT))}" in body
+    assert "pharma_ai_summarization_reduction_ratio" in body
@@ -0,0 +1,56 @@
+"""
+Per-stage timings and per-agent responses on the query response
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+import orchestrator
+from services import llm_service
+
+client = TestClient(app_module.app)
+
+QUERY = "What are the clinical trials and patents for DTZ-100?"
+
+
+@pytest.fixture
+def stub_llm(monkeypatch, fresh_agent_stats):
+    llm_service.reset_llm()
+    monkeypatch.setattr(orchestrator, "FACT_FAST_PATH", False)
+    yield
+    llm_service.reset_llm()
+
+
+def test_query_reports_stage_timings_and_agent_responses(stub_llm):
+    body = client.post("/query", json={"query": QUERY, "max_agents": 2, "include_timings": True}).json()
+
+    agents = body["plan"]["agents"]
+    assert [response["agent_name"] for response in body["agent_responses"]] == agents
+    for response in body["agent_responses"]:
+        assert response["response"] and response["latency_ms"] > 0
+        assert response["prompt_tokens"] > 0 and response["completion_tokens"] > 0
+
+    timings = body["timings"]
+    stages = timings["stages"]
+    assert stages[0]["stage"] == "planning"
+    for agent in agents:
+        assert [stage["stage"] for stage in stages if stage["agent"] == agent] == \
+            ["tool_lookup", "format_context", "llm", "agent"]
+    assert [stage["stage"] for stage in stages if stage["agent"] == "summarizer"][-1] == "agent"
+    assert all(stage["ms"] >= 0 for stage in stages)
+    assert timings["total_ms"] >= max(stage["ms"] for stage in stages)
+
+    # Token totals add up the LLM stages, which match the per-agent counts
+    llm_stages = [stage for stage in stages if stage["stage"] == "llm"]
+    assert timings["tokens"]["prompt_tokens"] == sum(stage["prompt_tokens"] for stage in llm_stages)
+    assert timings["tokens"]["completion_tokens"] == sum(stage["completion_tokens"] for stage in llm_stages)
+    for response in body["agent_responses"]:
+        stage = next(stage for stage in llm_stages if stage["agent"] == response["agent_name"])
+        assert (stage["prompt_tokens"], stage["completion_tokens"]) == \
+            (response["prompt_tokens"], response["completion_tokens"])
+
+
+def test_timings_are_omitted_unless_requested(stub_llm):
+    body = client.post("/query", json={"query": QUERY, "max_agents": 2}).json()
+    assert body["timings"] is None
+    assert len(body["agent_responses"]) == body["agent_count"] == 2
@@ -0,0 +1,176 @@
+"""
+Web scraper against a local HTTP fixture server
+"""
+import asyncio
+import threading
+import time
+
+from tools import web_scraper
+from tools.web_scraper import PageCache, WebScraper, extract_text, pages_to_search_results
+
+
+ARTICLE = b"""<html><head><title>Metformin  Update</title><style>p {color: red}</style></head>
+<body><nav>Home | About</nav><script>var tracking = 1;</script>
+<article><h1>Metformin dosing</h1><p>Metformin remains first-line therapy for type 2 diabetes.</p>
+<a href="/related#top">Related</a> <a href="https://elsewhere.example/page">External</a></article>
+<footer>Copyright</footer></body></html>"""
+RELATED = b"<html><head><title>Related</title></head><body><p>Related metformin research.</p></body></html>"
+ROBOTS = b"User-agent: *\nDisallow: /private\n"
+
+
+def _site(etag='"v1"', robots=(200, ROBOTS), delay_s=0.0):
+    """Fixture site: /article, /related, /private, /broken and /slow"""
+    def handler(method, path, headers):
+        if path == "/robots.txt":
+            status, body = robots
+            return status, {"Content-Type": "text/plain"}, body
+        if path == "/slow":
+            time.sleep(delay_s)
+        if path == "/broken":
+            return 500, {}, b"error"
+        if path == "/article" and headers.get("if-none-match") == etag:
+            return 304, {"ETag": etag}, b""
+        body = {"/article": ARTICLE, "/related": RELATED}.get(path, b"<html><title>Other</title></html>")
+        return 200, {"Content-Type": "text/html", "ETag": etag}, body
+    return handler
+
+
+def _run(server, tmp_path, urls, **kwargs):
+    async def run():
+        async with WebScraper(cache=PageCache(str(tmp_path / "pages")), **kwargs) as scraper:
+            pages = [await scraper.fetch(server.url + url) for url in urls]
+            return pages, scraper.stats
+    return asyncio.run(run())
+
+
+def test_extract_text_strips_boilerplate():
+    content = extract_text(ARTICLE.decode())
+    assert content["title"] == "Metformin Update"
+    assert "first-line therapy" in content["text"]
+    assert "tracking" not in content["text"] and "Home | About" not in content["text"]
+    assert content["links"] == ["/related#top", "https://elsewhere.example/page"]
+
+
+def test_fetch_parses_page_and_resolves_links(stub_server, tmp_path):
+    server = stub_server(_site())
+    (page,), stats = _run(server, tmp_path, ["/article#intro"])
+    assert page["url"] == server.url + "/article"
+    assert page["title"] == "Metformin Update"
+    assert page["etag"] == '"v1"'
+    assert page["links"] == [server.url + "/related", "https://elsewhere.example/page"]
+    assert stats["fetched"] == 1
+
+
+def test_fresh_cache_hit_skips_the_request(stub_server, tmp_path):
+    server = stub_server(_site())
+    _run(server, tmp_path, ["/article"])
+    (page,), stats = _run(server, tmp_path, ["/article"])
+    assert page["title"] == "Metformin Update"
+    assert stats["fresh_hits"] == 1
+    assert server.paths().count("/article") == 1
+
+
+def test_cache_io_and_parsing_run_off_the_event_loop(stub_server, tmp_path, monkeypatch):
+    server = stub_server(_site())
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def record(fn):
+        def wrapper(*args):
+            threads.append((fn.__name__, threading.get_ident()))
+            return fn(*args)
+        return wrapper
+
+    cache = PageCache(str(tmp_path / "pages"))
+    monkeypatch.setattr(cache, "get", record(cache.get))
+    monkeypatch.setattr(cache, "put", record(cache.put))
+    monkeypatch.setattr(web_scraper, "extract_text", record(extract_text))
+
+    async def run():
+        async with WebScraper(cache=cache) as scraper:
+            return await scraper.fetch(server.url + "/article")
+
+    assert asyncio.run(run())["title"] == "Metformin Update"
+    assert [name for name, _ in threads] == ["get", "extract_text", "put"]
+    assert all(thread != loop_thread for _, thread in threads)
+
+
+def test_stale_cache_is_revalidated_with_etag(stub_server, tmp_path):
+    server = stub_server(_site())
+    _run(server, tmp_path, ["/article"], fresh_s=0)
+    (page,), stats = _run(server, tmp_path, ["/article"], fresh_s=0)
+    assert page["title"] == "Metformin Update"
+    assert stats["not_modified"] == 1 and stats["fetched"] == 0
+    method, path, headers = server.requests[-1]
+    assert path == "/article" and headers["if-none-match"] == '"v1"'
+
+
+def test_robots_txt_disallowed_urls_are_not_fetched(stub_server, tmp_path):
+    server = stub_server(_site())
+    (private, article), stats = _run(server, tmp_path, ["/private/report", "/article"])
+    assert private is None and article is not None
+    assert stats["robots_blocked"] == 1
+    assert "/private/report" not in server.paths()
+    # robots.txt is fetched once per origin
+    assert server.paths().count("/robots.txt") == 1
+
+
+def test_missing_robots_txt_allows_everything(stub_server, tmp_path):
+    server = stub_server(_site(robots=(404, b"")))
+    (page,), stats = _run(server, tmp_path, ["/private/report"])
+    assert page is not None and stats["robots_blocked"] == 0
+
+
+def test_forbidden_robots_txt_disallows_everything(stub_server, tmp_path):
+    server = stub_server(_site(robots=(403, b"")))
+    (page,), stats = _run(server, tmp_path, ["/article"])
+    assert page is None and stats["robots_blocked"] == 1
+
+
+def test_robots_can_be_ignored(stub_server, tmp_path):
+    server = stub_server(_site())
+    (page,), _ = _run(server, tmp_path, ["/private/report"], respect_robots=False)
+    assert page is not None
+    assert "/robots.txt" not in server.paths()
+
+
+def test_timeout_returns_none_and_counts_an_error(stub_server, tmp_path):
+    server = stub_server(_site(delay_s=0.5))
+    (page,), stats = _run(server, tmp_path, ["/slow"], timeout_s=0.1, respect_robots=False)
+    assert page is None
+    assert stats["errors"] == 1
+
+
+def test_server_error_falls_back_to_cached_copy(stub_server, tmp_path):
+    server = stub_server(_site())
+    (page,), stats = _run(server, tmp_path, ["/broken"])
+    assert page is None and stats["errors"] == 1
+
+    # A stale copy is still served when revalidation fails
+    cache = PageCache(str(tmp_path / "pages"))
+    cache.put(server.url + "/broken", {"url": server.url + "/broken", "title": "Old", "text": "", "links": [],
+                                       "fetched_at": 0})
+    (page,), stats = _run(server, tmp_path, ["/broken"])
+    assert page["title"] == "Old" and stats["errors"] == 1
+
+
+def test_unreachable_host_is_an_error(tmp_path):
+    async def run():
+        async with WebScraper(cache=PageCache(str(tmp_path / "pages")), timeout_s=1) as scraper:
+            return await scraper.fetch("http://127.0.0.1:9/page"), scraper.stats
+
+    page, stats = asyncio.run(run())
+    assert page is None and stats["errors"] == 1
+
+
+def test_crawl_stays_on_seed_host(stub_server, tmp_path):
+    server = stub_server(_site())
+
+    async def run():
+        async with WebScraper(cache=PageCache(str(tmp_path / "pages"))) as scraper:
+            return await scraper.crawl([server.url + "/article"], max_pages=10)
+
+    pages = asyncio.run(run())
+    assert [p["url"] for p in pages] == [server.url + "/article", server.url + "/related"]
+    results = pages_to_search_results("related research", pages)
+    assert results["results"][0]["url"] == server.url + "/related"